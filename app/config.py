@@ -35,7 +35,62 @@ class Settings(BaseSettings):
         if self.DEBUG:
             return self.ACCESS_TOKEN_EXPIRE_MINUTES_DEBUG
         return self.ACCESS_TOKEN_EXPIRE_MINUTES_PROD
-    
+
+    # Hashing de contraseñas (bcrypt fuera del event loop)
+    PASSWORD_HASH_WORKERS: int = 2          # Procesos del pool (0 = usar hilos del event loop)
+    PASSWORD_HASH_MAX_PENDING: int = 32     # Trabajos en cola antes de responder 503
+    BCRYPT_ROUNDS: int = 12                 # Costo fijo (por defecto no se calibra)
+    BCRYPT_TARGET_MS: int = 0               # >0: calibrar una vez y guardar el costo en MongoDB (app_settings)
+    BCRYPT_MIN_ROUNDS: int = 12             # Nunca por debajo del costo de los hashes existentes
+    BCRYPT_MAX_ROUNDS: int = 14
+
+    # Caché del usuario autenticado (por worker)
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_SIZE: int = 5000
+
+    # Validación de tokens sin ir a la BD en endpoints de solo lectura (opt-in)
+    AUTH_STATELESS_TOKENS: bool = False
+    TOKEN_VERSION_CACHE_TTL_SECONDS: int = 30  # Retraso máximo de una revocación entre workers
+
+    # Memoización de JWT decodificados (por worker)
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    TOKEN_REJECT_CACHE_TTL_SECONDS: int = 60  # Tokens inválidos recordados para rechazarlos barato
+
+    # Caché del catálogo público de cursos (por worker)
+    CATALOG_CACHE_TTL_SECONDS: int = 30       # Página fresca; 0 = desactivar la caché
+    CATALOG_CACHE_STALE_SECONDS: int = 300    # Ventana en la que se sirve vencida mientras se recarga
+    CATALOG_CACHE_MAX_SIZE: int = 500
+
+    # Vista pública precalculada del detalle de curso (por worker)
+    COURSE_PUBLIC_VIEW_TTL_SECONDS: int = 30       # 0 = desactivar
+    COURSE_PUBLIC_VIEW_STALE_SECONDS: int = 300
+    COURSE_PUBLIC_VIEW_MAX_SIZE: int = 1000
+
+    # Cascadas de borrado (cursos y usuarios) dentro de una transacción; requiere replica set
+    # (Atlas lo es). Desactivar solo contra un MongoDB standalone de desarrollo.
+    CASCADE_USE_TRANSACTIONS: bool = True
+
+    # Barrido de inscripciones vencidas (ACTIVE -> EXPIRED); 0 = desactivado
+    ENROLLMENT_EXPIRY_SWEEP_SECONDS: int = 300
+
+    # Autocompletado: antigüedad máxima del índice en workers que no hicieron el cambio
+    SUGGEST_INDEX_REFRESH_SECONDS: int = 120
+
+    # Paginación: reutilizar totales recientes por filtro en vez de contar en cada página
+    PAGINATION_ESTIMATED_TOTALS: bool = False
+    PAGINATION_TOTAL_CACHE_TTL_SECONDS: int = 15
+    PAGINATION_TOTAL_CACHE_MAX_SIZE: int = 2000
+
+    # Almacenamiento del rate limiter: memory | sqlite (workers de un host)
+    RATE_LIMIT_STORAGE: str = "memory"
+    RATE_LIMIT_SQLITE_PATH: str = ""  # Vacío = /dev/shm/dulcevicio_rate_limit.db
+
+    # Token bucket por cliente (user_id o IP) con costo por ruta, por worker
+    RATE_LIMIT_BUCKET_ENABLED: bool = True
+    RATE_LIMIT_BUCKET_CAPACITY: float = 60          # Ráfaga máxima en fichas
+    RATE_LIMIT_BUCKET_REFILL_PER_SECOND: float = 2  # 120 fichas/minuto sostenidas
+    RATE_LIMIT_BUCKET_MAX_KEYS: int = 50000
+
     # Cloudinary
     CLOUDINARY_CLOUD_NAME: str
     CLOUDINARY_API_KEY: str
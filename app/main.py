@@ -3,7 +3,7 @@ DulceVicio API - FastAPI Application
 Plataforma de cursos de repostería con MongoDB Atlas
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
@@ -13,6 +13,15 @@ from app.utils.limiter import limiter
 
 from app.config import settings
 from app.database import connect_to_mongo, close_mongo_connection
+from app.utils.security import password_hasher, get_token_cache_stats, calibrate_password_hashing
+from app.utils.dependencies import get_current_superadmin
+from app.utils.auth_cache import user_cache
+from app.services.course_cache_service import course_cache_service
+from app.services.course_suggest_service import course_suggest_service
+from app.services.course_public_view_service import course_public_view_service
+from app.services.enrollment_expiry_service import enrollment_expiry_service
+from app.utils.pagination import get_total_cache_stats
+from app.utils.token_bucket import TokenBucketMiddleware, token_bucket_limiter
 
 # Configurar logging
 logging.basicConfig(
@@ -28,12 +37,21 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Iniciando DulceVicio API...")
     await connect_to_mongo()
+    await calibrate_password_hashing()
+    try:
+        await course_suggest_service.build()
+    except Exception as e:
+        # No bloquear el arranque: el índice se reconstruye en la primera sugerencia
+        logger.warning(f"⚠️ No se pudo construir el índice de autocompletado: {e}")
+    enrollment_expiry_service.start()
     logger.info("✅ Aplicación lista!")
     
     yield
     
     # Shutdown
     logger.info("🛑 Cerrando aplicación...")
+    await enrollment_expiry_service.stop()
+    password_hasher.shutdown()
     await close_mongo_connection()
     logger.info("👋 Aplicación cerrada")
 
@@ -54,6 +72,10 @@ app = FastAPI(
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Presupuesto global por cliente con costo por ruta (app/utils/token_bucket.py)
+if settings.RATE_LIMIT_BUCKET_ENABLED:
+    app.add_middleware(TokenBucketMiddleware)
+
 
 # Configurar CORS — DEBUG=True usa DEV_ORIGINS, DEBUG=False usa ALLOWED_ORIGINS (ambos desde .env)
 app.add_middleware(
@@ -86,8 +108,28 @@ async def health_check():
     }
 
 
+@app.get("/health/metrics", tags=["Health"])
+async def health_metrics(current_user = Depends(get_current_superadmin)):
+    """
+    Métricas internas del proceso (SOLO SUPERADMIN)
+
+    Los valores son por worker de uvicorn: cada proceso reporta sus propios contadores.
+    """
+    return {
+        "password_hasher": password_hasher.stats(),
+        "user_cache": user_cache.stats(),
+        "token_cache": get_token_cache_stats(),
+        "rate_limit_buckets": token_bucket_limiter.stats(),
+        "catalog_cache": course_cache_service.stats(),
+        "course_public_view": course_public_view_service.stats(),
+        "pagination_totals": get_total_cache_stats(),
+        "suggest_index": course_suggest_service.stats(),
+        "enrollment_expiry_sweeper": enrollment_expiry_service.stats(),
+    }
+
+
 # Registrar routers
-from app.routers import auth, users, courses, lessons, materials, enrollments
+from app.routers import auth, users, courses, lessons, materials, enrollments, reviews
 
 app.include_router(auth.router)
 app.include_router(users.router)
@@ -95,6 +137,7 @@ app.include_router(courses.router)
 app.include_router(lessons.router)
 app.include_router(materials.router)
 app.include_router(enrollments.router) # Prefijo explícito para consistencia
+app.include_router(reviews.router)
 
 # TODO: Registrar más routers aquí
 # from app.routers import enrollments, memberships, comments
@@ -3,7 +3,7 @@ Modelos de base de datos MongoDB usando Beanie ODM
 """
 
 from .user import User
-from .course import Course, CourseReview
+from .course import Course, CourseReview, CourseCardView
 from .lesson import Lesson, LessonMaterial, LessonComment
 from .enrollment import Enrollment
 from .enums import Role, CourseStatus, CourseDifficulty, EnrollmentStatus
@@ -13,6 +13,7 @@ __all__ = [
     "Role",
     "Course",
     "CourseReview",
+    "CourseCardView",
     "Lesson",
     "LessonMaterial",
     "LessonComment",
@@ -3,8 +3,10 @@ Modelos de Curso y componentes relacionados
 """
 
 from beanie import Indexed, PydanticObjectId
-from pydantic import Field, HttpUrl
-from typing import Optional, List
+from pymongo import IndexModel, ASCENDING, DESCENDING, TEXT
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, create_model
+from typing import Dict, FrozenSet, Optional, List, Type
+from functools import lru_cache
 from datetime import datetime
 from .base import BaseDocument
 from .enums import CourseStatus, CourseDifficulty
@@ -31,7 +33,19 @@ class CourseReview(BaseDocument):
             "user_id",
             "rating",
             "created_at",
-            "is_approved"
+            "is_approved",
+            # Una reseña vigente por alumna y curso
+            IndexModel(
+                [("course_id", ASCENDING), ("user_id", ASCENDING)],
+                unique=True,
+                partialFilterExpression={"is_deleted": False},
+                name="one_review_per_user",
+            ),
+            # Reseñas de un curso paginadas por cursor (created_at DESC, _id DESC)
+            IndexModel([
+                ("course_id", ASCENDING), ("is_deleted", ASCENDING), ("is_approved", ASCENDING),
+                ("created_at", DESCENDING), ("_id", DESCENDING)
+            ]),
         ]
     
     class Config:
@@ -72,12 +86,16 @@ class Course(BaseDocument):
     # Estado
     status: CourseStatus = Field(default=CourseStatus.DRAFT, description="Estado del curso")
     published_at: Optional[datetime] = Field(None, description="Fecha de publicación")
-    # Calificación
+    # Calificación (agregados de las reseñas aprobadas, mantenidos con $inc por ReviewService)
     rating_average: Optional[float] = Field(None, ge=0, le=5, description="Calificación promedio (0-5 estrellas)")
+    rating_sum: int = Field(default=0, description="Suma de las calificaciones")
+    rating_count: int = Field(default=0, description="Cantidad de reseñas")
+    rating_histogram: Dict[str, int] = Field(default_factory=dict, description="Reseñas por estrellas ('1' a '5')")
     # Estadísticas (Cacheadas o calculadas al vuelo)
     enrollment_count: int = Field(default=0, description="Estudiantes inscritos")
     lessons_count: int = Field(default=0, description="Cantidad total de lecciones")
     total_duration_hours: float = Field(default=0.0, description="Horas totales de contenido")
+    total_duration_seconds: int = Field(default=0, description="Segundos totales de contenido (base de total_duration_hours)")
     
     # Campo virtual (no se guarda en BD, se calcula en el servicio)
     is_enrolled: bool = Field(default=False, exclude=True, description="Si el usuario actual está inscrito")
@@ -100,6 +118,15 @@ class Course(BaseDocument):
             "difficulty",
             "price",
             "rating_average",
+            # Catálogo paginado por cursor (created_at DESC, _id DESC)
+            IndexModel([("is_deleted", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            # Búsqueda por texto (utils/search.py): insensible a tildes y ordenada por relevancia
+            IndexModel(
+                [("title", TEXT), ("tags", TEXT), ("subcategory", TEXT), ("description", TEXT)],
+                weights={"title": 10, "tags": 5, "subcategory": 3, "description": 1},
+                default_language="spanish",
+                name="course_text_search",
+            ),
         ]
     
     class Config:
@@ -127,3 +154,50 @@ class Course(BaseDocument):
     
     def __str__(self):
         return self.title
+
+
+# Campos de la tarjeta que siempre se proyectan: la identifican y arman el cursor
+CARD_REQUIRED_FIELDS = frozenset({"id", "created_at"})
+
+
+class CourseCardView(BaseModel):
+    """
+    Proyección de Course para las tarjetas del catálogo.
+    Se usa con `.project(CourseCardView)`: MongoDB no envía la descripción, el grupo
+    de WhatsApp ni los campos de auditoría.
+    """
+    id: PydanticObjectId = Field(alias="_id")
+    title: str
+    slug: str
+    category: int
+    subcategory: Optional[str] = None
+    tags: List[str] = Field(default_factory=list)
+    difficulty: CourseDifficulty = CourseDifficulty.INTERMEDIATE
+    cover_image_url: Optional[HttpUrl] = None
+    price: float
+    currency: str = "USD"
+    status: CourseStatus
+    published_at: Optional[datetime] = None
+    rating_average: Optional[float] = None
+    rating_count: int = 0
+    enrollment_count: int = 0
+    lessons_count: int = 0
+    total_duration_hours: float = 0.0
+    created_at: datetime
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @classmethod
+    @lru_cache(maxsize=128)
+    def narrowed(cls, fields: FrozenSet[str]) -> Type["CourseCardView"]:
+        """Variante de la proyección con solo `fields` (más los obligatorios)"""
+        keep = fields | CARD_REQUIRED_FIELDS
+        definitions = {
+            name: (field.annotation, field)
+            for name, field in cls.model_fields.items() if name in keep
+        }
+        return create_model(
+            f"CourseCardView_{'_'.join(sorted(keep))}",
+            __config__=ConfigDict(populate_by_name=True),
+            **definitions
+        )
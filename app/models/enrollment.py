@@ -4,6 +4,7 @@ Sistema de pago individual por curso con expiración
 """
 
 from beanie import PydanticObjectId
+from pymongo import IndexModel, ASCENDING, DESCENDING
 from pydantic import Field, HttpUrl
 from typing import Optional
 from datetime import datetime, timedelta
@@ -40,6 +41,9 @@ class Enrollment(BaseDocument):
     # Metadata administrativa
     notes: Optional[str] = Field(None, max_length=500, description="Notas internas (admin)")
     
+    # Barrido que la pasó a EXPIRED (para descontarla de Course.enrollment_count una sola vez)
+    expiry_sweep_id: Optional[str] = Field(None, description="ID del barrido de vencimiento")
+    
     class Settings:
         name = "enrollments"
         indexes = [
@@ -48,7 +52,26 @@ class Enrollment(BaseDocument):
             "status",
             ("user_id", "course_id"),  # Índice compuesto único
             "expires_at",
-            "enrolled_at"
+            "enrolled_at",
+            # Listados paginados por cursor (enrolled_at DESC, _id DESC)
+            IndexModel([("user_id", ASCENDING), ("is_deleted", ASCENDING), ("enrolled_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("is_deleted", ASCENDING), ("enrolled_at", DESCENDING), ("_id", DESCENDING)]),
+            # Cursos con inscripción vigente de un usuario (AccessService.enrolled_course_ids)
+            IndexModel([
+                ("user_id", ASCENDING), ("status", ASCENDING), ("is_deleted", ASCENDING),
+                ("course_id", ASCENDING), ("expires_at", ASCENDING)
+            ]),
+            # Barrido de vencimiento: status por igualdad y rango en expires_at, así solo
+            # recorre las ACTIVE vencidas y no el histórico de EXPIRED/CANCELLED
+            IndexModel([("status", ASCENDING), ("expires_at", ASCENDING)]),
+            # Inscripciones que venció un barrido (EnrollmentExpiryService). Parcial: las demás
+            # guardan expiry_sweep_id=null y un índice sparse también las incluiría.
+            # Reemplaza al índice sparse "expiry_sweep_id_1" (eliminarlo si existe).
+            IndexModel(
+                [("expiry_sweep_id", ASCENDING)],
+                name="expiry_sweep_id_partial",
+                partialFilterExpression={"expiry_sweep_id": {"$type": "string"}}
+            ),
         ]
     
     class Config:
@@ -94,25 +117,16 @@ class Enrollment(BaseDocument):
             **kwargs
         )
     
-    async def is_active_now(self) -> bool:
+    def is_active_now(self) -> bool:
         """
         Verifica si la inscripción está activa en este momento.
-        Si está activa pero la fecha expiró, actualiza el estado a EXPIRED.
+        No modifica el documento: el paso a EXPIRED lo hace el barrido periódico
+        (EnrollmentExpiryService), así las lecturas nunca escriben.
         
         Returns:
             bool: True si está activa y no expirada
         """
-        if self.status != EnrollmentStatus.ACTIVE:
-            return False
-        
-        # Verificar fecha
-        if datetime.utcnow() >= self.expires_at:
-            # Expiró: Actualizar estado (Lazy Update)
-            self.status = EnrollmentStatus.EXPIRED
-            await self.save()
-            return False
-        
-        return True
+        return self.status == EnrollmentStatus.ACTIVE and datetime.utcnow() < self.expires_at
     
     def remaining_days(self) -> int:
         """
@@ -1,5 +1,5 @@
-from beanie import Indexed
-from pymongo import IndexModel, ASCENDING
+from beanie import Indexed, after_event, Save, Replace, Update, SaveChanges, Delete
+from pymongo import IndexModel, ASCENDING, DESCENDING
 from pydantic import EmailStr
 from typing import Optional
 from datetime import datetime
@@ -24,6 +24,8 @@ class User(BaseDocument):
    
     role: Role = Role.USER
     is_active: bool = True
+    # Se incrementa para revocar todos los tokens emitidos antes del cambio
+    token_version: int = 0
 
     avatar_url: Optional[str] = None
     phone_number: str
@@ -34,8 +36,19 @@ class User(BaseDocument):
         indexes = [
             IndexModel([("is_deleted", ASCENDING), ("role", ASCENDING)]),
             IndexModel([("is_deleted", ASCENDING), ("is_active", ASCENDING)]),
+            # Listado paginado por cursor: más recientes primero
+            IndexModel([("is_deleted", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
         ]
     
+    @after_event([Save, Replace, Update, SaveChanges, Delete])
+    def invalidate_cache(self):
+        """
+        Hook que descarta al usuario de la caché de autenticación tras cualquier escritura.
+        Así toggle_active, change_role, delete_user, etc. se reflejan en el siguiente request.
+        """
+        from app.utils.auth_cache import invalidate_user  # Import local para evitar circular
+        invalidate_user(self.id)
+
     def __repr__(self):
         return f"<User {self.email} ({self.role})>"
     
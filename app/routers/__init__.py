@@ -1,3 +1,3 @@
-from . import auth, users, courses, lessons, materials, enrollments
+from . import auth, users, courses, lessons, materials, enrollments, reviews
 
-__all__ = ["auth", "users", "courses", "lessons", "materials", "enrollments"]
+__all__ = ["auth", "users", "courses", "lessons", "materials", "enrollments", "reviews"]
@@ -3,7 +3,7 @@ Router de Autenticación
 Endpoints para login, registro y gestión de cuenta
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Request
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Request, BackgroundTasks
 from typing import Optional
 
 from app.schemas.user_schema import (
@@ -28,7 +28,7 @@ router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 @router.post("/login", response_model=TokenResponse)
 @limiter.limit("3/5minutes")
-async def login(request: Request, credentials: UserLogin):
+async def login(request: Request, credentials: UserLogin, background_tasks: BackgroundTasks):
     """
     Iniciar sesión
     
@@ -39,7 +39,7 @@ async def login(request: Request, credentials: UserLogin):
     
     **Rate Limit:** 3 intentos por 5 minutos por IP
     """
-    return await auth_service.login(credentials)
+    return await auth_service.login(credentials, background_tasks)
 
 
 @router.get("/me", response_model=UserResponse)
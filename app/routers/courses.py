@@ -2,7 +2,7 @@
 Router para endpoints de Cursos
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Request, Response
 from typing import List, Optional
 from app.models.user import User
 from app.models.course import Course
@@ -12,11 +12,15 @@ from app.schemas.course_schema import (
     CourseUpdateSchema, 
     CourseResponseSchema, 
     CourseStatusUpdateSchema,
-    CourseDetailResponseSchema
+    CourseDetailResponseSchema,
+    CourseSuggestResponse
 )
 from app.services.course_service import CourseService
-from app.utils.dependencies import get_current_user, get_current_admin, get_current_superadmin, get_current_user_optional
+from app.services.course_suggest_service import course_suggest_service
+from app.utils.dependencies import get_current_user, get_current_admin, get_current_superadmin, get_current_principal_optional, Principal
 from app.utils.limiter import limiter
+from app.utils.etag import etag_matches
+from app.utils.responses import FastJSONResponse
 
 router = APIRouter(
     prefix="/api/courses",
@@ -37,40 +41,88 @@ async def get_courses(
     difficulty: Optional[str] = None,
     status: Optional[str] = None,
     search: Optional[str] = None,
-    current_user: Optional[User] = Depends(get_current_user_optional) # Opcional para acceso público
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (next_cursor); ignora page"),
+    fields: Optional[str] = Query(None, description="Campos de tarjeta separados por coma (ej: title,slug,price)"),
+    current_user: Optional[Principal] = Depends(get_current_principal_optional) # Opcional para acceso público
 ):
     """
     Listar cursos paginados.
     - Usuario logeado o usuario sin logear: Solo ve cursos PUBLISHED (y no eliminados).
     - Admin: Puede filtrar por cualquier status.
+    - Paginación por cursor: enviar el `next_cursor` de la respuesta anterior en `cursor`.
+      En ese modo `total`, `page` y `pages` vienen en null. Con `search` los resultados
+      van por relevancia y se paginan con `page` (`cursor` + `search` responde 400).
+    - Cada curso trae los campos de tarjeta (sin descripción ni auditoría); `fields`
+      pide solo algunos de ellos. El admin recibe el curso completo si no envía `fields`.
 
     **Rate Limit:** 60 peticiones por minuto por IP
     """
-    return await CourseService.get_courses(
+    return FastJSONResponse(await CourseService.get_courses(
         page=page,
         limit=limit,
         category=category,
         difficulty=difficulty,
         status=status,
         search=search,
-        current_user=current_user
-    )
+        current_user=current_user,
+        cursor=cursor,
+        fields=fields
+    ))
+
+@router.get("/suggest", response_model=CourseSuggestResponse)
+@limiter.limit("120/minute")
+async def suggest_courses(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100, description="Texto escrito en el buscador"),
+    limit: int = Query(8, ge=1, le=20)
+):
+    """
+    Autocompletado de cursos publicados y etiquetas.
+    Se resuelve en memoria (sin consultar MongoDB): pensado para llamarse en cada tecla.
+
+    **Rate Limit:** 120 peticiones por minuto
+    """
+    return course_suggest_service.suggest(q, limit)
 
 @router.get("/{slug}", response_model=CourseDetailResponseSchema)
 @limiter.limit("60/minute")
 async def get_course(
     request: Request,
     slug: str,
-    current_user: Optional[User] = Depends(get_current_user_optional) # Opcional para acceso público
+    current_user: Optional[Principal] = Depends(get_current_principal_optional) # Opcional para acceso público
 ):
     """
     Obtener detalle de un curso por slug (o ID).
     - usuario no logueado o usuario no inscrito: Solo ve metadatos y lecciones preview
     - usuario inscrito o admin o superadmin: Ve todo el contenido
 
+    Soporta GET condicional: la respuesta trae `ETag` y si el cliente envía
+    `If-None-Match` con ese valor (y nada cambió) se responde `304 Not Modified` sin cuerpo.
+    La vista sin inscripción se sirve desde un detalle público precalculado por curso.
+
     **Rate Limit:** 60 peticiones por minuto por IP
     """
-    return await CourseService.get_course_by_slug(slug, current_user=current_user)
+    # Sin acceso al contenido: detalle público precalculado (ya serializado)
+    public_view = await CourseService.get_public_view(slug, current_user=current_user)
+    if public_view is not None:
+        headers = {"ETag": public_view.etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), public_view.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=public_view.body, media_type="application/json", headers=headers)
+
+    # Admin o inscrito (si no es admin, get_public_view ya verificó la inscripción)
+    is_admin = current_user.role in [Role.ADMIN, Role.SUPERADMIN]
+    etag, is_enrolled = await CourseService.get_course_etag(
+        slug, current_user=current_user, is_enrolled=None if is_admin else True
+    )
+    # El contenido depende del nivel de acceso del usuario: no compartir en caches públicas
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    course = await CourseService.get_course_by_slug(slug, current_user=current_user, is_enrolled=is_enrolled)
+    return FastJSONResponse(course, headers=headers)
 
 # --- Endpoints Administrativos ---
 
@@ -14,8 +14,9 @@ from app.schemas.enrollment_schema import (
     EnrollmentExtendSchema
 )
 from app.services.enrollment_service import EnrollmentService
-from app.utils.dependencies import get_current_user, get_current_admin
+from app.utils.dependencies import get_current_user, get_current_admin, get_current_principal, Principal
 from app.utils.limiter import limiter
+from app.utils.responses import FastJSONResponse
 
 router = APIRouter(
     prefix="/api/enrollments",
@@ -32,7 +33,8 @@ async def get_my_enrollments(
     status: Optional[EnrollmentStatus] = Query(None, description="Filtrar por estado"),
     page: int = Query(1, ge=1, description="Número de página"),
     size: int = Query(10, ge=1, le=100, description="Items por página"),
-    current_user: User = Depends(get_current_user)
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (next_cursor); ignora page"),
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Obtener mis enrollments (cursos a los que estoy inscrito).
@@ -42,16 +44,18 @@ async def get_my_enrollments(
     - status: ACTIVE | EXPIRED | CANCELLED (opcional)
     - page: Página actual (default 1)
     - size: Items por página (default 10)
+    - cursor: `next_cursor` de la respuesta anterior (paginación por cursor, opcional)
 
     **Rate Limit:** 30 peticiones por minuto por IP
     """
-    return await EnrollmentService.get_user_enrollments(
+    return FastJSONResponse(await EnrollmentService.get_user_enrollments(
         user_id=str(current_user.id),
         search=search,
         status=status,
         page=page,
-        size=size
-    )
+        size=size,
+        cursor=cursor
+    ))
 
 
 @router.get("/{enrollment_id}", response_model=EnrollmentResponseSchema)
@@ -59,7 +63,7 @@ async def get_my_enrollments(
 async def get_enrollment(
     request: Request,
     enrollment_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     """
     Obtener detalle de un enrollment.
@@ -67,7 +71,7 @@ async def get_enrollment(
 
     **Rate Limit:** 30 peticiones por minuto por IP
     """
-    return await EnrollmentService.get_enrollment_by_id(enrollment_id, current_user)
+    return FastJSONResponse(await EnrollmentService.get_enrollment_by_id(enrollment_id, current_user))
 
 @router.patch("/{enrollment_id}/progress")
 @limiter.limit("40/minute")
@@ -98,6 +102,7 @@ async def get_all_enrollments(
     status: Optional[EnrollmentStatus] = Query(None, description="Filtrar por estado"),
     page: int = Query(1, ge=1, description="Número de página"),
     size: int = Query(10, ge=1, le=100, description="Items por página"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (next_cursor); ignora page"),
     current_user: User = Depends(get_current_admin)
 ):
     """
@@ -114,12 +119,13 @@ async def get_all_enrollments(
     # Eliminar claves con valor None
     filters = {k: v for k, v in filters.items() if v is not None}
     
-    return await EnrollmentService.get_all_enrollments(
+    return FastJSONResponse(await EnrollmentService.get_all_enrollments(
         search=search,
         page=page, 
         size=size, 
-        filters=filters
-    )
+        filters=filters,
+        cursor=cursor
+    ))
 
 @router.post("", response_model=EnrollmentResponseSchema, status_code=status.HTTP_201_CREATED)
 async def create_enrollment(
@@ -133,7 +139,10 @@ async def create_enrollment(
     - expires_at = enrolled_at + 1 año
     - status = ACTIVE
     """
-    return await EnrollmentService.create_enrollment(data, current_user)
+    return FastJSONResponse(
+        await EnrollmentService.create_enrollment(data, current_user),
+        status_code=status.HTTP_201_CREATED
+    )
 
 @router.patch("/{enrollment_id}/extend", response_model=EnrollmentResponseSchema)
 async def extend_enrollment(
@@ -146,7 +155,7 @@ async def extend_enrollment(
     
     Agrega días adicionales a expires_at.
     """
-    return await EnrollmentService.extend_enrollment(enrollment_id, data, current_user)
+    return FastJSONResponse(await EnrollmentService.extend_enrollment(enrollment_id, data, current_user))
 
 @router.delete("/{enrollment_id}")
 async def delete_enrollment(
@@ -13,7 +13,7 @@ from app.schemas.lesson_schema import (
 )
 from app.services.lesson_service import LessonService
 from app.services.cloudinary_service import CloudinaryService
-from app.utils.dependencies import get_current_user, get_current_admin, get_current_user_optional
+from app.utils.dependencies import get_current_user, get_current_admin, get_current_principal_optional, Principal
 from app.utils.limiter import limiter
 # from app.routers.courses import get_current_admin # YA NO NECESARIO
 
@@ -29,7 +29,7 @@ router = APIRouter(
 async def get_lesson(
     request: Request,
     lesson_id: str,
-    current_user: Optional[User] = Depends(get_current_user_optional)
+    current_user: Optional[Principal] = Depends(get_current_principal_optional)
 ):
     """
     Obtener detalle de una lección.
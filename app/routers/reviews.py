@@ -0,0 +1,85 @@
+"""
+Router para endpoints de Reseñas de cursos
+"""
+
+from fastapi import APIRouter, Depends, Query, Request, status
+from typing import Optional
+from app.models.user import User
+from app.schemas.review_schema import (
+    ReviewCreateSchema,
+    ReviewUpdateSchema,
+    ReviewResponseSchema,
+    ReviewListResponse
+)
+from app.services.review_service import ReviewService
+from app.utils.dependencies import get_current_user
+from app.utils.limiter import limiter
+from app.utils.responses import FastJSONResponse
+
+router = APIRouter(
+    prefix="/api",
+    tags=["Reviews"]
+)
+
+
+@router.get("/courses/{course_id}/reviews", response_model=ReviewListResponse)
+@limiter.limit("60/minute")
+async def get_course_reviews(
+    request: Request,
+    course_id: str,
+    size: int = Query(10, ge=1, le=50, description="Reseñas por página"),
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (next_cursor)")
+):
+    """
+    Listar reseñas de un curso publicado (Público).
+
+    Más recientes primero, paginadas por cursor: la primera página sin `cursor`, las
+    siguientes con el `next_cursor` de la respuesta anterior (null = última página).
+    El total y el promedio vienen en el curso (`rating_count`, `rating_average`).
+
+    **Rate Limit:** 60 peticiones por minuto por IP
+    """
+    return FastJSONResponse(await ReviewService.get_course_reviews(course_id, size, cursor))
+
+
+@router.post("/courses/{course_id}/reviews", response_model=ReviewResponseSchema, status_code=status.HTTP_201_CREATED)
+@limiter.limit("10/minute")
+async def create_review(
+    request: Request,
+    course_id: str,
+    data: ReviewCreateSchema,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Calificar un curso (alumna inscrita).
+
+    Una reseña por alumna y curso; para cambiarla usar PUT /reviews/{review_id}.
+
+    **Rate Limit:** 10 peticiones por minuto por IP
+    """
+    review = await ReviewService.create_review(course_id, data, current_user)
+    return FastJSONResponse(review, status_code=status.HTTP_201_CREATED)
+
+
+@router.put("/reviews/{review_id}", response_model=ReviewResponseSchema)
+async def update_review(
+    review_id: str,
+    data: ReviewUpdateSchema,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Editar mi reseña (calificación y/o texto).
+    """
+    return FastJSONResponse(await ReviewService.update_review(review_id, data, current_user))
+
+
+@router.delete("/reviews/{review_id}")
+async def delete_review(
+    review_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Eliminar reseña (autora o Admin).
+    SUPERADMIN la elimina permanentemente; el resto la envía a papelera.
+    """
+    return await ReviewService.delete_review(review_id, current_user)
@@ -6,12 +6,13 @@ Thin router — delega toda la lógica de negocio a UserService
 from fastapi import APIRouter, Depends, HTTPException, status, Body, File, UploadFile, Query
 from typing import Optional
 
-from app.schemas.user_schema import UserResponse, UserUpdate, UserCreate, PasswordValidationMixin, PaginatedResponse
+from app.schemas.user_schema import UserResponse, UserUpdate, UserCreate, PasswordValidationMixin, PaginatedResponse, UserImportReport
 from app.models.user import User
 from app.models.enums import Role
 from app.utils.dependencies import get_current_admin, get_current_superadmin
 from app.services.auth_service import auth_service
 from app.services.user_service import user_service
+from app.services.user_import_service import user_import_service
 
 router = APIRouter(prefix="/api/users", tags=["User Management"])
 
@@ -46,6 +47,31 @@ async def create_user(user_data: UserCreate, current_user: User = Depends(get_cu
     return await auth_service.register_user(user_data, created_by=str(current_user.id))
 
 
+@router.post("/import", response_model=UserImportReport)
+async def import_users(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Importar estudiantes desde Excel (ADMIN o SUPERADMIN)
+
+    Sube un archivo **.xlsx** cuya primera hoja tenga las columnas:
+    `email`, `full_name`, `phone_number`, `birth_date` (también en español:
+    correo, nombre, telefono, fecha de nacimiento).
+
+    - Todos los usuarios se crean con rol **USER**.
+    - Username y contraseña se generan igual que en el auto-registro (`Chef...` / `DvDDMMAAAA`).
+    - Las filas inválidas no detienen la importación: se reportan en `errors` con su número de fila.
+    """
+    if not file.filename or not file.filename.lower().endswith(".xlsx"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El archivo debe ser un Excel (.xlsx)"
+        )
+
+    return await user_import_service.import_from_excel(file.file, created_by=str(current_user.id))
+
+
 
 @router.get("", response_model=PaginatedResponse[UserResponse])
 async def list_users(
@@ -54,6 +80,7 @@ async def list_users(
     q: Optional[str] = None,
     role: Optional[Role] = None,
     is_active: Optional[bool] = None,
+    cursor: Optional[str] = Query(None, description="Cursor de la página siguiente (next_cursor); ignora page"),
     current_user: User = Depends(get_current_admin)
 ):
     """
@@ -62,13 +89,16 @@ async def list_users(
     **Paginación:**
     - **page**: Número de página (mínimo 1)
     - **per_page**: Registros por página (entre 1 y 100, por defecto 10)
+    - **cursor**: `next_cursor` de la respuesta anterior; pagina por cursor sin contar el total
 
     **Filtros opcionales:**
     - **q**: Búsqueda general en email, username, full_name, phone_number
     - **role**: Filtrar por rol (ADMIN, MODERATOR, USER)
     - **is_active**: Filtrar por estado activo/inactivo
     """
-    return await user_service.list_users(page=page, per_page=per_page, q=q, role=role, is_active=is_active)
+    return await user_service.list_users(
+        page=page, per_page=per_page, q=q, role=role, is_active=is_active, cursor=cursor
+    )
 
 
 @router.get("/{user_id}", response_model=UserResponse)
@@ -9,8 +9,10 @@ from .user_schema import (
     UserResponse, 
     UserLogin, 
     TokenResponse, 
+    TokenPrincipal,
     ChangePasswordSchema,
-    UserSelfUpdate
+    UserSelfUpdate,
+    UserImportReport
 )
 
 from .course_schema import (
@@ -30,3 +32,10 @@ from .lesson_schema import (
 from .material_schema import (
     MaterialResponseSchema
 )
+
+from .review_schema import (
+    ReviewCreateSchema,
+    ReviewUpdateSchema,
+    ReviewResponseSchema,
+    ReviewListResponse
+)
@@ -4,7 +4,7 @@ Validación y serialización de datos de cursos
 """
 
 from pydantic import BaseModel, Field, HttpUrl, ConfigDict, field_validator
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 from beanie import PydanticObjectId
 from app.models.enums import CourseStatus, CourseDifficulty
@@ -66,6 +66,7 @@ class CourseResponseSchema(CourseBase):
     cover_image_url: Optional[HttpUrl] = None
     status: CourseStatus
     rating_average: Optional[float] = None
+    rating_count: int = Field(default=0, description="Cantidad de reseñas")
     enrollment_count: int
     is_enrolled: bool = Field(default=False, description="Si el usuario actual está inscrito")
     
@@ -98,6 +99,7 @@ class CourseResponseSchema(CourseBase):
                 "cover_image_url": "https://res.cloudinary.com/dmxooones/image/upload/v1770821020/dulcevicio/courses/covers/xgw3ft4vikhyo3pfj65v.png",
                 "status": "PUBLISHED",
                 "rating_average": 4.8,
+                "rating_count": 42,
                 "enrollment_count": 127,
                 "is_enrolled": False,
                 "lessons_count": 10,
@@ -112,10 +114,27 @@ class CourseResponseSchema(CourseBase):
     )
 
 
+    @classmethod
+    def from_document(cls, course: Any, is_enrolled: bool = False, **extra: Any) -> "CourseResponseSchema":
+        """
+        Respuesta construida directo desde el documento Course, validando una sola vez
+        (sin pasar antes por un dict JSON). `extra` agrega campos propios del schema.
+        Se valida desde vars() del documento: los valores ya tienen su tipo y es mucho
+        más barato que dict(documento) o from_attributes.
+        """
+        return cls.model_validate({**vars(course), "is_enrolled": is_enrolled, **extra})
+
+
 class CourseDetailResponseSchema(CourseResponseSchema):
     """Schema detallado con lecciones para vista individual"""
+    rating_histogram: Dict[str, int] = Field(default_factory=dict, description="Reseñas por estrellas ('1' a '5')")
     lessons: List[LessonResponseSchema] = []
 
+    @classmethod
+    def from_documents(cls, course: Any, lessons: List[Any], is_enrolled: bool = False) -> "CourseDetailResponseSchema":
+        """Detalle construido desde el curso y sus documentos Lesson, validando una sola vez"""
+        return cls.from_document(course, is_enrolled, lessons=[vars(lesson) for lesson in lessons])
+
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
@@ -138,3 +157,22 @@ class CourseDetailResponseSchema(CourseResponseSchema):
             }
         }
     )
+
+
+class CourseSuggestion(BaseModel):
+    """Curso sugerido por el autocompletado"""
+    id: str
+    title: str
+    slug: str
+
+
+class TagSuggestion(BaseModel):
+    """Etiqueta sugerida por el autocompletado"""
+    tag: str
+    courses_count: int
+
+
+class CourseSuggestResponse(BaseModel):
+    """Respuesta de GET /api/courses/suggest"""
+    courses: List[CourseSuggestion] = []
+    tags: List[TagSuggestion] = []
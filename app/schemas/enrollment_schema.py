@@ -4,7 +4,7 @@ Validación y serialización de datos de inscripciones a cursos
 """
 
 from pydantic import BaseModel, Field, HttpUrl, ConfigDict
-from typing import Optional, List, TypeVar, Generic
+from typing import Any, Optional, List, TypeVar, Generic
 from datetime import datetime
 from beanie import PydanticObjectId
 from app.models.enums import EnrollmentStatus,Role
@@ -130,16 +130,29 @@ class EnrollmentResponseSchema(BaseModel):
         }
     )
 
+    @classmethod
+    def from_documents(cls, enrollment: Any, user: Any, course: Any) -> "EnrollmentResponseSchema":
+        """Respuesta construida directo desde los documentos, validando una sola vez"""
+        return cls.model_validate({
+            **vars(enrollment),
+            "user": vars(user) if user else None,
+            "course": CourseResponseSchema.from_document(course, is_enrolled=True) if course else None,
+        })
+
 T = TypeVar('T')
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
-    """Schema genérico de respuesta paginada"""
-    total: int          # Total de registros encontrados
-    page: int           # Página actual
-    per_page: int       # Registros por página
-    total_pages: int    # Total de páginas
-    data: List[T]       # Lista de objetos
+    """
+    Schema genérico de respuesta paginada.
+    En modo cursor (`cursor=`) no se cuenta: total, page y total_pages vienen en null.
+    """
+    total: Optional[int] = None         # Total de registros encontrados
+    page: Optional[int] = None          # Página actual
+    per_page: int                       # Registros por página
+    total_pages: Optional[int] = None   # Total de páginas
+    next_cursor: Optional[str] = None   # Cursor de la página siguiente (null = última)
+    data: List[T]                       # Lista de objetos
 
 
 class EnrollmentListResponse(PaginatedResponse[EnrollmentResponseSchema]):
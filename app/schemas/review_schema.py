@@ -0,0 +1,65 @@
+"""
+Schemas Pydantic para Reseñas de cursos
+Validación y serialización de calificaciones y opiniones
+"""
+
+from pydantic import BaseModel, Field, HttpUrl, ConfigDict
+from typing import Any, Optional
+from datetime import datetime
+from beanie import PydanticObjectId
+from .enrollment_schema import PaginatedResponse
+
+
+class ReviewCreateSchema(BaseModel):
+    """Schema para calificar un curso (alumna inscrita)"""
+    rating: int = Field(..., ge=1, le=5, description="Calificación de 1 a 5 estrellas")
+    review: Optional[str] = Field(None, max_length=1000, description="Opinión escrita (opcional)")
+
+
+class ReviewUpdateSchema(BaseModel):
+    """Schema para editar la propia reseña (todos los campos opcionales)"""
+    rating: Optional[int] = Field(None, ge=1, le=5)
+    review: Optional[str] = Field(None, max_length=1000)
+
+
+class ReviewResponseSchema(BaseModel):
+    """Schema de respuesta de reseña"""
+    id: PydanticObjectId
+    course_id: str
+    user_id: str
+    user_name: str
+    user_avatar_url: Optional[HttpUrl] = None
+    rating: int
+    review: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            "example": {
+                "id": "507f1f77bcf86cd799439099",
+                "course_id": "507f1f77bcf86cd799439011",
+                "user_id": "695cc40748b8077a89cb103e",
+                "user_name": "María García",
+                "user_avatar_url": None,
+                "rating": 5,
+                "review": "El mejor curso de macarons que he tomado.",
+                "created_at": "2026-03-16T15:39:46.158000",
+                "updated_at": "2026-03-16T15:39:46.158000"
+            }
+        }
+    )
+
+    @classmethod
+    def from_document(cls, review: Any) -> "ReviewResponseSchema":
+        """Respuesta construida directo desde el documento CourseReview"""
+        return cls.model_validate(vars(review))
+
+
+class ReviewListResponse(PaginatedResponse[ReviewResponseSchema]):
+    """
+    Reseñas de un curso, paginadas solo por cursor (total, page y total_pages en null).
+    El total está en `rating_count` del curso.
+    """
+    pass
@@ -165,6 +165,18 @@ class UserLogin(BaseModel):
     password: str
 
 
+class TokenPrincipal(BaseModel):
+    """
+    Identidad liviana construida solo con los claims del JWT (sin consultar la BD).
+    Expone los mismos atributos que usan los servicios de lectura: id, email y role.
+    """
+    id: PydanticObjectId
+    email: str
+    role: Role
+    is_active: bool
+    token_version: int = 0
+
+
 class TokenResponse(BaseModel):
     """Schema de respuesta de token JWT"""
     access_token: str
@@ -200,13 +212,28 @@ class ChangePasswordSchema(BaseModel):
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
-    """Schema genérico de respuesta paginada"""
-    total: int          # Total de registros encontrados
-    page: int           # Página actual
-    per_page: int       # Registros por página
-    total_pages: int    # Total de páginas
-    data: List[T]       # Lista de objetos
-
-
-
-
+    """
+    Schema genérico de respuesta paginada.
+    En modo cursor (`cursor=`) no se cuenta: total, page y total_pages vienen en null.
+    """
+    total: Optional[int] = None         # Total de registros encontrados
+    page: Optional[int] = None          # Página actual
+    per_page: int                       # Registros por página
+    total_pages: Optional[int] = None   # Total de páginas
+    next_cursor: Optional[str] = None   # Cursor de la página siguiente (null = última)
+    data: List[T]                       # Lista de objetos
+
+
+class UserImportRowError(BaseModel):
+    """Error de una fila en la importación masiva de usuarios"""
+    row: int                      # Número de fila en la hoja (1 = encabezado)
+    email: Optional[str] = None
+    detail: str
+
+
+class UserImportReport(BaseModel):
+    """Resultado de la importación masiva de usuarios desde Excel"""
+    total_rows: int               # Filas de datos leídas (sin encabezado ni filas vacías)
+    created: int                  # Usuarios creados
+    failed: int                   # Filas rechazadas
+    errors: List[UserImportRowError] = []
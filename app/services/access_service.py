@@ -3,6 +3,11 @@ Servicio para verificación de acceso a cursos
 Preparado para convivir con Membership futuro
 """
 
+from typing import List, Set
+from datetime import datetime
+
+from beanie import PydanticObjectId
+
 from app.models.enrollment import Enrollment
 from app.models.enums import EnrollmentStatus
 
@@ -45,7 +50,7 @@ class AccessService:
             return False
         
         # Verificar que no haya expirado
-        return await enrollment.is_active_now()
+        return enrollment.is_active_now()
     
     @staticmethod
     async def get_user_enrollment_for_course(user_id: str, course_id: str):
@@ -62,7 +67,28 @@ class AccessService:
             Enrollment.is_deleted == False
         )
         
-        if enrollment and await enrollment.is_active_now():
+        if enrollment and enrollment.is_active_now():
             return enrollment
         
         return None
+
+    @staticmethod
+    async def enrolled_course_ids(user_id: PydanticObjectId, course_ids: List[PydanticObjectId]) -> Set[str]:
+        """
+        De `course_ids`, los cursos (como str) en los que el usuario tiene inscripción vigente.
+
+        Una sola consulta proyectada que filtra la expiración en MongoDB (expires_at > ahora)
+        sobre el índice (user_id, status, is_deleted, course_id, expires_at): no carga
+        inscripciones de otros cursos y nunca escribe (una inscripción vencida que aún
+        figura ACTIVE simplemente no cuenta).
+        """
+        if not course_ids:
+            return set()
+        ids = await Enrollment.get_motor_collection().distinct("course_id", {
+            "user_id": user_id,
+            "status": EnrollmentStatus.ACTIVE.value,
+            "is_deleted": False,
+            "course_id": {"$in": course_ids},
+            "expires_at": {"$gt": datetime.utcnow()},
+        })
+        return {str(course_id) for course_id in ids}
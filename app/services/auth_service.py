@@ -5,13 +5,21 @@ Lógica de negocio para login, registro y gestión de tokens
 
 from typing import Optional
 from datetime import timedelta
-from fastapi import HTTPException, status
+from fastapi import HTTPException, status, BackgroundTasks
+import logging
 
 from app.models.user import User
 from app.models.enums import Role
 from app.schemas.user_schema import UserCreate, UserSelfRegister, UserLogin, TokenResponse, UserResponse, UserSelfUpdate
-from app.utils.security import hash_password, verify_password, create_access_token
+from app.utils.security import hash_password_async, verify_password_async, create_access_token, needs_rehash
+from app.utils.auth_cache import invalidate_user
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# Reintentos del auto-registro cuando otro registro simultáneo toma el mismo username
+USERNAME_INSERT_RETRIES = 3
 
 
 class AuthService:
@@ -54,7 +62,7 @@ class AuthService:
             email=user_data.email,
             username=user_data.username,
             full_name=user_data.full_name,
-            password_hash=hash_password(user_data.password),
+            password_hash=await hash_password_async(user_data.password),
             role=user_data.role,
             is_active=True,
             created_by=created_by,
@@ -68,12 +76,16 @@ class AuthService:
         return new_user
     
     @staticmethod
-    async def login(credentials: UserLogin) -> TokenResponse:
+    async def login(credentials: UserLogin, background_tasks: Optional[BackgroundTasks] = None) -> TokenResponse:
         """
         Autenticar usuario y generar token JWT
         
+        Si el hash guardado usa un costo de bcrypt menor al vigente, se re-hashea
+        en segundo plano (después de responder) con la contraseña recién verificada.
+        
         Args:
             credentials: Email y contraseña
+            background_tasks: Tareas en segundo plano del request (opcional)
             
         Returns:
             Token de acceso y datos del usuario
@@ -100,7 +112,7 @@ class AuthService:
             )
         
         # Verificar contraseña
-        if not verify_password(credentials.password, user.password_hash):
+        if not await verify_password_async(credentials.password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Email o contraseña incorrectos",
@@ -114,12 +126,20 @@ class AuthService:
                 detail="Usuario inactivo. Contacta al administrador."
             )
         
+        # Actualizar el costo del hash de forma transparente
+        if background_tasks is not None and needs_rehash(user.password_hash):
+            background_tasks.add_task(
+                AuthService.rehash_password, user.id, credentials.password, user.password_hash
+            )
+        
         # Crear token JWT
         access_token = create_access_token(
             data={
                 "user_id": str(user.id),
                 "email": user.email,
-                "role": user.role
+                "role": user.role,
+                "is_active": user.is_active,
+                "token_version": user.token_version
             }
         )
         
@@ -131,6 +151,26 @@ class AuthService:
             user=user  # Pasamos el modelo completo Beanie
         )
     
+    @staticmethod
+    async def rehash_password(user_id: ObjectId, password: str, old_hash: str) -> None:
+        """
+        Re-hashea la contraseña con el costo de bcrypt vigente.
+        
+        Solo reemplaza el hash si sigue siendo el mismo que se verificó en el login,
+        para no pisar un cambio de contraseña concurrente.
+        """
+        try:
+            new_hash = await hash_password_async(password)
+        except HTTPException:
+            # Pool saturado: se reintentará en el próximo login
+            return
+        
+        await User.find_one({"_id": user_id, "password_hash": old_hash}).update(
+            {"$set": {"password_hash": new_hash}}
+        )
+        invalidate_user(user_id)
+        logger.info(f"🔐 Hash de contraseña actualizado al costo vigente (user_id={user_id})")
+    
     @staticmethod
     async def get_current_user_info(user: User) -> User:
         """
@@ -165,14 +205,14 @@ class AuthService:
             HTTPException 400: Si la contraseña actual es incorrecta
         """
         # Verificar contraseña actual
-        if not verify_password(current_password, user.password_hash):
+        if not await verify_password_async(current_password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Contraseña actual incorrecta"
             )
         
         # Actualizar contraseña
-        user.password_hash = hash_password(new_password)
+        user.password_hash = await hash_password_async(new_password)
         await user.save()
         
         return {"message": "Contraseña actualizada exitosamente"}
@@ -210,7 +250,7 @@ class AuthService:
             email=user_data.email,
             username=username,
             full_name=user_data.full_name,
-            password_hash=hash_password(password),
+            password_hash=await hash_password_async(password),
             role=Role.USER,
             is_active=True,
             created_by="self_register",
@@ -218,9 +258,21 @@ class AuthService:
             phone_number=user_data.phone_number,
             birth_date=user_data.birth_date
         )
-        
-        await new_user.insert()
-        return new_user
+
+        # 4. El índice único resuelve carreras entre registros simultáneos:
+        #    si otro tomó el mismo username, se recalcula excluyéndolo y se reintenta
+        lost_usernames = set()
+        for attempt in range(USERNAME_INSERT_RETRIES):
+            try:
+                await new_user.insert()
+                return new_user
+            except DuplicateKeyError as e:
+                key = next(iter((e.details or {}).get("keyPattern", {})), None)
+                if key != "username" or attempt == USERNAME_INSERT_RETRIES - 1:
+                    detail = "El username ya está en uso" if key == "username" else "El email ya está registrado"
+                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+                lost_usernames.add(new_user.username)
+                new_user.username = await generate_chef_username(user_data.full_name, exclude=lost_usernames)
     
     @staticmethod
     async def update_profile(user: User, update_data: UserSelfUpdate) -> User:
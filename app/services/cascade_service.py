@@ -0,0 +1,235 @@
+"""
+Cascadas de borrado de cursos y usuarios
+
+Cada dependiente (lecciones, inscripciones, reseñas, comentarios) se oculta o elimina
+con un update_many / delete_many filtrado: unas pocas operaciones por cascada sin importar
+cuántos documentos afecte, sin traerlos a memoria. Todo corre dentro de una transacción
+(con CASCADE_USE_TRANSACTIONS), así una cascada queda aplicada completa o no se aplica.
+
+Los contadores desnormalizados de otros cursos (enrollment_count, calificaciones) se
+leen dentro de la transacción y se ajustan al confirmarla; si el proceso cae entre medio,
+reconcile_counts.py los repara.
+
+Cada operación retorna cuántos documentos afectó por colección.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from datetime import datetime
+import logging
+
+from motor.motor_asyncio import AsyncIOMotorClientSession
+
+from app.config import settings
+from app.models.course import Course, CourseReview
+from app.models.enrollment import Enrollment
+from app.models.enums import EnrollmentStatus
+from app.models.lesson import Lesson, LessonComment
+from app.models.user import User
+from app.services.enrollment_count_service import EnrollmentCountService
+from app.services.review_service import ReviewService, COUNTED_REVIEWS
+from app.utils.auth_cache import invalidate_user
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+Session = Optional[AsyncIOMotorClientSession]
+
+
+def _soft_delete_fields(actor: User, now: datetime) -> Dict[str, Any]:
+    """Campos de auditoría de un borrado lógico"""
+    return {
+        "is_deleted": True,
+        "deleted_at": now,
+        "deleted_by": str(actor.id),
+        "updated_by": str(actor.id),
+        "updated_at": now,
+    }
+
+
+class CascadeService:
+
+    @staticmethod
+    async def _run(work: Callable[[Session], Awaitable[T]]) -> T:
+        """Ejecuta `work` en una transacción (con reintentos ante errores transitorios)"""
+        if not settings.CASCADE_USE_TRANSACTIONS:
+            return await work(None)
+        client = Course.get_motor_collection().database.client
+        async with await client.start_session() as session:
+            return await session.with_transaction(work)
+
+    @staticmethod
+    async def _lesson_ids(course: Course, session: Session) -> List[str]:
+        """IDs (str, como los guarda LessonComment) de todas las lecciones del curso"""
+        ids = await Lesson.get_motor_collection().distinct("_id", {"course_id": course.id}, session=session)
+        return [str(lesson_id) for lesson_id in ids]
+
+    @staticmethod
+    async def soft_delete_course(course: Course, actor: User) -> Dict[str, int]:
+        """
+        Envía a papelera el curso con sus lecciones, comentarios y reseñas, y cancela sus
+        inscripciones. Los contadores del curso quedan en cero (nada de lo suyo cuenta).
+        """
+        now = datetime.utcnow()
+        deleted = _soft_delete_fields(actor, now)
+
+        async def work(session: Session) -> Dict[str, int]:
+            lesson_ids = await CascadeService._lesson_ids(course, session)
+            lessons = await Lesson.get_motor_collection().update_many(
+                {"course_id": course.id, "is_deleted": False}, {"$set": deleted}, session=session
+            )
+            comments = await LessonComment.get_motor_collection().update_many(
+                {"lesson_id": {"$in": lesson_ids}, "is_deleted": False}, {"$set": deleted}, session=session
+            )
+            enrollments = await Enrollment.get_motor_collection().update_many(
+                {"course_id": course.id, "is_deleted": False},
+                {"$set": {**deleted, "status": EnrollmentStatus.CANCELLED.value}},
+                session=session
+            )
+            reviews = await CourseReview.get_motor_collection().update_many(
+                {"course_id": str(course.id), "is_deleted": False}, {"$set": deleted}, session=session
+            )
+
+            course.is_deleted = True
+            course.deleted_at = now
+            course.deleted_by = str(actor.id)
+            course.updated_by = str(actor.id)
+            course.enrollment_count = 0
+            course.lessons_count = 0
+            course.total_duration_seconds = 0
+            course.total_duration_hours = 0.0
+            course.rating_sum = 0
+            course.rating_count = 0
+            course.rating_histogram = {}
+            course.rating_average = None
+            await course.save(session=session)
+
+            return {
+                "lessons": lessons.modified_count,
+                "lesson_comments": comments.modified_count,
+                "enrollments": enrollments.modified_count,
+                "reviews": reviews.modified_count,
+            }
+
+        affected = await CascadeService._run(work)
+        logger.info(f"🗑️ Curso {course.id} enviado a papelera: {affected}")
+        return affected
+
+    @staticmethod
+    async def hard_delete_course(course: Course) -> Dict[str, int]:
+        """Elimina físicamente el curso con lecciones, comentarios, inscripciones y reseñas"""
+
+        async def work(session: Session) -> Dict[str, int]:
+            lesson_ids = await CascadeService._lesson_ids(course, session)
+            comments = await LessonComment.get_motor_collection().delete_many(
+                {"lesson_id": {"$in": lesson_ids}}, session=session
+            )
+            lessons = await Lesson.get_motor_collection().delete_many({"course_id": course.id}, session=session)
+            enrollments = await Enrollment.get_motor_collection().delete_many({"course_id": course.id}, session=session)
+            reviews = await CourseReview.get_motor_collection().delete_many(
+                {"course_id": str(course.id)}, session=session
+            )
+            await course.delete(session=session)
+            return {
+                "lessons": lessons.deleted_count,
+                "lesson_comments": comments.deleted_count,
+                "enrollments": enrollments.deleted_count,
+                "reviews": reviews.deleted_count,
+            }
+
+        affected = await CascadeService._run(work)
+        logger.info(f"🗑️ Curso {course.id} eliminado permanentemente: {affected}")
+        return affected
+
+    @staticmethod
+    async def _user_counters(user: User, session: Session) -> Tuple[Dict[Any, int], List[Dict[str, Any]]]:
+        """
+        Lo que el usuario aporta a los contadores de los cursos, leído antes de borrar:
+        inscripciones contadas por curso y sus reseñas contadas (una por curso).
+        """
+        enrollments = await Enrollment.get_motor_collection().aggregate([
+            {"$match": {"user_id": user.id, "status": EnrollmentStatus.ACTIVE.value, "is_deleted": False}},
+            {"$group": {"_id": "$course_id", "count": {"$sum": 1}}},
+        ], session=session).to_list(length=None)
+        reviews = await CourseReview.get_motor_collection().find(
+            {"user_id": str(user.id), **COUNTED_REVIEWS}, {"course_id": 1, "rating": 1}, session=session
+        ).to_list(length=None)
+        return {row["_id"]: row["count"] for row in enrollments}, reviews
+
+    @staticmethod
+    async def _discount_user(active_by_course: Dict[Any, int], reviews: List[Dict[str, Any]]) -> None:
+        """Descuenta de los cursos las inscripciones y reseñas del usuario ya borradas"""
+        await EnrollmentCountService.apply_deltas({course_id: -n for course_id, n in active_by_course.items()})
+        for review in reviews:
+            await ReviewService.apply_rating_delta(review["course_id"], removed=review["rating"])
+
+    @staticmethod
+    async def soft_delete_user(user: User, actor: User) -> Dict[str, int]:
+        """
+        Envía a papelera al usuario (revocando sus tokens), cancela sus inscripciones y
+        oculta sus reseñas y comentarios.
+        """
+        now = datetime.utcnow()
+        deleted = _soft_delete_fields(actor, now)
+        # Fuera de `work`: la transacción puede reintentarse y no debe sumar dos veces
+        token_version = user.token_version + 1
+
+        async def work(session: Session) -> Tuple[Dict[str, int], Dict[Any, int], List[Dict[str, Any]]]:
+            active_by_course, counted_reviews = await CascadeService._user_counters(user, session)
+            enrollments = await Enrollment.get_motor_collection().update_many(
+                {"user_id": user.id, "is_deleted": False},
+                {"$set": {**deleted, "status": EnrollmentStatus.CANCELLED.value}},
+                session=session
+            )
+            reviews = await CourseReview.get_motor_collection().update_many(
+                {"user_id": str(user.id), "is_deleted": False}, {"$set": deleted}, session=session
+            )
+            comments = await LessonComment.get_motor_collection().update_many(
+                {"user_id": str(user.id), "is_deleted": False}, {"$set": deleted}, session=session
+            )
+
+            user.is_deleted = True
+            user.deleted_at = now
+            user.deleted_by = str(actor.id)
+            user.updated_by = str(actor.id)
+            user.token_version = token_version  # Revoca sus tokens vigentes
+            await user.save(session=session)
+
+            affected = {
+                "enrollments": enrollments.modified_count,
+                "reviews": reviews.modified_count,
+                "lesson_comments": comments.modified_count,
+            }
+            return affected, active_by_course, counted_reviews
+
+        affected, active_by_course, counted_reviews = await CascadeService._run(work)
+        invalidate_user(user.id)  # El hook de save corrió antes de confirmar la transacción
+        await CascadeService._discount_user(active_by_course, counted_reviews)
+        logger.info(f"🗑️ Usuario {user.id} enviado a papelera: {affected}")
+        return affected
+
+    @staticmethod
+    async def hard_delete_user(user: User) -> Dict[str, int]:
+        """Elimina físicamente al usuario con sus inscripciones, reseñas y comentarios"""
+
+        async def work(session: Session) -> Tuple[Dict[str, int], Dict[Any, int], List[Dict[str, Any]]]:
+            active_by_course, counted_reviews = await CascadeService._user_counters(user, session)
+            enrollments = await Enrollment.get_motor_collection().delete_many({"user_id": user.id}, session=session)
+            reviews = await CourseReview.get_motor_collection().delete_many({"user_id": str(user.id)}, session=session)
+            comments = await LessonComment.get_motor_collection().delete_many(
+                {"user_id": str(user.id)}, session=session
+            )
+            await user.delete(session=session)
+
+            affected = {
+                "enrollments": enrollments.deleted_count,
+                "reviews": reviews.deleted_count,
+                "lesson_comments": comments.deleted_count,
+            }
+            return affected, active_by_course, counted_reviews
+
+        affected, active_by_course, counted_reviews = await CascadeService._run(work)
+        invalidate_user(user.id)
+        await CascadeService._discount_user(active_by_course, counted_reviews)
+        logger.info(f"🗑️ Usuario {user.id} eliminado permanentemente: {affected}")
+        return affected
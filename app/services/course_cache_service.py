@@ -0,0 +1,73 @@
+"""
+Servicio de caché del catálogo público de cursos
+
+El catálogo publicado cambia pocas veces al día pero se consulta en cada visita.
+Las páginas de GET /api/courses (vista pública) se guardan ya serializadas, sin datos
+del usuario: el flag is_enrolled se superpone después en CourseService.
+
+Vive en memoria del worker: la invalidación es inmediata en el worker que hizo el cambio
+y los demás lo ven al vencer CATALOG_CACHE_TTL_SECONDS.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Hashable, Optional
+import logging
+
+from app.config import settings
+from app.models.course import Course
+from app.models.enums import CourseStatus
+from app.utils.cache import SWRCache
+from app.utils.slug import normalize_text
+
+logger = logging.getLogger(__name__)
+
+catalog_cache = SWRCache(
+    name="catalog",
+    maxsize=settings.CATALOG_CACHE_MAX_SIZE,
+    ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+    stale_ttl=settings.CATALOG_CACHE_STALE_SECONDS,
+)
+
+
+class CourseCacheService:
+
+    @staticmethod
+    def catalog_key(
+        page: int,
+        limit: int,
+        category: Optional[int],
+        difficulty: Optional[str],
+        search: Optional[str],
+        cursor: Optional[str] = None,
+        fields: Optional[FrozenSet[str]] = None
+    ) -> Hashable:
+        """Clave de una página del catálogo (la búsqueda ignora mayúsculas y tildes)"""
+        normalized_search = normalize_text(search) if search else None
+        return (None if cursor else page, limit, category, difficulty, normalized_search or None, cursor, fields)
+
+    @staticmethod
+    async def get_catalog_page(key: Hashable, loader: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Retorna la página cacheada o la carga con `loader` (una sola carga por clave)"""
+        return await catalog_cache.get_or_load(key, loader)
+
+    @staticmethod
+    def invalidate_catalog() -> None:
+        """Descarta todas las páginas del catálogo"""
+        catalog_cache.invalidate_all()
+
+    @staticmethod
+    def invalidate_for_course(course: Course, was_published: bool = False) -> None:
+        """
+        Invalida el catálogo solo si el cambio lo afecta: el curso está publicado
+        o lo estaba antes del cambio (se despublicó o se eliminó).
+        Los cambios en borradores no tocan la caché.
+        """
+        if was_published or (course.status == CourseStatus.PUBLISHED and not course.is_deleted):
+            logger.debug(f"Catálogo invalidado por cambio en curso {course.id}")
+            catalog_cache.invalidate_all()
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        return catalog_cache.stats()
+
+
+course_cache_service = CourseCacheService()
@@ -0,0 +1,90 @@
+"""
+Servicio de la vista pública precalculada del detalle de curso
+
+La vista sin inscripción de GET /api/courses/{slug} (visitantes anónimos y usuarios
+no inscritos) es igual para todos: el curso publicado con sus lecciones, donde las que
+no son preview no traen video ni materiales. Se arma una vez por curso, ya validada
+contra CourseDetailResponseSchema y serializada a bytes JSON junto con su ETag, así
+servirla es una búsqueda en memoria en vez de dos consultas, la limpieza de lecciones
+y la serialización completa.
+
+- Se reconstruye en segundo plano cuando cambian el curso, sus lecciones o materiales
+  (en el worker que hizo el cambio).
+- Los demás workers la ven al vencer COURSE_PUBLIC_VIEW_TTL_SECONDS.
+- Un slug inexistente o no publicado también se recuerda (como None -> 404).
+"""
+
+from typing import Any, Dict, NamedTuple, Optional
+import logging
+
+from app.config import settings
+from app.models.course import Course
+from app.models.enums import CourseStatus
+from app.models.lesson import Lesson
+from app.schemas.course_schema import CourseDetailResponseSchema
+from app.services.lesson_service import LessonService
+from app.utils.cache import SWRCache
+from app.utils.etag import body_etag
+
+logger = logging.getLogger(__name__)
+
+public_view_cache = SWRCache(
+    name="course_public_view",
+    maxsize=settings.COURSE_PUBLIC_VIEW_MAX_SIZE,
+    ttl=settings.COURSE_PUBLIC_VIEW_TTL_SECONDS,
+    stale_ttl=settings.COURSE_PUBLIC_VIEW_STALE_SECONDS,
+)
+
+
+class CoursePublicView(NamedTuple):
+    """Detalle público de un curso listo para enviarse"""
+    course_id: str
+    body: bytes  # JSON de CourseDetailResponseSchema con is_enrolled=False
+    etag: str
+
+
+class CoursePublicViewService:
+
+    def __init__(self):
+        self._slugs: Dict[str, str] = {}  # id de curso -> slug con vista en caché
+
+    async def get(self, slug: str) -> Optional[CoursePublicView]:
+        """Vista pública del curso, o None si no existe o no está publicado"""
+        return await public_view_cache.get_or_load(slug, lambda: self._build(slug))
+
+    async def _build(self, slug: str) -> Optional[CoursePublicView]:
+        course = await Course.find_one({
+            "slug": slug,
+            "is_deleted": False,
+            "status": CourseStatus.PUBLISHED
+        })
+        if not course:
+            return None
+
+        lessons = await Lesson.find({"course_id": course.id, "is_deleted": False}).sort("order").to_list()
+        LessonService.hide_private_content(lessons)
+
+        # Mismo resultado que produciría FastAPI con response_model, hecho una sola vez
+        body = CourseDetailResponseSchema.from_documents(course, lessons, is_enrolled=False)\
+            .model_dump_json().encode()
+
+        course_id = str(course.id)
+        self._slugs[course_id] = slug
+        logger.debug(f"Vista pública del curso {course_id} reconstruida ({len(body)} bytes)")
+        return CoursePublicView(course_id=course_id, body=body, etag=body_etag(body))
+
+    def invalidate_course(self, course_id: str, slug: Optional[str] = None) -> None:
+        """
+        Descarta la vista del curso y la reconstruye en segundo plano.
+        `slug` es el slug actual del curso cuando se conoce (puede haber cambiado).
+        """
+        slugs = {self._slugs.pop(course_id, None), slug} - {None}
+        for current_slug in slugs:
+            public_view_cache.invalidate(current_slug)
+            public_view_cache.refresh(current_slug, lambda s=current_slug: self._build(s))
+
+    def stats(self) -> Dict[str, Any]:
+        return public_view_cache.stats()
+
+
+course_public_view_service = CoursePublicViewService()
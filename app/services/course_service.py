@@ -3,50 +3,169 @@ Servicio para lógica de negocio de Cursos
 REFACTORIZADO: Trabaja con relaciones Course-Lesson
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, FrozenSet, Tuple
 from fastapi import UploadFile, HTTPException
+from beanie import PydanticObjectId
 from beanie.operators import In
-from app.models.course import Course
+from app.models.course import Course, CourseCardView
 from app.models.lesson import Lesson
 from app.models.user import User
 from app.models.enums import CourseStatus, Role
-from app.schemas.course_schema import CourseCreateSchema, CourseUpdateSchema
+from app.schemas.course_schema import CourseCreateSchema, CourseUpdateSchema, CourseDetailResponseSchema
 from app.utils.slug import generate_slug, ensure_unique_slug_course
+from app.utils.pagination import seek_filter, sort_spec, next_cursor_for, paginate
+from app.utils.search import text_search_filter, TEXT_SCORE_SORT
+from app.utils.etag import compute_etag
 from app.services.cloudinary_service import CloudinaryService
+from app.services.course_cache_service import CourseCacheService
+from app.services.course_suggest_service import course_suggest_service
+from app.services.course_public_view_service import course_public_view_service, CoursePublicView
+from app.services.lesson_service import LessonService
+from app.services.access_service import AccessService
+from app.services.cascade_service import CascadeService
 from datetime import datetime
 from app.models.enrollment import Enrollment
 from app.models.course import CourseReview
-import re
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Reintentos de create_course cuando otro curso toma el mismo slug en paralelo
+SLUG_INSERT_RETRIES = 3
+
+# Campos del curso que forman parte del ETag del detalle (los contadores pueden cambiar
+# con updates atómicos que no pasan por los hooks que actualizan updated_at)
+COURSE_VERSION_FIELDS = {
+    "updated_at": 1,
+    "revision_id": 1,
+    "status": 1,
+    "enrollment_count": 1,
+    "lessons_count": 1,
+    "total_duration_hours": 1,
+    "rating_average": 1,
+    "rating_count": 1,
+    "rating_histogram": 1,
+}
 
 class CourseService:
     
     @staticmethod
-    async def update_course_stats(course_id: str):
+    async def apply_lesson_delta(course_id: Any, lessons: int = 0, seconds: int = 0) -> None:
         """
-        Recalcula y guarda estadísticas del curso en DB.
-        Debe llamarse cuando se agregan/eliminan/editan lecciones.
+        Ajusta lessons_count y total_duration_seconds del curso con un $inc atómico.
+        Se llama al crear (+1, +duración), editar (diferencia de duración) o eliminar
+        (-1, -duración) una lección; no lee las demás lecciones.
+
+        total_duration_hours se deriva de los segundos que devolvió el $inc y solo se
+        escribe si siguen vigentes (si otra lección cambió entre medio, lo escribe ella).
+
+        Los cursos creados antes de total_duration_seconds no tienen el campo: sumarles
+        la diferencia daría una duración parcial, así que la primera vez se calculan sus
+        estadísticas desde las lecciones (que ya incluyen este cambio).
         """
-        from bson import ObjectId
-        # Asegurar que sea ObjectId si viene como str
-        if isinstance(course_id, str):
-            try:
-                course_id = ObjectId(course_id)
-            except:
+        inc = {field: delta for field, delta in (("lessons_count", lessons), ("total_duration_seconds", seconds)) if delta}
+        if not inc:
+            return
+
+        course_oid = PydanticObjectId(course_id)
+        collection = Course.get_motor_collection()
+        course = await collection.find_one_and_update(
+            {"_id": course_oid, "total_duration_seconds": {"$exists": True}},
+            {"$inc": inc},
+            projection={"total_duration_seconds": 1, "status": 1, "is_deleted": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if course is None:
+            course = await CourseService._backfill_lesson_stats(course_oid)
+            if course is None:
                 return
+        else:
+            total_seconds = course["total_duration_seconds"]
+            await collection.update_one(
+                {"_id": course["_id"], "total_duration_seconds": total_seconds},
+                {"$set": {"total_duration_hours": round(total_seconds / 3600, 2)}}
+            )
 
-        course = await Course.get(course_id)
-        if not course:
-            return
-        
-        # Calcular estadísticas reales (sin las eliminadas lógicamente)
-        lessons = await Lesson.find({"course_id": course.id, "is_deleted": False}).to_list()
-        
-        course.lessons_count = len(lessons)
-        total_seconds = sum(l.duration_seconds or 0 for l in lessons)
-        course.total_duration_hours = round(total_seconds / 3600, 2)
-        
-        # Guardar cambios
-        await course.save()
+        if course["status"] == CourseStatus.PUBLISHED and not course.get("is_deleted"):
+            CourseCacheService.invalidate_catalog()
+        course_public_view_service.invalidate_course(str(course["_id"]))
+
+    @staticmethod
+    async def _lesson_stats(match: Dict[str, Any]) -> Dict[Any, Dict[str, int]]:
+        """Estadísticas de lecciones por curso: un $group sobre las lecciones no eliminadas que cumplen `match`"""
+        rows = await Lesson.get_motor_collection().aggregate([
+            {"$match": {**match, "is_deleted": False}},
+            {"$group": {
+                "_id": "$course_id",
+                "lessons_count": {"$sum": 1},
+                "total_duration_seconds": {"$sum": {"$ifNull": ["$duration_seconds", 0]}},
+            }},
+        ]).to_list(length=None)
+        return {row["_id"]: row for row in rows}
+
+    @staticmethod
+    def _lesson_stats_fields(row: Dict[str, int]) -> Dict[str, Any]:
+        """Campos del curso a partir de una fila de _lesson_stats (vacía = sin lecciones)"""
+        total_seconds = row.get("total_duration_seconds", 0)
+        return {
+            "lessons_count": row.get("lessons_count", 0),
+            "total_duration_seconds": total_seconds,
+            "total_duration_hours": round(total_seconds / 3600, 2),
+        }
+
+    @staticmethod
+    async def _backfill_lesson_stats(course_oid: PydanticObjectId) -> Optional[Dict[str, Any]]:
+        """
+        Calcula desde sus lecciones las estadísticas de un curso sin total_duration_seconds.
+        Solo escribe si el campo sigue faltando: si otro cambio de lección ya lo completó,
+        ese cálculo también incluye el de ahora. Retorna el curso actualizado o None.
+        """
+        stats = await CourseService._lesson_stats({"course_id": course_oid})
+        return await Course.get_motor_collection().find_one_and_update(
+            {"_id": course_oid, "total_duration_seconds": {"$exists": False}},
+            {"$set": CourseService._lesson_stats_fields(stats.get(course_oid, {}))},
+            projection={"status": 1, "is_deleted": 1},
+            return_document=ReturnDocument.AFTER
+        )
+
+    @staticmethod
+    async def recompute_lesson_stats() -> Dict[str, int]:
+        """
+        Reconstruye lessons_count, total_duration_seconds y total_duration_hours de todos
+        los cursos con un solo $group sobre las lecciones y corrige los que no coinciden
+        con un solo bulk_write. Los cursos sin lecciones quedan en cero.
+        """
+        stats = await CourseService._lesson_stats({})
+
+        ops: List[UpdateOne] = []
+        checked = 0
+        fields = {"lessons_count": 1, "total_duration_seconds": 1, "total_duration_hours": 1}
+        async for course in Course.get_motor_collection().find({}, fields):
+            checked += 1
+            expected = CourseService._lesson_stats_fields(stats.get(course["_id"], {}))
+            if any(course.get(field) != value for field, value in expected.items()):
+                ops.append(UpdateOne({"_id": course["_id"]}, {"$set": expected}))
+
+        if ops:
+            await Course.get_motor_collection().bulk_write(ops, ordered=False)
+            logger.info(f"📚 Estadísticas de lecciones corregidas en {len(ops)} cursos")
+        return {"courses_checked": checked, "courses_corrected": len(ops)}
+
+    @staticmethod
+    def _course_changed(course: Course, was_published: bool = False, deleted: bool = False) -> None:
+        """Propaga un cambio del curso a las estructuras en memoria (catálogo, detalle público y autocompletado)"""
+        CourseCacheService.invalidate_for_course(course, was_published or deleted)
+        # Los borradores nunca tienen vista pública: solo se toca si está o estuvo publicado
+        is_published = course.status == CourseStatus.PUBLISHED and not course.is_deleted
+        course_public_view_service.invalidate_course(
+            str(course.id), course.slug if (is_published or was_published or deleted) else None
+        )
+        if deleted:
+            course_suggest_service.remove_course(str(course.id))
+        else:
+            course_suggest_service.update_course(course)
 
     @staticmethod
     async def get_courses(
@@ -56,12 +175,22 @@ class CourseService:
         difficulty: Optional[str] = None,
         status: Optional[str] = None,
         search: Optional[str] = None,
-        current_user: Optional[User] = None
+        current_user: Optional[User] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Obtener lista paginada de cursos con filtros.
         Calcula is_enrolled para cada curso según el usuario actual.
+        Con `cursor` (tomado de `next_cursor`) pagina por keyset e ignora `page`.
+        Las búsquedas (`search`) se ordenan por relevancia y se paginan solo con `page`:
+        combinar `cursor` con `search` es un 400.
+
+        La vista pública trae solo los campos de tarjeta (CourseCardView); el admin recibe
+        el documento completo. `fields` (separados por coma) reduce la proyección y la
+        respuesta a esos campos de tarjeta en ambos casos (`id` e `is_enrolled` siempre vienen).
         """
+        card_fields = CourseService._parse_card_fields(fields)
         query_filters = [Course.is_deleted == False]
         # Calcular vista pública basada en el usuario
         is_admin = current_user and current_user.role in [Role.ADMIN, Role.SUPERADMIN]
@@ -81,61 +210,215 @@ class CourseService:
         if difficulty:
             query_filters.append(Course.difficulty == difficulty)
             
-        if search:
-            safe_search=re.escape(search)
-            query_filters.append({"title": {"$regex": safe_search, "$options": "i"}})
+        # Búsqueda por índice de texto (título, etiquetas, subcategoría, descripción)
+        text_filter = text_search_filter(search)
+        if text_filter:
+            query_filters.append(text_filter)
+        ranked = text_filter is not None
+        if ranked and cursor:
+            # El cursor sigue el orden por fecha: la página 2 no continuaría la de relevancia
+            raise HTTPException(
+                status_code=400,
+                detail="La paginación por cursor no está disponible en búsquedas, usa page"
+            )
 
-        query = Course.find(*query_filters)
-        total = await query.count()
-        
-        skip = (page - 1) * limit
-        courses = await query.sort("-created_at").skip(skip).limit(limit).to_list()
-        
-        # Calcular is_enrolled para cada curso
-        if current_user:
-            from app.models.enrollment import Enrollment
-            
-            # Verificar si es admin (acceso total)
-            if current_user.role in [Role.ADMIN, Role.SUPERADMIN]:
-                # Admin tiene acceso a todo
-                for course in courses:
-                    course.is_enrolled = True
-            else:
-                # Usuario regular: obtener enrollments activos en UNA sola query
-                enrollments = await Enrollment.find({
-                    "user_id": current_user.id,
-                    "status": "ACTIVE",
-                    "is_deleted": False
-                }).to_list()
-                
-                # Crear set de course_ids para búsqueda O(1)
-                enrolled_course_ids = set()
-                for e in enrollments:
-                    if await e.is_active_now():
-                        enrolled_course_ids.add(e.course_id)
-                
-                # Marcar cursos inscritos
-                for course in courses:
-                    course.is_enrolled = course.id in enrolled_course_ids
+        if not public_view:
+            # Admin: sin caché (ve borradores) y con acceso total
+            result = await CourseService._load_courses_page(
+                query_filters, page, limit, cursor, ranked, card_fields, full_documents=True
+            )
+            for course_dict in result["data"]:
+                course_dict["is_enrolled"] = True
+            return result
+
+        # Vista pública: página compartida por todos los usuarios, cacheada sin is_enrolled
+        key = CourseCacheService.catalog_key(page, limit, category, difficulty, search, cursor, card_fields)
+        result = await CourseCacheService.get_catalog_page(
+            key, lambda: CourseService._load_courses_page(query_filters, page, limit, cursor, ranked, card_fields)
+        )
+        if not current_user:
+            return result
+
+        # Superponer is_enrolled del usuario sin modificar la página cacheada
+        enrolled_course_ids = await AccessService.enrolled_course_ids(
+            current_user.id, [PydanticObjectId(course_dict["id"]) for course_dict in result["data"]]
+        )
+        return {
+            **result,
+            "data": [
+                {**course_dict, "is_enrolled": course_dict["id"] in enrolled_course_ids}
+                for course_dict in result["data"]
+            ]
+        }
+
+    @staticmethod
+    async def _load_courses_page(
+        query_filters: List[Any],
+        page: int,
+        limit: int,
+        cursor: Optional[str] = None,
+        ranked: bool = False,
+        card_fields: Optional[FrozenSet[str]] = None,
+        full_documents: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Consulta y serializa una página de cursos (is_enrolled=False).
+        Con `ranked` (búsqueda por texto) la página se ordena por relevancia; ese orden
+        no admite cursor, así que next_cursor solo se emite en el orden por fecha.
+        Proyecta con CourseCardView (reducida a `card_fields` si se indican) salvo que se
+        pidan los documentos completos sin `card_fields`.
+        """
+        if card_fields:
+            projection_model = CourseCardView.narrowed(card_fields)
+        else:
+            projection_model = None if full_documents else CourseCardView
+
+        if cursor:
+            # Keyset: rango sobre (created_at, _id) sin contar ni saltar documentos
+            query = Course.find(*query_filters, seek_filter(cursor, "created_at"))\
+                .sort(sort_spec("created_at")).limit(limit + 1)
+            if projection_model:
+                query = query.project(projection_model)
+            courses = await query.to_list()
+            has_more = len(courses) > limit
+            courses = courses[:limit]
+            total = None
+        else:
+            # Página + total en un solo viaje ($facet)
+            skip = (page - 1) * limit
+            sort = TEXT_SCORE_SORT + sort_spec("created_at") if ranked else sort_spec("created_at")
+            courses, total = await paginate(
+                Course, query_filters, sort, skip, limit, projection_model=projection_model
+            )
+            has_more = skip + len(courses) < total and not ranked
 
         # Convertir cursos a dicts e incluir is_enrolled manualmente
+        include = card_fields | {"id"} if card_fields else None
         courses_data = []
         for course in courses:
-            course_dict = course.model_dump(mode='json')
-            course_dict["is_enrolled"] = course.is_enrolled
+            course_dict = course.model_dump(mode='json', include=include)
+            course_dict["is_enrolled"] = False
             courses_data.append(course_dict)
         
         return {
             "data": courses_data,
             "total": total,
-            "page": page,
+            "page": None if cursor else page,
             "limit": limit,
-            "pages": (total + limit - 1) // limit
+            "pages": None if cursor else (total + limit - 1) // limit,
+            "next_cursor": next_cursor_for(courses, "created_at", limit, has_more)
         }
 
     @staticmethod
-    async def get_course_by_slug(slug: str, current_user: Optional[User] = None) -> Dict[str, Any]:
-        """Obtener curso por slug con control de acceso híbrido"""
+    def _parse_card_fields(fields: Optional[str]) -> Optional[FrozenSet[str]]:
+        """Valida el parámetro `fields` (campos de CourseCardView separados por coma)"""
+        if not fields:
+            return None
+        requested = frozenset(f.strip() for f in fields.split(",") if f.strip())
+        unknown = requested - CourseCardView.model_fields.keys()
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Campos no válidos: {', '.join(sorted(unknown))}. "
+                       f"Disponibles: {', '.join(CourseCardView.model_fields)}"
+            )
+        return requested or None
+
+    @staticmethod
+    async def _has_active_enrollment(current_user, course_id) -> bool:
+        """Verifica si el usuario tiene inscripción activa en el curso"""
+        enrollment = await Enrollment.find_one({
+            "user_id": current_user.id,
+            "course_id": course_id,
+            "status": "ACTIVE",
+            "is_deleted": False
+        })
+        return bool(enrollment and enrollment.is_active_now())
+
+    @staticmethod
+    async def get_public_view(slug: str, current_user: Optional[User] = None) -> Optional[CoursePublicView]:
+        """
+        Detalle precalculado para quien no tiene acceso al contenido (anónimo o no inscrito).
+        Retorna None si el usuario es admin o está inscrito: su detalle se arma completo.
+        Lanza 404 si el curso no existe o no está publicado.
+        """
+        if current_user and current_user.role in [Role.ADMIN, Role.SUPERADMIN]:
+            return None
+
+        public_view = await course_public_view_service.get(slug)
+        if public_view is None:
+            raise HTTPException(status_code=404, detail="Curso no encontrado")
+
+        if current_user and await CourseService._has_active_enrollment(
+            current_user, PydanticObjectId(public_view.course_id)
+        ):
+            return None
+        return public_view
+
+    @staticmethod
+    async def get_course_etag(
+        slug: str,
+        current_user: Optional[User] = None,
+        is_enrolled: Optional[bool] = None
+    ) -> Tuple[str, bool]:
+        """
+        Versión del detalle de un curso sin cargarlo completo.
+
+        Lee solo los campos de versión del curso, la fecha máxima de modificación y la
+        cantidad de sus lecciones (una agregación) y el nivel de acceso del usuario
+        (`is_enrolled` evita repetir la consulta de inscripción si ya se conoce).
+        Lanza 404 igual que get_course_by_slug.
+
+        Returns:
+            (ETag fuerte, is_enrolled) — is_enrolled se reutiliza en get_course_by_slug
+        """
+        is_admin = current_user and current_user.role in [Role.ADMIN, Role.SUPERADMIN]
+        course_filter = {"slug": slug, "is_deleted": False}
+        if not is_admin:
+            course_filter["status"] = CourseStatus.PUBLISHED.value
+
+        version = await Course.get_motor_collection().find_one(course_filter, COURSE_VERSION_FIELDS)
+        if not version:
+            raise HTTPException(status_code=404, detail="Curso no encontrado")
+
+        # Incluye lecciones eliminadas en el máximo: un borrado lógico también cambia la versión
+        lessons = await Lesson.get_motor_collection().aggregate([
+            {"$match": {"course_id": version["_id"]}},
+            {"$group": {
+                "_id": None,
+                "max_updated_at": {"$max": "$updated_at"},
+                "active": {"$sum": {"$cond": [{"$eq": ["$is_deleted", False]}, 1, 0]}},
+            }},
+        ]).to_list(length=1)
+        lessons_version = lessons[0] if lessons else {}
+
+        if is_admin:
+            access, is_enrolled = "admin", True
+        elif is_enrolled is not None:
+            access = "enrolled" if is_enrolled else "public"
+        elif current_user and await CourseService._has_active_enrollment(current_user, version["_id"]):
+            access, is_enrolled = "enrolled", True
+        else:
+            access, is_enrolled = "public", False
+
+        etag = compute_etag(
+            *(version.get(field) for field in ["_id", *COURSE_VERSION_FIELDS]),
+            lessons_version.get("max_updated_at"),
+            lessons_version.get("active", 0),
+            access
+        )
+        return etag, is_enrolled
+
+    @staticmethod
+    async def get_course_by_slug(
+        slug: str,
+        current_user: Optional[User] = None,
+        is_enrolled: Optional[bool] = None
+    ) -> CourseDetailResponseSchema:
+        """
+        Obtener curso por slug con control de acceso híbrido.
+        `is_enrolled` permite reutilizar el acceso ya calculado por get_course_etag.
+        """
         # Calcular vista pública basada en el usuario
         is_admin = current_user and current_user.role in [Role.ADMIN, Role.SUPERADMIN]
         public_view = not is_admin
@@ -152,43 +435,26 @@ class CourseService:
             raise HTTPException(status_code=404, detail="Curso no encontrado")
         
         # Verificar inscripción y setear is_enrolled
-        if current_user:
-            from app.models.enrollment import Enrollment
+        if is_enrolled is not None:
+            course.is_enrolled = is_enrolled
+        elif current_user:
             # Verificar si es admin (acceso total)
             if current_user.role in [Role.ADMIN, Role.SUPERADMIN]:
                 course.is_enrolled = True
             else:
                 # Verificar si tiene inscripción activa
-                enrollment = await Enrollment.find_one({
-                    "user_id": current_user.id,
-                    "course_id": course.id,
-                    "status": "ACTIVE",
-                    "is_deleted": False
-                })
-                if enrollment and await enrollment.is_active_now():
-                    course.is_enrolled = True
+                course.is_enrolled = await CourseService._has_active_enrollment(current_user, course.id)
         
         # --- NUEVO: Obtener y filtar Lecciones ---
-        from app.models.lesson import Lesson
-        
         # 1. Obtener todas las lecciones del curso ordenadas
         lessons = await Lesson.find({"course_id": course.id, "is_deleted": False}).sort("order").to_list()
         
         # 2. Filtrar contenido sensible si NO está inscrito
         if not course.is_enrolled:
-            for lesson in lessons:
-                # Si NO es preview, ocultar video y materiales
-                if not lesson.is_preview:
-                    lesson.video_url = None
-                    lesson.video_id = None
-                    lesson.materials = []
+            LessonService.hide_private_content(lessons)
         
-        # 3. Convertir curso a dict y agregar lecciones
-        course_dict = course.model_dump(mode='json')
-        course_dict["is_enrolled"] = course.is_enrolled  # Incluir manualmente (exclude=True en modelo)
-        course_dict["lessons"] = [lesson.model_dump(mode='json') for lesson in lessons]
-
-        return course_dict
+        # 3. Armar la respuesta directo desde los documentos (se valida una sola vez)
+        return CourseDetailResponseSchema.from_documents(course, lessons, course.is_enrolled)
 
     @staticmethod
     async def create_course(data: CourseCreateSchema, user: User) -> Course:
@@ -209,8 +475,17 @@ class CourseService:
             created_by=str(user.id)
         )
         
-        await course.save()
-        return course
+        # El índice único de slug resuelve creaciones simultáneas con el mismo título
+        for attempt in range(SLUG_INSERT_RETRIES):
+            try:
+                await course.insert()
+                CourseService._course_changed(course)
+                return course
+            except DuplicateKeyError as e:
+                key = next(iter((e.details or {}).get("keyPattern", {})), None)
+                if key != "slug" or attempt == SLUG_INSERT_RETRIES - 1:
+                    raise HTTPException(status_code=400, detail="No se pudo asignar un slug único al curso")
+                course.slug = await ensure_unique_slug_course(slug_base)
 
     @staticmethod
     async def update_course(course_id: str, data: CourseUpdateSchema, user: User) -> Course:
@@ -219,6 +494,7 @@ class CourseService:
         if not course or course.is_deleted:
             raise HTTPException(status_code=404, detail="Curso no encontrado")
             
+        was_published = course.status == CourseStatus.PUBLISHED
         update_data = data.model_dump(exclude_unset=True)
         
         for key, value in update_data.items():
@@ -226,6 +502,7 @@ class CourseService:
             
         course.updated_by = str(user.id)
         await course.save()
+        CourseService._course_changed(course, was_published)
         return course
 
     @staticmethod
@@ -236,6 +513,7 @@ class CourseService:
             raise HTTPException(status_code=404, detail="Curso no encontrado")
             
         if course.status != status:
+            was_published = course.status == CourseStatus.PUBLISHED
             course.status = status
             
             if status == CourseStatus.PUBLISHED and not course.published_at:
@@ -243,6 +521,7 @@ class CourseService:
                 
             course.updated_by = str(user.id)
             await course.save()
+            CourseService._course_changed(course, was_published)
         
         return course
 
@@ -262,6 +541,7 @@ class CourseService:
             course.cover_image_url = url
             course.updated_by = str(user.id)
             await course.save()
+            CourseService._course_changed(course)
             
             return course
         except Exception as e:
@@ -280,39 +560,20 @@ class CourseService:
             
         if user.role == Role.SUPERADMIN:
             # Borrado FÍSICO: cascada destructiva
-            await Lesson.find({"course_id": course.id}).delete()
-            await Enrollment.find({"course_id": course.id}).delete()
-            #PENDIENTE:programar eliminacion de reviews
-            await course.delete()
-            return {"message": "Curso eliminado permanentemente junto con lecciones, inscripciones y reseñas"}
+            affected = await CascadeService.hard_delete_course(course)
+            CourseService._course_changed(course, deleted=True)
+            return {
+                "message": "Curso eliminado permanentemente junto con lecciones, inscripciones y reseñas",
+                "affected": affected
+            }
         elif user.role == Role.ADMIN:
-            from app.models.enums import EnrollmentStatus
-            
-            # Borrado LÓGICO: cascada de ocultamiento
-            course.is_deleted = True
-            course.deleted_at = datetime.utcnow()
-            course.deleted_by = str(user.id)
-            await course.save()
-            
-            # Ocultar también lecciones asociadas
-            lessons = await Lesson.find({"course_id": course.id, "is_deleted": False}).to_list()
-            for l in lessons:
-                l.is_deleted = True
-                l.deleted_at = datetime.utcnow()
-                l.deleted_by = str(user.id)
-                await l.save()
-                
-            # Ocultar también inscripciones asociadas
-            enrollments = await Enrollment.find({"course_id": course.id, "is_deleted": False}).to_list()
-            for e in enrollments:
-                e.is_deleted = True
-                e.deleted_at = datetime.utcnow()
-                e.deleted_by = str(user.id)
-                e.status = EnrollmentStatus.CANCELLED
-                await e.save()
-                
-            # TODO: Ocultar reseñas asociadas (CourseReview)
-                
-            return {"message": "Curso enviado a papelera con todo su contenido asociado"}
+            # Borrado LÓGICO: cascada de ocultamiento (lecciones, comentarios, inscripciones y reseñas)
+            was_published = course.status == CourseStatus.PUBLISHED and not course.is_deleted
+            affected = await CascadeService.soft_delete_course(course, user)
+            CourseService._course_changed(course, was_published=was_published)
+            return {
+                "message": "Curso enviado a papelera con todo su contenido asociado",
+                "affected": affected
+            }
         else:
              raise HTTPException(status_code=403, detail="No tienes permisos para eliminar cursos")
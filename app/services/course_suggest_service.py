@@ -0,0 +1,166 @@
+"""
+Servicio de autocompletado de cursos y etiquetas
+
+Mantiene en memoria un índice de prefijos de los cursos publicados (títulos y etiquetas
+normalizados con normalize_text), así las sugerencias no consultan MongoDB.
+
+- Se construye al arrancar (lifespan) y se actualiza en cada cambio de curso del worker.
+- Los demás workers reconstruyen su índice en segundo plano cuando tiene más de
+  SUGGEST_INDEX_REFRESH_SECONDS; mientras tanto siguen respondiendo con el anterior.
+- Los cambios aplicados mientras una reconstrucción lee de MongoDB se anotan y se
+  vuelven a aplicar sobre el índice nuevo: la lectura pudo ser anterior a ellos.
+"""
+
+from typing import Any, Dict, List, Optional, Set
+import asyncio
+import logging
+import time
+
+from app.config import settings
+from app.models.course import Course
+from app.models.enums import CourseStatus
+from app.utils.prefix_index import PrefixIndex
+from app.utils.slug import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Palabras que no generan una clave propia ("torta de chocolate" no se sugiere por "de")
+MIN_WORD_LENGTH = 3
+
+
+def _title_keys(normalized_title: str) -> List[str]:
+    """El título completo y cada sufijo que empieza en una palabra significativa"""
+    words = normalized_title.split()
+    return [" ".join(words[i:]) for i, word in enumerate(words) if i == 0 or len(word) >= MIN_WORD_LENGTH]
+
+
+class CourseSuggestService:
+
+    def __init__(self):
+        self._courses = PrefixIndex()
+        self._tags = PrefixIndex()
+        self._tag_courses: Dict[str, Set[str]] = {}  # tag normalizado -> ids de cursos
+        self._course_tags: Dict[str, Set[str]] = {}  # id de curso -> tags normalizados
+        self._tag_labels: Dict[str, str] = {}        # tag normalizado -> texto original
+        self._built_at = 0.0
+        self._rebuild_task = None
+        # Un registro por build() en curso: id de curso -> curso (None = quitado)
+        self._recorders: List[Dict[str, Optional[Course]]] = []
+
+    # ─────────────────────────────────────────────
+    # CONSTRUCCIÓN Y ACTUALIZACIÓN
+    # ─────────────────────────────────────────────
+
+    async def build(self) -> None:
+        """Carga todos los cursos publicados (solo los campos necesarios) y rehace el índice"""
+        changed: Dict[str, Optional[Course]] = {}
+        self._recorders.append(changed)
+        try:
+            docs = await Course.get_motor_collection().find(
+                {"status": CourseStatus.PUBLISHED.value, "is_deleted": False},
+                {"title": 1, "slug": 1, "tags": 1}
+            ).to_list(length=None)
+        finally:
+            self._recorders.remove(changed)
+
+        fresh = CourseSuggestService()
+        for doc in docs:
+            fresh._index_course(str(doc["_id"]), doc["title"], doc["slug"], doc.get("tags") or [])
+
+        # Reemplazo atómico desde el punto de vista del event loop
+        self._courses, self._tags = fresh._courses, fresh._tags
+        self._tag_courses, self._course_tags = fresh._tag_courses, fresh._course_tags
+        self._tag_labels = fresh._tag_labels
+        self._built_at = time.monotonic()
+
+        # Cambios de este worker ocurridos durante la lectura
+        for course_id, course in changed.items():
+            if course is None:
+                self.remove_course(course_id)
+            else:
+                self.update_course(course)
+        logger.info(f"🔎 Índice de autocompletado: {len(self._courses)} cursos, {len(self._tags)} etiquetas")
+
+    def update_course(self, course: Course) -> None:
+        """Refleja un cambio del curso: lo indexa si está publicado, si no lo quita"""
+        for changed in self._recorders:
+            changed[str(course.id)] = course
+        if course.status == CourseStatus.PUBLISHED and not course.is_deleted:
+            self._index_course(str(course.id), course.title, course.slug, course.tags)
+        else:
+            self.remove_course(str(course.id))
+
+    def remove_course(self, course_id: str) -> None:
+        for changed in self._recorders:
+            changed[course_id] = None
+        self._courses.remove(course_id)
+        for tag in self._course_tags.pop(course_id, set()):
+            self._release_tag(tag, course_id)
+
+    def _index_course(self, course_id: str, title: str, slug: str, tags: List[str]) -> None:
+        self._courses.set(
+            course_id,
+            _title_keys(normalize_text(title)),
+            {"id": course_id, "title": title, "slug": slug}
+        )
+
+        new_tags = {normalize_text(t): t for t in tags if normalize_text(t)}
+        for tag in self._course_tags.get(course_id, set()) - new_tags.keys():
+            self._release_tag(tag, course_id)
+        for tag, label in new_tags.items():
+            courses = self._tag_courses.setdefault(tag, set())
+            courses.add(course_id)
+            self._tag_labels.setdefault(tag, label)
+            self._tags.set(tag, [tag], tag)
+        self._course_tags[course_id] = set(new_tags)
+
+    def _release_tag(self, tag: str, course_id: str) -> None:
+        courses = self._tag_courses.get(tag)
+        if courses is None:
+            return
+        courses.discard(course_id)
+        if not courses:
+            del self._tag_courses[tag]
+            self._tag_labels.pop(tag, None)
+            self._tags.remove(tag)
+
+    def _refresh_if_stale(self) -> None:
+        """Programa una reconstrucción en segundo plano si el índice es viejo (otros workers)"""
+        if time.monotonic() - self._built_at < settings.SUGGEST_INDEX_REFRESH_SECONDS:
+            return
+        if self._rebuild_task is not None and not self._rebuild_task.done():
+            return
+        self._rebuild_task = asyncio.ensure_future(self.build())
+        self._rebuild_task.add_done_callback(self._rebuild_done)
+
+    @staticmethod
+    def _rebuild_done(task: "asyncio.Task") -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"No se pudo reconstruir el índice de autocompletado: {task.exception()}")
+
+    # ─────────────────────────────────────────────
+    # CONSULTA
+    # ─────────────────────────────────────────────
+
+    def suggest(self, q: str, limit: int = 8) -> Dict[str, Any]:
+        """Cursos y etiquetas cuyo texto normalizado empieza por `q`"""
+        self._refresh_if_stale()
+        prefix = normalize_text(q)
+        tags = self._tags.search(prefix, limit)
+        return {
+            "courses": self._courses.search(prefix, limit),
+            "tags": [
+                {"tag": self._tag_labels[tag], "courses_count": len(self._tag_courses[tag])}
+                for tag in tags
+            ],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "courses": len(self._courses),
+            "tags": len(self._tags),
+            "age_seconds": round(time.monotonic() - self._built_at, 1) if self._built_at else None,
+        }
+
+
+course_suggest_service = CourseSuggestService()
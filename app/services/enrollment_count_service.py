@@ -0,0 +1,83 @@
+"""
+Servicio del contador Course.enrollment_count
+
+enrollment_count = inscripciones ACTIVE y no eliminadas del curso. Se mantiene con
+$inc atómicos en cada transición (crear, reactivar, eliminar, cascada al borrar un
+usuario o curso y el barrido de vencidas), así el catálogo lo lee junto al curso sin
+contar inscripciones por curso.
+
+Si el contador se desvía (datos previos, carreras entre una baja y el barrido), la
+reconciliación lo recalcula para todos los cursos con un solo $group y corrige las
+diferencias con un solo bulk_write.
+"""
+
+from typing import Any, Dict, List, Mapping
+import logging
+
+from beanie import PydanticObjectId
+from pymongo import UpdateOne
+
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.enums import EnrollmentStatus
+
+logger = logging.getLogger(__name__)
+
+# Inscripciones que cuentan para enrollment_count
+COUNTED_ENROLLMENTS = {"status": EnrollmentStatus.ACTIVE.value, "is_deleted": False}
+
+
+class EnrollmentCountService:
+
+    @staticmethod
+    async def increment(course_id: PydanticObjectId, delta: int = 1) -> None:
+        """Suma `delta` (puede ser negativo) al contador de un curso"""
+        if delta:
+            await Course.get_motor_collection().update_one(
+                {"_id": course_id}, {"$inc": {"enrollment_count": delta}}
+            )
+
+    @staticmethod
+    async def apply_deltas(deltas: Mapping[Any, int]) -> None:
+        """Aplica varios deltas por curso ({course_id: delta}) en un solo bulk_write"""
+        ops = [
+            UpdateOne({"_id": course_id}, {"$inc": {"enrollment_count": delta}})
+            for course_id, delta in deltas.items() if delta
+        ]
+        if ops:
+            await Course.get_motor_collection().bulk_write(ops, ordered=False)
+
+    @staticmethod
+    async def count_by_course(match: Dict[str, Any]) -> Dict[Any, int]:
+        """Inscripciones contadas que cumplen `match`, agrupadas por curso"""
+        rows = await Enrollment.get_motor_collection().aggregate([
+            {"$match": {**match, **COUNTED_ENROLLMENTS}},
+            {"$group": {"_id": "$course_id", "count": {"$sum": 1}}},
+        ]).to_list(length=None)
+        return {row["_id"]: row["count"] for row in rows}
+
+    @staticmethod
+    async def reconcile() -> Dict[str, int]:
+        """
+        Recalcula enrollment_count de todos los cursos y corrige los que no coinciden.
+        Retorna cuántos cursos revisó y cuántos corrigió.
+        """
+        counts = await EnrollmentCountService.count_by_course({})
+
+        ops: List[UpdateOne] = []
+        checked = 0
+        async for course in Course.get_motor_collection().find({}, {"enrollment_count": 1}):
+            checked += 1
+            expected = counts.get(course["_id"], 0)
+            if course.get("enrollment_count") != expected:
+                # Solo si nadie lo movió desde que se leyó (no pisar un $inc concurrente)
+                ops.append(UpdateOne(
+                    {"_id": course["_id"], "enrollment_count": course.get("enrollment_count")},
+                    {"$set": {"enrollment_count": expected}}
+                ))
+
+        if ops:
+            await Course.get_motor_collection().bulk_write(ops, ordered=False)
+            logger.info(f"🔢 enrollment_count corregido en {len(ops)} cursos")
+        return {"courses_checked": checked, "courses_corrected": len(ops)}
+
@@ -0,0 +1,112 @@
+"""
+Barrido periódico de inscripciones vencidas
+
+Las lecturas (catálogo, detalle, lecciones, acceso) solo comparan expires_at con la hora
+actual y nunca escriben. Este servicio es el único que pasa a EXPIRED las inscripciones
+ACTIVE cuyo expires_at ya pasó: un update_many sobre el índice de expires_at cada
+ENROLLMENT_EXPIRY_SWEEP_SECONDS.
+
+Corre en cada worker; el update es idempotente, así que varios barridos simultáneos
+solo se reparten el trabajo. Cada barrido marca lo que cambió con su expiry_sweep_id y
+descuenta solo eso de Course.enrollment_count, así ninguna inscripción se descuenta dos veces.
+"""
+
+from typing import Any, Dict, Optional
+from datetime import datetime
+import asyncio
+import logging
+import time
+import uuid
+
+from app.config import settings
+from app.models.enrollment import Enrollment
+from app.models.enums import EnrollmentStatus
+from app.services.enrollment_count_service import EnrollmentCountService
+
+logger = logging.getLogger(__name__)
+
+
+class EnrollmentExpiryService:
+
+    def __init__(self):
+        self._task: Optional["asyncio.Task"] = None
+        self.runs = 0
+        self.errors = 0
+        self.total_expired = 0
+        self.last_expired = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_duration_ms: Optional[float] = None
+
+    async def sweep(self) -> int:
+        """Marca como EXPIRED todas las inscripciones activas vencidas. Retorna cuántas cambió."""
+        start = time.perf_counter()
+        now = datetime.utcnow()
+        sweep_id = uuid.uuid4().hex
+        result = await Enrollment.get_motor_collection().update_many(
+            {"expires_at": {"$lte": now}, "status": EnrollmentStatus.ACTIVE.value},
+            {"$set": {
+                "status": EnrollmentStatus.EXPIRED.value,
+                "updated_at": now,
+                "expiry_sweep_id": sweep_id,
+            }}
+        )
+        if result.modified_count:
+            await self._discount_expired(sweep_id)
+
+        self.runs += 1
+        self.last_run_at = now
+        self.last_expired = result.modified_count
+        self.total_expired += result.modified_count
+        self.last_duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        if result.modified_count:
+            logger.info(f"⏰ {result.modified_count} inscripciones marcadas como vencidas")
+        return result.modified_count
+
+    @staticmethod
+    async def _discount_expired(sweep_id: str) -> None:
+        """Descuenta de enrollment_count las inscripciones (no eliminadas) que venció este barrido"""
+        expired = await Enrollment.get_motor_collection().aggregate([
+            {"$match": {"expiry_sweep_id": sweep_id, "is_deleted": False}},
+            {"$group": {"_id": "$course_id", "count": {"$sum": 1}}},
+        ]).to_list(length=None)
+        await EnrollmentCountService.apply_deltas({row["_id"]: -row["count"] for row in expired})
+
+    def start(self) -> None:
+        """Inicia el barrido en segundo plano (no hace nada si el intervalo es 0)"""
+        if settings.ENROLLMENT_EXPIRY_SWEEP_SECONDS <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Falló el barrido de inscripciones vencidas: {e}")
+            await asyncio.sleep(settings.ENROLLMENT_EXPIRY_SWEEP_SECONDS)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval_seconds": settings.ENROLLMENT_EXPIRY_SWEEP_SECONDS,
+            "running": self._task is not None and not self._task.done(),
+            "runs": self.runs,
+            "errors": self.errors,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_expired": self.last_expired,
+            "last_duration_ms": self.last_duration_ms,
+            "total_expired": self.total_expired,
+        }
+
+
+enrollment_expiry_service = EnrollmentExpiryService()
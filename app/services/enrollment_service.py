@@ -3,7 +3,7 @@ Servicio para lógica de negocio de Enrollments
 Gestión de inscripciones a cursos individuales
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from fastapi import HTTPException
 from datetime import datetime
 from app.models.enrollment import Enrollment
@@ -13,14 +13,19 @@ from app.models.enums import EnrollmentStatus, Role
 from app.schemas.enrollment_schema import (
     EnrollmentCreateSchema,
     EnrollmentProgressUpdateSchema,
-    EnrollmentExtendSchema
+    EnrollmentExtendSchema,
+    EnrollmentResponseSchema,
+    EnrollmentListResponse
 )
+from app.utils.pagination import seek_filter, sort_spec, next_cursor_for, paginate
+from app.utils.search import text_search_filter
+from app.services.enrollment_count_service import EnrollmentCountService
 import re
 
 class EnrollmentService:
     @staticmethod
-    async def _build_enrollment_response(enrollment: Enrollment,user: Optional[User] = None,course: Optional[Course] = None) -> Dict[str, Any]:
-        """Helper para construir el diccionario de respuesta anidado."""
+    async def _build_enrollment_response(enrollment: Enrollment,user: Optional[User] = None,course: Optional[Course] = None) -> EnrollmentResponseSchema:
+        """Helper para construir la respuesta anidada (modelo ya validado, listo para serializar)."""
         from app.models.lesson import Lesson
         
         # Si no nos pasan el usuario/curso, lo buscamos en la BD
@@ -41,28 +46,58 @@ class EnrollmentService:
                 enrollment.last_accessed_lesson_id = first_lesson.id if first_lesson else None
                 await enrollment.save()
                 
-        enrollment_dict = enrollment.model_dump(mode='json')
-        
-        enrollment_dict["user"] = {
-            "id": str(user.id),
-            "username": user.username,
-            "full_name": user.full_name,
-            "role": user.role,
-            "is_active": user.is_active,
-            "avatar_url": str(user.avatar_url) if user.avatar_url else None
-        } if user else None
-        
-        if course:
-            course_dict = course.model_dump(mode='json')
-            course_dict["is_enrolled"] = True
-            enrollment_dict["course"] = course_dict
-        else:
-            enrollment_dict["course"] = None
-        
-        return enrollment_dict
+        return EnrollmentResponseSchema.from_documents(enrollment, user, course)
+
+    @staticmethod
+    async def _fetch_page(
+        query_filters: List[Any],
+        page: int,
+        size: int,
+        cursor: Optional[str]
+    ) -> Tuple[List[Enrollment], Optional[int], Optional[str]]:
+        """
+        Trae una página ordenada por enrolled_at DESC.
+        Retorna (items, total, next_cursor); en modo cursor no se cuenta (total=None).
+        """
+        if cursor:
+            items = await Enrollment.find(*query_filters, seek_filter(cursor, "enrolled_at"))\
+                .sort(sort_spec("enrolled_at"))\
+                .limit(size + 1)\
+                .to_list()
+            has_more = len(items) > size
+            items = items[:size]
+            return items, None, next_cursor_for(items, "enrolled_at", size, has_more)
+
+        # Página + total en un solo viaje ($facet)
+        skip = (page - 1) * size
+        items, total = await paginate(Enrollment, query_filters, sort_spec("enrolled_at"), skip, size)
+        has_more = skip + len(items) < total
+        return items, total, next_cursor_for(items, "enrolled_at", size, has_more)
 
     @staticmethod
-    async def create_enrollment(data: EnrollmentCreateSchema, admin: User) -> Dict[str, Any]:
+    def _page_response(
+        data: List[EnrollmentResponseSchema],
+        total: Optional[int],
+        page: int,
+        size: int,
+        cursor: Optional[str] = None,
+        next_cursor: Optional[str] = None
+    ) -> EnrollmentListResponse:
+        """
+        Respuesta paginada; en modo cursor total/page/total_pages van en None.
+        Los elementos ya vienen validados: la página se arma sin volver a validarlos.
+        """
+        return EnrollmentListResponse.model_construct(
+            total=total,
+            page=None if cursor else page,
+            per_page=size,
+            total_pages=None if cursor else (total + size - 1) // size,
+            next_cursor=next_cursor,
+            data=data
+        )
+
+    @staticmethod
+    async def create_enrollment(data: EnrollmentCreateSchema, admin: User) -> EnrollmentResponseSchema:
         """
         Crear enrollment (solo admin).
         El admin inscribe manualmente al estudiante.
@@ -96,6 +131,7 @@ class EnrollmentService:
         )
         
         await enrollment.save()
+        await EnrollmentCountService.increment(course.id, 1)
         
         return await EnrollmentService._build_enrollment_response(enrollment=enrollment, user=user, course=course)
     
@@ -105,9 +141,13 @@ class EnrollmentService:
         search: Optional[str] = None,
         status: Optional[EnrollmentStatus] = None,
         page: int = 1,
-        size: int = 10
-    ) -> Dict[str, Any]:
-        """Obtener enrollments de un usuario con paginación y búsqueda"""
+        size: int = 10,
+        cursor: Optional[str] = None
+    ) -> EnrollmentListResponse:
+        """
+        Obtener enrollments de un usuario con paginación y búsqueda.
+        Con `cursor` (tomado de `next_cursor`) pagina por keyset e ignora `page`.
+        """
         from bson import ObjectId
         
         # Convertir user_id string a ObjectId
@@ -115,13 +155,7 @@ class EnrollmentService:
             user_oid = ObjectId(user_id)
         except Exception:
             # Si el ID es inválido, retornar vacío
-            return {
-                "total": 0,
-                "page": page,
-                "per_page": size,
-                "total_pages": 0,
-                "data": []
-            }
+            return EnrollmentService._page_response([], 0, page, size)
         
         # Usar filtros de diccionario para mayor compatibilidad
         query_filters = [{"user_id": user_oid}, {"is_deleted": False}]
@@ -130,37 +164,18 @@ class EnrollmentService:
             query_filters.append({"status": status})
         
         # Si hay búsqueda, necesitamos filtrar por título de curso
-        if search:
-            safe_search=re.escape(search)
-            # Buscar cursos que coincidan
-            matching_courses = await Course.find(
-                {"title": {"$regex": safe_search, "$options": "i"}, "is_deleted": False}
-            ).to_list()
+        text_filter = text_search_filter(search)
+        if text_filter:
+            # Buscar cursos que coincidan (índice de texto, solo los IDs)
+            course_ids = await Course.distinct("_id", {**text_filter, "is_deleted": False})
             
-            if matching_courses:
-                course_ids = [c.id for c in matching_courses]
+            if course_ids:
                 query_filters.append({"course_id": {"$in": course_ids}})
             else:
                 # Si no hay cursos que coincidan, retornar vacío
-                return {
-                    "total": 0,
-                    "page": page,
-                    "per_page": size,
-                    "total_pages": 0,
-                    "data": []
-                }
-        
-        total = await Enrollment.find(*query_filters).count()
-        
-        # Calcular paginación
-        total_pages = (total + size - 1) // size
-        
-        # Obtener items
-        items = await Enrollment.find(*query_filters)\
-            .sort("-enrolled_at")\
-            .skip((page - 1) * size)\
-            .limit(size)\
-            .to_list()
+                return EnrollmentService._page_response([], 0, page, size)
+        
+        items, total, next_cursor = await EnrollmentService._fetch_page(query_filters, page, size, cursor)
         
         # Armamos un diccionario con todos los cursos de un solo usuario
         course_ids = list(set([e.course_id for e in items]))
@@ -177,22 +192,20 @@ class EnrollmentService:
             enrollment_dict = await EnrollmentService._build_enrollment_response(enrollment=enrollment,user=user_doc,course=course_doc)
             enrollments_data.append(enrollment_dict)
         
-        return {
-            "total": total,
-            "page": page,
-            "per_page": size,
-            "total_pages": total_pages,
-            "data": enrollments_data
-        }
+        return EnrollmentService._page_response(enrollments_data, total, page, size, cursor, next_cursor)
 
     @staticmethod
     async def get_all_enrollments(
         search: Optional[str] = None,
         page: int = 1,
         size: int = 10,
-        filters: Dict[str, Any] = None
-    ) -> Dict[str, Any]:
-        """Obtener todos los enrollments (Admin) con filtros, búsqueda y paginación"""
+        filters: Dict[str, Any] = None,
+        cursor: Optional[str] = None
+    ) -> EnrollmentListResponse:
+        """
+        Obtener todos los enrollments (Admin) con filtros, búsqueda y paginación.
+        Con `cursor` (tomado de `next_cursor`) pagina por keyset e ignora `page`.
+        """
         query_filters = [Enrollment.is_deleted == False]
         
         if filters:
@@ -218,11 +231,10 @@ class EnrollmentService:
             ).to_list()
             matching_user_ids = [u.id for u in matching_users]
             
-            # Buscar cursos por título
-            matching_courses = await Course.find(
-                {"title": {"$regex": safe_search, "$options": "i"}, "is_deleted": False}
-            ).to_list()
-            matching_course_ids = [c.id for c in matching_courses]
+            # Buscar cursos por texto (título, etiquetas, subcategoría, descripción)
+            text_filter = text_search_filter(search)
+            if text_filter:
+                matching_course_ids = await Course.distinct("_id", {**text_filter, "is_deleted": False})
             
             # Filtrar enrollments que coincidan con usuarios O cursos
             if matching_user_ids or matching_course_ids:
@@ -235,24 +247,10 @@ class EnrollmentService:
                 query_filters.append({"$or": or_conditions})
             else:
                 # Si no hay coincidencias, retornar vacío
-                return {
-                    "total": 0,
-                    "page": page,
-                    "per_page": size,
-                    "total_pages": 0,
-                    "data": []
-                }
+                return EnrollmentService._page_response([], 0, page, size)
             
         # Ejecutar query
-        query = Enrollment.find(*query_filters)
-        total = await query.count()
-        
-        total_pages = (total + size - 1) // size
-        
-        items = await query.sort("-enrolled_at")\
-            .skip((page - 1) * size)\
-            .limit(size)\
-            .to_list()
+        items, total, next_cursor = await EnrollmentService._fetch_page(query_filters, page, size, cursor)
         
         # Armamos dos diccionarios, uno con todos los cursos y otro con todos los usuarios
         course_ids = list(set([e.course_id for e in items]))
@@ -276,16 +274,10 @@ class EnrollmentService:
             enrollment_dict = await EnrollmentService._build_enrollment_response(enrollment=enrollment,user=user_doc,course=course_doc)
             enrollments_data.append(enrollment_dict)
             
-        return {
-            "total": total,
-            "page": page,
-            "per_page": size,
-            "total_pages": total_pages,
-            "data": enrollments_data
-        }
+        return EnrollmentService._page_response(enrollments_data, total, page, size, cursor, next_cursor)
     
     @staticmethod
-    async def get_enrollment_by_id(enrollment_id: str, user: User) -> Dict[str, Any]:
+    async def get_enrollment_by_id(enrollment_id: str, user: User) -> EnrollmentResponseSchema:
         """Obtener enrollment por ID"""
         enrollment = await Enrollment.get(enrollment_id)
         
@@ -321,7 +313,7 @@ class EnrollmentService:
             raise HTTPException(status_code=403, detail="No puedes actualizar esta inscripción")
         
         # Verificar que no haya expirado
-        if not await enrollment.is_active_now():
+        if not enrollment.is_active_now():
             raise HTTPException(status_code=403, detail="Tu inscripción ha expirado")
         
         # Actualizar progreso
@@ -339,7 +331,7 @@ class EnrollmentService:
         enrollment_id: str,
         data: EnrollmentExtendSchema,
         admin: User
-    ) -> Dict[str, Any]:
+    ) -> EnrollmentResponseSchema:
         """Extender expiración de enrollment (admin)"""
         enrollment = await Enrollment.get(enrollment_id)
         
@@ -352,10 +344,13 @@ class EnrollmentService:
         enrollment.updated_by = str(admin.id)
         
         # Si estaba expirado y se extiende, reactivar
-        if enrollment.status == EnrollmentStatus.EXPIRED:
+        reactivated = enrollment.status == EnrollmentStatus.EXPIRED
+        if reactivated:
             enrollment.status = EnrollmentStatus.ACTIVE
         
         await enrollment.save()
+        if reactivated:
+            await EnrollmentCountService.increment(enrollment.course_id, 1)
         
         return await EnrollmentService._build_enrollment_response(enrollment)
     
@@ -367,14 +362,20 @@ class EnrollmentService:
         if not enrollment or enrollment.is_deleted:
             raise HTTPException(status_code=404, detail="Inscripción no encontrada")
         
+        was_counted = enrollment.status == EnrollmentStatus.ACTIVE
+        
         if admin.role == Role.SUPERADMIN:
             # Borrado FÍSICO
             await enrollment.delete()
-            return {"message": "Inscripción eliminada permanentemente"}
+            message = "Inscripción eliminada permanentemente"
         else:
             # Borrado LÓGICO
             enrollment.is_deleted = True
             enrollment.deleted_at = datetime.utcnow()
             enrollment.updated_by = str(admin.id)
             await enrollment.save()
-            return {"message": "Inscripción enviada a papelera"}
+            message = "Inscripción enviada a papelera"
+        
+        if was_counted:
+            await EnrollmentCountService.increment(enrollment.course_id, -1)
+        return {"message": message}
@@ -45,7 +45,7 @@ class LessonService:
                     "status": "ACTIVE",
                     "is_deleted": False
                 })
-                if enrollment and await enrollment.is_active_now():
+                if enrollment and enrollment.is_active_now():
                     has_access = True
              
         # Consultar lessons por course_id
@@ -53,15 +53,20 @@ class LessonService:
         
         # Si no tiene acceso, limpiar contenido sensible de lecciones no-preview
         if not has_access:
-            for lesson in lessons:
-                if not lesson.is_preview:
-                    # Ocultar URLs de video y materiales
-                    lesson.video_url = None
-                    lesson.video_id = None
-                    lesson.materials = []
+            LessonService.hide_private_content(lessons)
         
         return lessons
 
+    @staticmethod
+    def hide_private_content(lessons: List[Lesson]) -> List[Lesson]:
+        """Oculta video y materiales de las lecciones que no son preview (vista sin inscripción)"""
+        for lesson in lessons:
+            if not lesson.is_preview:
+                lesson.video_url = None
+                lesson.video_id = None
+                lesson.materials = []
+        return lessons
+
     @staticmethod
     async def get_lesson_by_id(lesson_id: str, user: Optional[User] = None) -> Lesson:
         """
@@ -96,7 +101,7 @@ class LessonService:
                 "status": "ACTIVE",
                 "is_deleted": False
             })
-            if enrollment and await enrollment.is_active_now():
+            if enrollment and enrollment.is_active_now():
                 has_access = True
         
         # Si no tiene acceso a una lección no-preview, bloquear
@@ -143,7 +148,7 @@ class LessonService:
         await lesson.save()
         
         # Actualizar estadísticas del curso
-        await CourseService.update_course_stats(str(course.id))
+        await CourseService.apply_lesson_delta(course.id, lessons=1, seconds=lesson.duration_seconds or 0)
         
         return lesson
 
@@ -155,11 +160,13 @@ class LessonService:
         """
         # Import local
         from app.services.course_service import CourseService
+        from app.services.course_public_view_service import course_public_view_service
         
         lesson = await Lesson.get(lesson_id)
         if not lesson or lesson.is_deleted:
             raise HTTPException(status_code=404, detail="Lección no encontrada")
             
+        old_seconds = lesson.duration_seconds or 0
         update_data = data.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(lesson, key, value)
@@ -167,9 +174,12 @@ class LessonService:
         lesson.updated_by = str(user.id)
         await lesson.save()
         
-        # Si cambia la duración, recalcular stats
-        if "duration_seconds" in update_data:
-            await CourseService.update_course_stats(str(lesson.course_id))
+        # Si cambia la duración, ajustar stats (también reconstruye la vista pública)
+        seconds_delta = (lesson.duration_seconds or 0) - old_seconds
+        if seconds_delta:
+            await CourseService.apply_lesson_delta(lesson.course_id, seconds=seconds_delta)
+        else:
+            course_public_view_service.invalidate_course(str(lesson.course_id))
             
         return lesson
 
@@ -179,6 +189,8 @@ class LessonService:
         Cambiar orden de una lección
         REFACTORIZADO: Opera sobre la colección lessons directamente
         """
+        from app.services.course_public_view_service import course_public_view_service
+
         lesson = await Lesson.get(lesson_id)
         if not lesson or lesson.is_deleted:
              raise HTTPException(status_code=404, detail="Lección no encontrada")
@@ -206,6 +218,7 @@ class LessonService:
                     l.order = i + 1
                     l.updated_by = str(user.id)
                     await l.save()
+            course_public_view_service.invalidate_course(str(lesson.course_id))
             
         return all_lessons
 
@@ -247,6 +260,6 @@ class LessonService:
                 await l.save()
                 
         # Actualizar estadísticas del curso
-        await CourseService.update_course_stats(str(course_id))
+        await CourseService.apply_lesson_delta(course_id, lessons=-1, seconds=-(lesson.duration_seconds or 0))
         
         return {"message": msg}
@@ -8,6 +8,7 @@ from fastapi import UploadFile, HTTPException, status
 from app.models.lesson import Lesson, LessonMaterial
 from app.models.user import User
 from app.services.cloudinary_service import CloudinaryService
+from app.services.course_public_view_service import course_public_view_service
 from datetime import datetime
 import os
 
@@ -95,6 +96,7 @@ class MaterialService:
         lesson.materials.append(material)
         lesson.updated_by = str(user.id)
         await lesson.save()
+        course_public_view_service.invalidate_course(str(lesson.course_id))
         
         return material
 
@@ -113,6 +115,7 @@ class MaterialService:
         lesson.materials = []
         lesson.updated_by = str(user.id)
         await lesson.save()
+        course_public_view_service.invalidate_course(str(lesson.course_id))
         
         return {"message": f"Se eliminaron {deleted_count} materiales correctamente"}
 
@@ -136,6 +139,7 @@ class MaterialService:
         
         lesson.updated_by = str(user.id)
         await lesson.save()
+        course_public_view_service.invalidate_course(str(lesson.course_id))
         
         return {"message": f"Material '{material.title}' eliminado correctamente"}
 
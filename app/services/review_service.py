@@ -0,0 +1,261 @@
+"""
+Servicio para lógica de negocio de Reseñas (CourseReview)
+
+Los agregados de calificación viven en el Course: rating_sum, rating_count y
+rating_histogram ({"1".."5": cantidad}) se ajustan con $inc en cada alta, edición o
+baja de una reseña, y rating_average se deriva de ellos. Leer el promedio es leer el
+curso, sin agregar reseñas.
+
+Solo cuentan las reseñas aprobadas y no eliminadas. recompute_ratings() reconstruye
+los agregados de todos los cursos en una sola pasada de agregación.
+"""
+
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import logging
+
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from app.models.course import Course, CourseReview
+from app.models.enrollment import Enrollment
+from app.models.enums import CourseStatus, EnrollmentStatus, Role
+from app.models.user import User
+from app.schemas.review_schema import (
+    ReviewCreateSchema,
+    ReviewUpdateSchema,
+    ReviewResponseSchema,
+    ReviewListResponse
+)
+from app.utils.pagination import seek_filter, sort_spec, next_cursor_for
+
+logger = logging.getLogger(__name__)
+
+RATING_STARS = range(1, 6)
+
+# Reseñas que cuentan para los agregados del curso
+COUNTED_REVIEWS = {"is_deleted": False, "is_approved": True}
+
+# Inscripciones que habilitan a calificar: vigentes o vencidas, no canceladas
+REVIEWER_ENROLLMENT_STATUSES = [EnrollmentStatus.ACTIVE.value, EnrollmentStatus.EXPIRED.value]
+
+
+def _average(rating_sum: int, rating_count: int) -> Optional[float]:
+    return round(rating_sum / rating_count, 2) if rating_count > 0 else None
+
+
+def _normalized(field: str, value: Any) -> Any:
+    """Valor comparable de un agregado: el histograma sin estrellas en cero, los contadores sin None"""
+    if field == "rating_histogram":
+        return {star: n for star, n in (value or {}).items() if n}
+    if field in ("rating_sum", "rating_count"):
+        return value or 0
+    return value
+
+
+class ReviewService:
+
+    @staticmethod
+    async def _get_published_course(course_id: str) -> Course:
+        if not ObjectId.is_valid(course_id):
+            raise HTTPException(status_code=404, detail="Curso no encontrado")
+        course = await Course.get(course_id)
+        if not course or course.is_deleted or course.status != CourseStatus.PUBLISHED:
+            raise HTTPException(status_code=404, detail="Curso no encontrado")
+        return course
+
+    @staticmethod
+    async def _get_review(review_id: str) -> CourseReview:
+        review = await CourseReview.get(review_id) if ObjectId.is_valid(review_id) else None
+        if not review or review.is_deleted:
+            raise HTTPException(status_code=404, detail="Reseña no encontrada")
+        return review
+
+    @staticmethod
+    async def apply_rating_delta(course_id: str, added: Optional[int] = None, removed: Optional[int] = None) -> None:
+        """
+        Ajusta los agregados del curso por una reseña que entra (`added`), sale
+        (`removed`) o cambia de calificación (ambos).
+
+        El $inc es atómico; el promedio se escribe después solo si la suma y la cantidad
+        siguen siendo las que devolvió el $inc. Si otra reseña llegó entre medio, su
+        propia actualización escribe el promedio vigente.
+
+        Los cursos eliminados no se tocan: la cascada ya dejó sus agregados en cero.
+        """
+        inc: Dict[str, int] = {}
+        for rating, sign in ((added, 1), (removed, -1)):
+            if rating is None:
+                continue
+            inc["rating_sum"] = inc.get("rating_sum", 0) + sign * rating
+            inc["rating_count"] = inc.get("rating_count", 0) + sign
+            key = f"rating_histogram.{rating}"
+            inc[key] = inc.get(key, 0) + sign
+        inc = {field: delta for field, delta in inc.items() if delta}
+        if not inc:
+            return
+
+        collection = Course.get_motor_collection()
+        course = await collection.find_one_and_update(
+            {"_id": ObjectId(course_id), "is_deleted": False},
+            {"$inc": inc},
+            projection={"rating_sum": 1, "rating_count": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if course is None:
+            return
+        await collection.update_one(
+            {"_id": course["_id"], "rating_sum": course["rating_sum"], "rating_count": course["rating_count"]},
+            {"$set": {"rating_average": _average(course["rating_sum"], course["rating_count"])}}
+        )
+
+    @staticmethod
+    async def get_course_reviews(course_id: str, size: int = 10, cursor: Optional[str] = None) -> ReviewListResponse:
+        """Reseñas aprobadas de un curso publicado, más recientes primero (paginación por cursor)"""
+        await ReviewService._get_published_course(course_id)
+
+        query_filters: List[Any] = [{"course_id": course_id, **COUNTED_REVIEWS}]
+        if cursor:
+            query_filters.append(seek_filter(cursor, "created_at"))
+
+        items = await CourseReview.find(*query_filters)\
+            .sort(sort_spec("created_at"))\
+            .limit(size + 1)\
+            .to_list()
+        has_more = len(items) > size
+        items = items[:size]
+
+        return ReviewListResponse.model_construct(
+            total=None,
+            page=None,
+            per_page=size,
+            total_pages=None,
+            next_cursor=next_cursor_for(items, "created_at", size, has_more),
+            data=[ReviewResponseSchema.from_document(review) for review in items]
+        )
+
+    @staticmethod
+    async def create_review(course_id: str, data: ReviewCreateSchema, user: User) -> ReviewResponseSchema:
+        """Calificar un curso. Solo alumnas inscritas (aunque la inscripción haya vencido), una vez por curso."""
+        course = await ReviewService._get_published_course(course_id)
+
+        enrollment = await Enrollment.find_one({
+            "user_id": user.id,
+            "course_id": course.id,
+            "status": {"$in": REVIEWER_ENROLLMENT_STATUSES},
+            "is_deleted": False
+        })
+        if not enrollment:
+            raise HTTPException(status_code=403, detail="Solo las alumnas inscritas pueden calificar este curso")
+
+        review = CourseReview(
+            course_id=str(course.id),
+            user_id=str(user.id),
+            user_name=user.full_name,
+            user_avatar_url=user.avatar_url,
+            rating=data.rating,
+            review=data.review,
+            created_by=str(user.id)
+        )
+        try:
+            await review.insert()
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="Ya calificaste este curso")
+
+        if review.is_approved:
+            await ReviewService.apply_rating_delta(review.course_id, added=review.rating)
+        return ReviewResponseSchema.from_document(review)
+
+    @staticmethod
+    async def update_review(review_id: str, data: ReviewUpdateSchema, user: User) -> ReviewResponseSchema:
+        """Editar la propia reseña"""
+        review = await ReviewService._get_review(review_id)
+        if review.user_id != str(user.id):
+            raise HTTPException(status_code=403, detail="Solo puedes editar tu propia reseña")
+
+        old_rating = review.rating
+        update_data = data.model_dump(exclude_unset=True)
+        if update_data.get("rating") is None:
+            update_data.pop("rating", None)
+        for key, value in update_data.items():
+            setattr(review, key, value)
+        review.updated_by = str(user.id)
+        await review.save()
+
+        if review.is_approved and review.rating != old_rating:
+            await ReviewService.apply_rating_delta(review.course_id, added=review.rating, removed=old_rating)
+        return ReviewResponseSchema.from_document(review)
+
+    @staticmethod
+    async def delete_review(review_id: str, user: User) -> Dict[str, str]:
+        """Eliminar reseña (autora o Admin) - Física para SUPERADMIN, lógica para el resto"""
+        review = await ReviewService._get_review(review_id)
+        is_admin = user.role in [Role.ADMIN, Role.SUPERADMIN]
+        if review.user_id != str(user.id) and not is_admin:
+            raise HTTPException(status_code=403, detail="No tienes permisos para eliminar esta reseña")
+
+        if user.role == Role.SUPERADMIN:
+            await review.delete()
+            message = "Reseña eliminada permanentemente"
+        else:
+            review.is_deleted = True
+            review.deleted_at = datetime.utcnow()
+            review.deleted_by = str(user.id)
+            review.updated_by = str(user.id)
+            await review.save()
+            message = "Reseña eliminada"
+
+        # Solo se descuenta lo que contaba (aprobada); un curso eliminado ya está en cero
+        if review.is_approved:
+            await ReviewService.apply_rating_delta(review.course_id, removed=review.rating)
+        return {"message": message}
+
+    @staticmethod
+    async def recompute_ratings() -> Dict[str, int]:
+        """
+        Reconstruye rating_sum, rating_count, rating_histogram y rating_average de todos
+        los cursos: una agregación sobre las reseñas y un solo bulk_write.
+        Los cursos sin reseñas quedan en cero.
+        """
+        rows = await CourseReview.get_motor_collection().aggregate([
+            {"$match": COUNTED_REVIEWS},
+            {"$group": {
+                "_id": "$course_id",
+                "rating_sum": {"$sum": "$rating"},
+                "rating_count": {"$sum": 1},
+                **{
+                    f"stars_{star}": {"$sum": {"$cond": [{"$eq": ["$rating", star]}, 1, 0]}}
+                    for star in RATING_STARS
+                },
+            }},
+        ]).to_list(length=None)
+        aggregates = {
+            row["_id"]: {
+                "rating_sum": row["rating_sum"],
+                "rating_count": row["rating_count"],
+                "rating_histogram": {str(star): row[f"stars_{star}"] for star in RATING_STARS},
+                "rating_average": _average(row["rating_sum"], row["rating_count"]),
+            }
+            for row in rows
+        }
+        empty = {
+            "rating_sum": 0,
+            "rating_count": 0,
+            "rating_histogram": {str(star): 0 for star in RATING_STARS},
+            "rating_average": None,
+        }
+
+        ops: List[UpdateOne] = []
+        checked = 0
+        async for course in Course.get_motor_collection().find({}, {field: 1 for field in empty}):
+            checked += 1
+            expected = aggregates.get(str(course["_id"]), empty)
+            if any(_normalized(field, course.get(field)) != _normalized(field, value) for field, value in expected.items()):
+                ops.append(UpdateOne({"_id": course["_id"]}, {"$set": expected}))
+
+        if ops:
+            await Course.get_motor_collection().bulk_write(ops, ordered=False)
+            logger.info(f"⭐ Calificaciones corregidas en {len(ops)} cursos")
+        return {"courses_checked": checked, "courses_corrected": len(ops)}
@@ -0,0 +1,258 @@
+"""
+Servicio de importación masiva de usuarios (estudiantes) desde Excel
+Lee el .xlsx en modo streaming y escribe en bloques con insert_many
+"""
+
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple, Union
+from datetime import datetime, date
+from itertools import islice
+from fastapi import HTTPException, status
+from openpyxl import load_workbook
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+import asyncio
+import logging
+
+from app.models.user import User
+from app.models.enums import Role
+from app.schemas.user_schema import UserSelfRegister, UserCreate
+from app.utils.security import hash_passwords_bulk
+from app.utils.user_utils import generate_chef_usernames, generate_user_password
+
+logger = logging.getLogger(__name__)
+
+# Encabezados aceptados por columna (se comparan en minúsculas)
+COLUMN_ALIASES = {
+    "email": {"email", "correo", "correo electronico", "correo electrónico"},
+    "full_name": {"full_name", "nombre", "nombre completo"},
+    "phone_number": {"phone_number", "telefono", "teléfono", "celular"},
+    "birth_date": {"birth_date", "fecha de nacimiento", "fecha_nacimiento"},
+}
+
+# Filas que se validan, hashean e insertan juntas
+IMPORT_CHUNK_SIZE = 500
+
+
+class UserImportService:
+
+    # ─────────────────────────────────────────────
+    # HELPERS INTERNOS
+    # ─────────────────────────────────────────────
+
+    @staticmethod
+    def _map_header(header: Tuple[Any, ...]) -> Dict[str, int]:
+        """Ubica cada columna obligatoria en el encabezado. Lanza 400 si falta alguna."""
+        columns: Dict[str, int] = {}
+        for index, value in enumerate(header):
+            name = str(value).strip().lower() if value is not None else ""
+            for field, aliases in COLUMN_ALIASES.items():
+                if name in aliases and field not in columns:
+                    columns[field] = index
+
+        missing = [field for field in COLUMN_ALIASES if field not in columns]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Faltan columnas obligatorias en el encabezado: {', '.join(missing)}"
+            )
+        return columns
+
+    @staticmethod
+    def _read_chunk(rows: Iterator[Tuple[int, tuple]], size: int) -> Tuple[List[Tuple[int, tuple]], int]:
+        """
+        Lee hasta `size` filas del iterador de la hoja, descartando filas vacías.
+        Retorna (filas con datos, filas consumidas); 0 consumidas = fin de la hoja.
+        """
+        chunk = []
+        consumed = 0
+        for row_number, values in islice(rows, size):
+            consumed += 1
+            if any(v is not None and str(v).strip() != "" for v in values):
+                chunk.append((row_number, values))
+        return chunk, consumed
+
+    @staticmethod
+    def _clean_cell(field: str, value: Any) -> Any:
+        """Adapta el valor de la celda de Excel al formato que esperan los schemas"""
+        if value is None:
+            return None
+
+        if field == "phone_number":
+            # Excel guarda los teléfonos como número: 59170012345.0 -> "+59170012345"
+            text = str(int(value)) if isinstance(value, (int, float)) else str(value).strip()
+            return f"+{text}" if text.isdigit() else text
+
+        if field == "birth_date":
+            if isinstance(value, datetime):
+                return value
+            if isinstance(value, date):
+                return datetime.combine(value, datetime.min.time())
+            text = str(value).strip()
+            try:
+                return datetime.strptime(text, "%d/%m/%Y")
+            except ValueError:
+                return text  # Pydantic intentará ISO 8601
+
+        return str(value).strip()
+
+    @staticmethod
+    def _validate_row(values: tuple, columns: Dict[str, int]) -> Tuple[Optional[UserCreate], Optional[str]]:
+        """
+        Valida la fila con las mismas reglas que el alta administrativa (UserCreate).
+        La contraseña se genera desde la fecha de nacimiento (DvDDMMAAAA).
+        """
+        raw = {
+            field: UserImportService._clean_cell(field, values[index] if index < len(values) else None)
+            for field, index in columns.items()
+        }
+        try:
+            base = UserSelfRegister(**raw)
+            data = UserCreate(
+                **base.model_dump(),
+                password=generate_user_password(base.birth_date),
+                role=Role.USER
+            )
+        except ValidationError as e:
+            detail = "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            return None, detail
+        return data, None
+
+    @staticmethod
+    def _describe_write_error(error: Dict[str, Any]) -> str:
+        """Traduce un writeError de MongoDB a un mensaje para el reporte"""
+        if error.get("code") == 11000:
+            key = next(iter(error.get("keyPattern", {})), None)
+            if key == "email":
+                return "El email ya está registrado"
+            if key == "username":
+                return "El username ya está en uso"
+        return error.get("errmsg", "Error al guardar el usuario")
+
+    @staticmethod
+    async def _import_chunk(
+        chunk: List[Tuple[int, tuple]],
+        columns: Dict[str, int],
+        seen_emails: Set[str],
+        created_by: str,
+        errors: List[Dict[str, Any]]
+    ) -> int:
+        """Valida, genera usernames, hashea e inserta un bloque. Retorna usuarios creados."""
+        valid: List[Tuple[int, UserCreate]] = []
+        for row_number, values in chunk:
+            data, error = UserImportService._validate_row(values, columns)
+            if error:
+                email_index = columns["email"]
+                email = values[email_index] if email_index < len(values) else None
+                errors.append({"row": row_number, "email": str(email) if email else None, "detail": error})
+            elif data.email in seen_emails:
+                errors.append({"row": row_number, "email": data.email, "detail": "Email duplicado dentro del archivo"})
+            else:
+                seen_emails.add(data.email)
+                valid.append((row_number, data))
+
+        if not valid:
+            return 0
+
+        # Emails ya registrados: UNA consulta por bloque
+        existing = set(await User.distinct("email", {"email": {"$in": [d.email for _, d in valid]}}))
+        if existing:
+            for row_number, data in valid:
+                if data.email in existing:
+                    errors.append({"row": row_number, "email": data.email, "detail": "El email ya está registrado"})
+            valid = [(row_number, data) for row_number, data in valid if data.email not in existing]
+            if not valid:
+                return 0
+
+        usernames = await generate_chef_usernames([data.full_name for _, data in valid])
+        password_hashes = await hash_passwords_bulk([data.password for _, data in valid])
+
+        documents = [
+            User(
+                email=data.email,
+                username=username,
+                full_name=data.full_name,
+                password_hash=password_hash,
+                role=Role.USER,
+                is_active=True,
+                created_by=created_by,
+                updated_by=created_by,
+                phone_number=data.phone_number,
+                birth_date=data.birth_date
+            )
+            for (_, data), username, password_hash in zip(valid, usernames, password_hashes)
+        ]
+
+        try:
+            result = await User.insert_many(documents, ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                row_number, data = valid[write_error["index"]]
+                errors.append({
+                    "row": row_number,
+                    "email": data.email,
+                    "detail": UserImportService._describe_write_error(write_error)
+                })
+            return e.details.get("nInserted", 0)
+
+    # ─────────────────────────────────────────────
+    # IMPORTACIÓN
+    # ─────────────────────────────────────────────
+
+    @staticmethod
+    async def import_from_excel(source: Union[str, BinaryIO], created_by: str) -> Dict[str, Any]:
+        """
+        Importa estudiantes desde la primera hoja de un .xlsx.
+
+        Columnas obligatorias: email, full_name, phone_number, birth_date
+        (también se aceptan encabezados en español, ver COLUMN_ALIASES).
+        Username y contraseña se generan igual que en el auto-registro.
+
+        Returns:
+            Reporte con filas leídas, creadas, fallidas y el detalle de errores por fila.
+        """
+        try:
+            workbook = await asyncio.to_thread(load_workbook, source, read_only=True, data_only=True)
+        except Exception:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="El archivo no es un Excel (.xlsx) válido"
+            )
+
+        errors: List[Dict[str, Any]] = []
+        seen_emails: Set[str] = set()
+        total_rows = 0
+        created = 0
+
+        try:
+            rows = enumerate(workbook.active.iter_rows(values_only=True), start=1)
+            header = await asyncio.to_thread(next, rows, None)
+            if header is None:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El archivo está vacío")
+            columns = UserImportService._map_header(header[1])
+
+            while True:
+                # openpyxl parsea de forma síncrona: leer cada bloque fuera del event loop
+                chunk, consumed = await asyncio.to_thread(UserImportService._read_chunk, rows, IMPORT_CHUNK_SIZE)
+                if consumed == 0:
+                    break
+                if not chunk:
+                    continue
+                total_rows += len(chunk)
+                created += await UserImportService._import_chunk(chunk, columns, seen_emails, created_by, errors)
+        finally:
+            workbook.close()
+
+        logger.info(f"📥 Importación de usuarios: {created} creados, {len(errors)} con error de {total_rows} filas")
+
+        return {
+            "total_rows": total_rows,
+            "created": created,
+            "failed": len(errors),
+            "errors": sorted(errors, key=lambda e: e["row"]),
+        }
+
+
+user_import_service = UserImportService()
@@ -15,7 +15,8 @@ from app.models.user import User
 from app.models.enums import Role
 from app.schemas.user_schema import UserUpdate, UserCreate
 from app.services.cloudinary_service import cloudinary_service
-from app.utils.security import hash_password
+from app.utils.security import hash_password_async
+from app.utils.pagination import seek_filter, sort_spec, next_cursor_for, paginate
 
 
 class UserService:
@@ -72,8 +73,12 @@ class UserService:
         q: Optional[str] = None,
         role: Optional[Role] = None,
         is_active: Optional[bool] = None,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Lista usuarios con paginación y filtros opcionales."""
+        """
+        Lista usuarios con paginación y filtros opcionales.
+        Orden: más recientes primero. Con `cursor` pagina por keyset e ignora `page`.
+        """
         from beanie.operators import Or
 
         query = User.find(User.is_deleted == False)
@@ -94,9 +99,25 @@ class UserService:
         if is_active is not None:
             query = query.find(User.is_active == is_active)
 
-        total_count = await query.count()
+        if cursor:
+            users = await query.find(seek_filter(cursor, "created_at"))\
+                .sort(sort_spec("created_at")).limit(per_page + 1).to_list()
+            has_more = len(users) > per_page
+            users = users[:per_page]
+            return {
+                "total": None,
+                "page": None,
+                "per_page": per_page,
+                "total_pages": None,
+                "next_cursor": next_cursor_for(users, "created_at", per_page, has_more),
+                "data": users,
+            }
+
+        # Página + total en un solo viaje ($facet)
         skip = (page - 1) * per_page
-        users = await query.skip(skip).limit(per_page).to_list()
+        users, total_count = await paginate(
+            User, [query.get_filter_query()], sort_spec("created_at"), skip, per_page
+        )
         total_pages = math.ceil(total_count / per_page) if per_page > 0 else 0
 
         return {
@@ -104,6 +125,7 @@ class UserService:
             "page": page,
             "per_page": per_page,
             "total_pages": total_pages,
+            "next_cursor": next_cursor_for(users, "created_at", per_page, skip + len(users) < total_count),
             "data": users,
         }
 
@@ -162,7 +184,7 @@ class UserService:
                 detail="No tienes permisos para cambiar la contraseña de este usuario"
             )
 
-        user.password_hash = hash_password(new_password)
+        user.password_hash = await hash_password_async(new_password)
         user.updated_by = str(actor.id)  # FIX: antes no se registraba
         await user.save()
 
@@ -183,6 +205,7 @@ class UserService:
         UserService._check_hierarchy(actor, user)
 
         user.is_active = not user.is_active
+        user.token_version += 1  # Revoca los tokens emitidos con el estado anterior
         user.updated_by = str(actor.id)  # FIX: antes no se registraba
         await user.save()
         return user
@@ -208,19 +231,20 @@ class UserService:
             )
 
         user.role = new_role
+        user.token_version += 1  # Revoca los tokens emitidos con el rol anterior
         user.updated_by = str(actor.id)  # FIX: antes no se registraba
         await user.save()
         return user
 
     @staticmethod
-    async def delete_user(user_id: str, actor: User) -> None:
+    async def delete_user(user_id: str, actor: User) -> Dict[str, int]:
         """
         Elimina un usuario:
-        - ADMIN: Soft delete + cancela enrollments activos.
-        - SUPERADMIN: Hard delete físico + elimina enrollments.
+        - ADMIN: Soft delete + cancela enrollments y oculta reseñas y comentarios.
+        - SUPERADMIN: Hard delete físico + elimina enrollments, reseñas y comentarios.
+        Retorna cuántos documentos afectó la cascada por colección.
         """
-        from app.models.enrollment import Enrollment
-        from app.models.enums import EnrollmentStatus
+        from app.services.cascade_service import CascadeService
 
         user = await UserService._get_active_user(user_id)
 
@@ -236,22 +260,8 @@ class UserService:
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="No tienes permisos para eliminar a este usuario"
                 )
-            # Soft delete del usuario
-            user.is_deleted = True
-            user.deleted_at = datetime.utcnow()
-            user.deleted_by = str(actor.id)
-            user.updated_by = str(actor.id)
-            await user.save()
-
-            # Cascada: cancelar enrollments activos
-            enrollments = await Enrollment.find({"user_id": user.id, "is_deleted": False}).to_list()
-            for e in enrollments:
-                e.is_deleted = True
-                e.deleted_at = datetime.utcnow()
-                e.deleted_by = str(actor.id)
-                e.updated_by = str(actor.id)
-                e.status = EnrollmentStatus.CANCELLED
-                await e.save()
+            # Soft delete del usuario + cascada (inscripciones, reseñas y comentarios)
+            return await CascadeService.soft_delete_user(user, actor)
 
         elif actor.role == Role.SUPERADMIN:
             if user.role == Role.SUPERADMIN:
@@ -260,8 +270,7 @@ class UserService:
                     detail="No tienes permisos para eliminar a este usuario"
                 )
             # Hard delete físico con cascada
-            await Enrollment.find({"user_id": user.id}).delete()
-            await user.delete()
+            return await CascadeService.hard_delete_user(user)
 
 
 user_service = UserService()
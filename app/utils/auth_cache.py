@@ -0,0 +1,63 @@
+"""
+Cachés de autenticación
+
+Evitan ir a MongoDB en cada request protegido solo para resolver al usuario que llama.
+El modelo User invalida su entrada al guardarse o eliminarse (ver hooks en models/user.py).
+"""
+
+from typing import Tuple
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from app.config import settings
+from app.utils.cache import TTLCache
+
+# user_id (str) -> User (copia privada de la caché: se entrega siempre una copia, ver get_current_user)
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+# user_id (str) -> (token_version, existe, activo)
+token_version_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.TOKEN_VERSION_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_user(user_id) -> None:
+    """Descarta al usuario de las cachés locales (llamar tras cualquier cambio del User)"""
+    user_cache.invalidate(str(user_id))
+    token_version_cache.invalidate(str(user_id))
+
+
+async def get_token_state(user_id: str) -> Tuple[int, bool, bool]:
+    """
+    Retorna (token_version, existe, activo) del usuario.
+
+    Usa la caché y, si no está, consulta solo esos campos en MongoDB.
+    Un usuario inexistente o eliminado retorna existe=False.
+    """
+    state = token_version_cache.get(user_id)
+    if state is not None:
+        return state
+
+    from app.models.user import User  # Import local para evitar circular
+
+    try:
+        oid = ObjectId(user_id)
+    except (InvalidId, TypeError):
+        return (-1, False, False)
+
+    doc = await User.get_motor_collection().find_one(
+        {"_id": oid},
+        {"token_version": 1, "is_active": 1, "is_deleted": 1}
+    )
+
+    if doc is None or doc.get("is_deleted", False):
+        state = (-1, False, False)
+    else:
+        state = (doc.get("token_version", 0), True, doc.get("is_active", True))
+
+    token_version_cache.set(user_id, state)
+    return state
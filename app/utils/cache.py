@@ -0,0 +1,207 @@
+"""
+Caché en memoria con TTL y límite de tamaño (LRU)
+
+Pensada para datos calientes y pequeños que se consultan en cada request.
+Vive en el proceso: con varios workers de uvicorn cada uno tiene su propia copia,
+por eso el TTL debe acotar la desactualización tolerable.
+"""
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Caché LRU con expiración por entrada.
+
+    - `maxsize`: al superarse se descarta la entrada usada hace más tiempo.
+    - `ttl`: segundos de vida por defecto; `set(..., ttl=...)` permite uno propio.
+    - Lleva contadores de aciertos/fallos para exponerlos como métrica.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna el valor si existe y no expiró; si no, `default`"""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Guarda un valor; `ttl` sobreescribe el tiempo de vida por defecto"""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Elimina una entrada (no falla si no existe)"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class SWRCache:
+    """
+    Caché asíncrona con carga integrada, stale-while-revalidate y protección contra estampidas.
+
+    - `get_or_load(key, loader)`: si la entrada está fresca la retorna; si venció hace
+      menos de `stale_ttl` la retorna igual y la recarga en segundo plano; si no existe,
+      la carga. Para una misma clave hay como máximo una carga en curso: los requests
+      concurrentes esperan esa misma carga en vez de ir todos a MongoDB.
+    - Cada carga corre en su propia tarea y se espera con asyncio.shield: si se cancela
+      el request que la inició (cliente desconectado), los demás siguen esperándola.
+    - `invalidate_all()` / `invalidate(key)` descartan entradas y además invalidan las
+      cargas en curso (su resultado ya no se guarda, porque se leyó antes del cambio).
+    - `refresh(key, loader)` recarga una clave en segundo plano (precalentar tras un cambio).
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float, stale_ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        # key -> (valor, fresco_hasta, usable_hasta)
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, "asyncio.Task"] = {}
+        self._tasks: set = set()
+        self._generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.load_errors = 0
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if self.ttl <= 0:
+            return await loader()
+
+        now = time.monotonic()
+        entry = self._data.get(key)
+        if entry is not None:
+            value, fresh_until, usable_until = entry
+            if now < fresh_until:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            if now < usable_until:
+                self._data.move_to_end(key)
+                self.stale_hits += 1
+                self.refresh(key, loader)
+                return value
+            del self._data[key]
+
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start_load(key, loader)
+        return await asyncio.shield(task)
+
+    def _start_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> "asyncio.Task":
+        task = asyncio.ensure_future(self._load(key, loader))
+        self._inflight[key] = task
+        self._tasks.add(task)
+        task.add_done_callback(self._load_done)
+        return task
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        generation = self._generation
+        task = asyncio.current_task()
+        try:
+            value = await loader()
+        except Exception:
+            self.load_errors += 1
+            raise
+        finally:
+            # Si la clave se invalidó durante la carga, esta ya no es la carga vigente
+            current = self._inflight.get(key) is task
+            if current:
+                del self._inflight[key]
+
+        if current and generation == self._generation:
+            now = time.monotonic()
+            self._data[key] = (value, now + self.ttl, now + self.ttl + self.stale_ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def _load_done(self, task: "asyncio.Task") -> None:
+        self._tasks.discard(task)
+        if not task.cancelled():
+            task.exception()  # Marcar como consultada si nadie la esperaba
+
+    def refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        """Recarga `key` en segundo plano salvo que ya haya una carga en curso"""
+        if self.ttl <= 0 or key in self._inflight:
+            return
+        self._start_load(key, loader).add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: "asyncio.Task") -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Recarga en segundo plano de la caché '{self.name}' falló: {task.exception()}")
+
+    def invalidate_all(self) -> None:
+        """Descarta todas las entradas y las cargas en curso"""
+        self._generation += 1
+        self._data.clear()
+        self._inflight.clear()
+
+    def invalidate(self, key: Hashable) -> None:
+        """Descarta una entrada y su carga en curso (no falla si no existe)"""
+        self._data.pop(key, None)
+        self._inflight.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "load_errors": self.load_errors,
+            "hit_rate": round((self.hits + self.stale_hits) / total, 4) if total else 0.0,
+        }
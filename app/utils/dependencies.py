@@ -5,11 +5,14 @@ Funciones reutilizables para autenticación y autorización
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
+from typing import Optional, Union
 from bson import ObjectId
 
+from app.config import settings
 from app.models.user import User
+from app.schemas.user_schema import TokenPrincipal
 from app.utils.security import decode_access_token
+from app.utils.auth_cache import user_cache, get_token_state
 
 # Esquema de autenticación Bearer
 # auto_error=False permite que el header sea opcional (para endpoints públicos)
@@ -57,20 +60,34 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Buscar usuario en la base de datos
-    try:
-        user = await User.get(ObjectId(user_id))
-    except Exception:
+    # Buscar usuario (primero en caché, luego en la base de datos).
+    # La caché guarda una copia propia y cada request recibe otra: los handlers que
+    # modifican current_user (aunque luego fallen al guardar) nunca tocan lo cacheado.
+    cached = user_cache.get(user_id)
+    user = cached.model_copy(deep=True) if cached is not None else None
+    if user is None:
+        try:
+            user = await User.get(ObjectId(user_id))
+        except Exception:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Usuario no encontrado",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        if user is not None:
+            user_cache.set(user_id, user.model_copy(deep=True))
+    
+    if user is None or user.is_deleted:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuario no encontrado",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    if user is None or user.is_deleted:
+    if payload.get("token_version", 0) < user.token_version:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuario no encontrado",
+            detail="Token revocado, inicia sesión nuevamente",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
@@ -127,3 +144,89 @@ async def get_current_user_optional(
         return await get_current_user(credentials)
     except HTTPException:
         return None
+
+
+# Identidad del llamador: User completo o principal liviano construido desde el JWT
+Principal = Union[User, TokenPrincipal]
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Principal:
+    """
+    Obtener la identidad del llamador para endpoints de SOLO LECTURA.
+
+    Con AUTH_STATELESS_TOKENS=True construye un TokenPrincipal desde los claims del JWT
+    sin cargar el documento User; la revocación se valida contra token_version
+    (mapa cacheado por TOKEN_VERSION_CACHE_TTL_SECONDS). En cualquier otro caso,
+    o si el token es antiguo y no trae los claims necesarios, delega en get_current_user.
+    """
+    if not settings.AUTH_STATELESS_TOKENS or credentials is None:
+        return await get_current_user(credentials)
+
+    payload = decode_access_token(credentials.credentials)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido o expirado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if "token_version" not in payload or "is_active" not in payload:
+        # Token emitido antes de activar el modo: usar el camino completo
+        return await get_current_user(credentials)
+
+    try:
+        principal = TokenPrincipal(
+            id=payload["user_id"],
+            email=payload["email"],
+            role=payload["role"],
+            is_active=payload["is_active"],
+            token_version=payload["token_version"],
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # Mismas respuestas y en el mismo orden que get_current_user
+    current_version, exists, is_active = await get_token_state(str(principal.id))
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Usuario no encontrado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if principal.token_version < current_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revocado, inicia sesión nuevamente",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if not is_active or not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Usuario inactivo"
+        )
+
+    return principal
+
+
+async def get_current_principal_optional(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+) -> Optional[Principal]:
+    """
+    Igual que get_current_principal pero retorna None si no hay token o no es válido.
+    Útil para endpoints públicos de lectura.
+    """
+    if credentials is None:
+        return None
+
+    try:
+        return await get_current_principal(credentials)
+    except HTTPException:
+        return None
@@ -0,0 +1,26 @@
+"""
+Utilidades para ETag y GET condicional (If-None-Match -> 304)
+"""
+
+from typing import Any, Optional
+import hashlib
+
+
+def compute_etag(*parts: Any) -> str:
+    """ETag fuerte a partir de los valores que determinan la respuesta"""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True si el header If-None-Match del cliente incluye el ETag actual (o es '*')"""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    # Para GET la comparación es débil: W/"x" coincide con "x"
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def body_etag(body: bytes) -> str:
+    """ETag fuerte de un cuerpo ya serializado"""
+    return f'"{hashlib.sha1(body).hexdigest()}"'
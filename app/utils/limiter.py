@@ -4,10 +4,24 @@ Instancia compartida del rate limiter (SlowAPI).
 Se define aquí para evitar importaciones circulares entre main.py y los routers.
 main.py importa desde aquí para registrar el limiter en la app.
 Los routers importan desde aquí para usar @limiter.limit(...) como decorador.
+
+Los contadores se guardan donde indique RATE_LIMIT_STORAGE (ver rate_limit_storage.py):
+con varios workers hace falta un backend compartido para que los límites sean globales.
 """
 
 from slowapi import Limiter
-from slowapi.util import get_remote_address
+from app.utils.rate_limit_storage import get_rate_limit_storage
+from app.utils.token_bucket import get_rate_limit_key
+
+_storage_uri, _storage_options = get_rate_limit_storage()
 
-# Instancia singleton del limiter — clave por IP del cliente
-limiter = Limiter(key_func=get_remote_address, default_limits=["100/minute"])
+# Instancia singleton del limiter — clave por usuario autenticado o, sin token, por IP
+# (login y registro siempre por IP, ver IP_KEYED_ROUTES en token_bucket.py)
+limiter = Limiter(
+    key_func=get_rate_limit_key,
+    default_limits=["100/minute"],
+    storage_uri=_storage_uri,
+    storage_options=_storage_options,
+    # Si el backend compartido cae, seguir limitando en memoria en vez de fallar el request
+    in_memory_fallback_enabled=_storage_uri != "memory://",
+)
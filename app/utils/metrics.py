@@ -0,0 +1,39 @@
+"""
+Métricas simples en memoria (por proceso)
+
+Contadores livianos para exponer latencias y tamaños de cola en /health/metrics
+sin depender de Prometheus ni de servicios externos.
+"""
+
+from typing import Dict, Any
+
+
+class LatencyStats:
+    """
+    Acumulador de latencias en milisegundos.
+    Guarda conteo, total, máximo y último valor; el promedio se calcula al leer.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        """Registra una nueva medición (en milisegundos)"""
+        self.count += 1
+        self.total_ms += value_ms
+        self.last_ms = value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retorna las métricas actuales como diccionario serializable"""
+        avg = self.total_ms / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "avg_ms": round(avg, 3),
+            "max_ms": round(self.max_ms, 3),
+            "last_ms": round(self.last_ms, 3),
+        }
@@ -0,0 +1,147 @@
+"""
+Utilidades de paginación
+
+- page/limit: `paginate` trae la página y el total en UNA sola agregación ($facet)
+  en vez de count() + find(). Opcionalmente reutiliza totales recientes por filtro.
+- cursor (keyset): el cursor guarda la clave de orden del último elemento entregado
+  (fecha + _id) y la siguiente página se pide con un rango sobre el índice, sin recorrer
+  los documentos anteriores. El costo de una página es el mismo sin importar la profundidad.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, Type
+from datetime import datetime
+import base64
+import json
+
+from beanie import Document
+from beanie.odm.utils.parsing import parse_obj
+from beanie.odm.utils.projection import get_projection
+from pydantic import BaseModel
+from bson import ObjectId, json_util
+from bson.errors import InvalidId
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.utils.cache import TTLCache
+
+# (colección, firma del filtro) -> total
+_total_cache = TTLCache(
+    maxsize=settings.PAGINATION_TOTAL_CACHE_MAX_SIZE,
+    ttl=settings.PAGINATION_TOTAL_CACHE_TTL_SECONDS
+)
+
+
+def encode_cursor(sort_value: datetime, doc_id: Any) -> str:
+    """Cursor opaco (base64 url-safe) a partir de la clave de orden del último elemento"""
+    raw = json.dumps({"v": sort_value.isoformat(), "id": str(doc_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Decodifica un cursor. Lanza 400 si fue alterado o no es válido."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["v"]), ObjectId(data["id"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginación inválido"
+        )
+
+
+def seek_filter(cursor: str, sort_field: str) -> Dict[str, Any]:
+    """
+    Filtro de rango para continuar después del cursor en orden (sort_field DESC, _id DESC).
+    El _id desempata documentos con la misma fecha.
+    """
+    sort_value, doc_id = decode_cursor(cursor)
+    return {"$or": [
+        {sort_field: {"$lt": sort_value}},
+        {sort_field: sort_value, "_id": {"$lt": doc_id}},
+    ]}
+
+
+def sort_spec(sort_field: str) -> List[Tuple[str, int]]:
+    """Orden estable usado por ambos modos de paginación"""
+    return [(sort_field, -1), ("_id", -1)]
+
+
+def next_cursor_for(items: List[Any], sort_field: str, limit: int, has_more: bool) -> Optional[str]:
+    """Cursor de la página siguiente, o None si esta es la última"""
+    if not has_more or not items:
+        return None
+    last = items[min(limit, len(items)) - 1]
+    return encode_cursor(getattr(last, sort_field), last.id)
+
+
+def _filter_signature(model: Type[Document], filter_query: Dict[str, Any]) -> Tuple[str, str]:
+    """Clave estable de un filtro (json extendido de BSON, con ObjectId/fechas/regex)"""
+    return model.get_collection_name(), json_util.dumps(filter_query, sort_keys=True)
+
+
+async def paginate(
+    model: Type[Document],
+    query_filters: List[Any],
+    sort: List[Tuple[str, int]],
+    skip: int,
+    limit: int,
+    estimated_total: Optional[bool] = None,
+    projection_model: Optional[Type[BaseModel]] = None
+) -> Tuple[List[Any], int]:
+    """
+    Página + total en un solo viaje a MongoDB mediante $facet.
+
+    Con `projection_model` MongoDB solo envía los campos de ese modelo (igual que
+    `.project()` de Beanie) y los elementos se retornan como instancias suyas.
+
+    Con `estimated_total` (por defecto PAGINATION_ESTIMATED_TOTALS) el total de cada filtro
+    se recuerda PAGINATION_TOTAL_CACHE_TTL_SECONDS: mientras esté vigente solo se trae la
+    página, sin contar. Sirve para pantallas donde un total de hace unos segundos basta.
+
+    Returns:
+        (documentos de la página, total de documentos que cumplen el filtro)
+    """
+    if estimated_total is None:
+        estimated_total = settings.PAGINATION_ESTIMATED_TOTALS
+
+    filter_query = model.find(*query_filters).get_filter_query()
+    item_model = projection_model or model
+    projection = get_projection(projection_model) if projection_model else None
+    signature = _filter_signature(model, filter_query) if estimated_total else None
+
+    if signature is not None:
+        total = _total_cache.get(signature)
+        if total is not None:
+            docs = await model.get_motor_collection().find(filter_query, projection)\
+                .sort(sort).skip(skip).limit(limit).to_list(length=limit)
+            items = [parse_obj(item_model, doc) for doc in docs]
+            return items, max(total, skip + len(items))
+
+    items_stages: List[Dict[str, Any]] = [{"$skip": skip}, {"$limit": limit}]
+    if projection:
+        items_stages.append({"$project": projection})
+
+    # $sort antes de $facet: dentro de $facet no se usan índices, así $match + $sort
+    # se resuelven recorriendo el índice en orden en vez de ordenar en memoria
+    pipeline = [
+        {"$match": filter_query},
+        {"$sort": dict(sort)},
+        {"$facet": {
+            "items": items_stages,
+            "total": [{"$count": "count"}],
+        }},
+    ]
+    result = await model.get_motor_collection().aggregate(pipeline).to_list(length=1)
+    facet = result[0] if result else {"items": [], "total": []}
+
+    items = [parse_obj(item_model, doc) for doc in facet["items"]]
+    total = facet["total"][0]["count"] if facet["total"] else 0
+
+    if signature is not None:
+        _total_cache.set(signature, total)
+    return items, total
+
+
+def get_total_cache_stats() -> Dict[str, Any]:
+    return _total_cache.stats()
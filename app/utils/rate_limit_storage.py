@@ -0,0 +1,133 @@
+"""
+Backends de almacenamiento para el rate limiter (SlowAPI / limits)
+
+Con varios workers de uvicorn el almacenamiento en memoria deja a cada proceso con
+sus propios contadores: un límite de 3/5minutes se convierte en N×3. Aquí se elige
+dónde viven los contadores según RATE_LIMIT_STORAGE:
+
+- memory:  contadores por proceso (desarrollo / un solo worker)
+- sqlite:  archivo compartido por todos los workers del mismo host
+           (por defecto en /dev/shm, es decir, en memoria compartida)
+
+SlowAPI llama al storage de forma síncrona dentro del event loop: solo se ofrecen
+backends locales que responden en microsegundos. Un backend de red (MongoDB, Redis
+síncrono) bloquearía el worker completo en cada request limitado.
+"""
+
+from typing import Any, Dict, Tuple
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from limits.storage import Storage
+
+from app.config import settings
+
+
+class SQLiteStorage(Storage):
+    """
+    Contadores de ventana fija en un archivo SQLite compartido entre procesos.
+
+    - Cada `incr` es un único UPSERT ... RETURNING: atómico aunque varios workers
+      escriban a la vez (SQLite serializa las escrituras).
+    - Memoria acotada: las ventanas vencidas se reutilizan en el mismo UPSERT y
+      se purgan periódicamente.
+    - Los contadores son efímeros: journal WAL y synchronous=OFF (no se fuerza fsync).
+
+    URI: sqlite://<ruta absoluta>, p. ej. sqlite:///dev/shm/rate_limit.db
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    # Purgar filas vencidas cada N incrementos
+    PURGE_EVERY = 1000
+
+    _INCR_SQL = """
+        INSERT INTO counters (key, value, expire_at) VALUES (?, ?, ?)
+        ON CONFLICT(key) DO UPDATE SET
+            value = CASE WHEN expire_at <= ? THEN excluded.value ELSE value + excluded.value END,
+            expire_at = CASE WHEN expire_at <= ? THEN excluded.expire_at ELSE expire_at END
+        RETURNING value
+    """
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options: Any) -> None:
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.path = uri.split("://", 1)[1]
+        self._local = threading.local()
+        self._incr_count = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS counters ("
+            " key TEXT PRIMARY KEY, value INTEGER NOT NULL, expire_at REAL NOT NULL)"
+        )
+
+    @property
+    def base_exceptions(self) -> Tuple[type, ...]:
+        return (sqlite3.Error,)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Una conexión por hilo (sqlite3 no comparte conexiones entre hilos)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        conn = self._connection()
+        value = conn.execute(self._INCR_SQL, (key, amount, now + expiry, now, now)).fetchone()[0]
+
+        self._incr_count += 1
+        if self._incr_count % self.PURGE_EVERY == 0:
+            conn.execute("DELETE FROM counters WHERE expire_at <= ?", (now,))
+        return value
+
+    def get(self, key: str) -> int:
+        row = self._connection().execute(
+            "SELECT value FROM counters WHERE key = ? AND expire_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        row = self._connection().execute(
+            "SELECT expire_at FROM counters WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int:
+        return self._connection().execute("DELETE FROM counters").rowcount
+
+    def clear(self, key: str) -> None:
+        self._connection().execute("DELETE FROM counters WHERE key = ?", (key,))
+
+
+def _default_sqlite_path() -> str:
+    """/dev/shm si existe (memoria compartida en Linux); si no, el directorio temporal"""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, "dulcevicio_rate_limit.db")
+
+
+def get_rate_limit_storage() -> Tuple[str, Dict[str, Any]]:
+    """
+    Retorna (storage_uri, storage_options) para el Limiter según RATE_LIMIT_STORAGE.
+    """
+    backend = settings.RATE_LIMIT_STORAGE.lower()
+
+    if backend == "sqlite":
+        path = settings.RATE_LIMIT_SQLITE_PATH or _default_sqlite_path()
+        return f"sqlite://{os.path.abspath(path)}", {}
+
+    if backend != "memory":
+        raise ValueError(f"RATE_LIMIT_STORAGE inválido: {settings.RATE_LIMIT_STORAGE} (memory | sqlite)")
+    return "memory://", {}
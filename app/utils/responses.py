@@ -0,0 +1,48 @@
+"""
+Respuesta JSON rápida para endpoints calientes
+
+Cuando un endpoint retorna un dict con `response_model`, FastAPI lo valida de nuevo
+contra el modelo y lo vuelve a serializar, aunque el servicio ya lo haya armado desde
+los documentos. Retornar `FastJSONResponse` evita ese segundo paso: el contenido se
+escribe tal cual (el response_model queda solo para la documentación OpenAPI).
+
+- Modelos Pydantic: directo a bytes con el serializador de pydantic-core.
+- dict/list: con orjson si está instalado; si no, igual que JSONResponse.
+
+Usar solo con contenido confiable: modelos de respuesta construidos por el servicio.
+"""
+
+from typing import Any
+import json
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Modelos Pydantic anidados dentro de dicts/listas"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Tipo no serializable a JSON: {type(value).__name__}")
+
+
+def dumps_json(content: Any) -> bytes:
+    """Serializa contenido de respuesta a bytes JSON por el camino más rápido disponible"""
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
@@ -0,0 +1,22 @@
+"""
+Búsqueda de cursos por texto
+
+Usa el índice de texto de la colección courses (ver models/course.py): título, etiquetas,
+subcategoría y descripción con pesos distintos, stemming en español e insensible a tildes.
+La consulta se normaliza igual que los slugs (normalize_text) antes de enviarla.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.utils.slug import normalize_text
+
+# Orden por relevancia ($meta textScore); se combina con el orden estable del listado
+TEXT_SCORE_SORT: List[Tuple[str, Any]] = [("score", {"$meta": "textScore"})]
+
+
+def text_search_filter(search: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Filtro $text para la búsqueda, o None si no queda ningún término tras normalizar"""
+    terms = normalize_text(search or "")
+    if not terms:
+        return None
+    return {"$text": {"$search": terms}}
@@ -3,18 +3,45 @@ Utilidades de seguridad: JWT y hashing de contraseñas
 """
 
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Tuple, List
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import logging
+import multiprocessing
+import time
+import bcrypt
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from pymongo import ReturnDocument
 from app.config import settings
+from app.utils.metrics import LatencyStats
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
 
 # Contexto para hashing de contraseñas con bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# Costo vigente (puede ajustarse al arranque con calibrate_password_hashing)
+_bcrypt_rounds = settings.BCRYPT_ROUNDS
+
+# Contextos por costo, para hashear con un costo explícito (p. ej. en los procesos worker)
+_contexts_by_rounds: Dict[int, CryptContext] = {settings.BCRYPT_ROUNDS: pwd_context}
 
 
 import hashlib
 
-def hash_password(password: str) -> str:
+def _context_for(rounds: int) -> CryptContext:
+    context = _contexts_by_rounds.get(rounds)
+    if context is None:
+        context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        _contexts_by_rounds[rounds] = context
+    return context
+
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
     """
     Hash de contraseña usando SHA-256 + bcrypt.
     
@@ -22,10 +49,11 @@ def hash_password(password: str) -> str:
     2. Hasheamos eso con Bcrypt.
     
     Esto evita el límite de 72 bytes de Bcrypt y permite contraseñas de cualquier longitud.
+    `rounds` permite forzar el costo (por defecto se usa el costo vigente).
     """
     # Pre-hash para seguridad y compatibilidad de longitud
     password_safe = hashlib.sha256(password.encode('utf-8')).hexdigest()
-    return pwd_context.hash(password_safe)
+    return _context_for(rounds or _bcrypt_rounds).hash(password_safe)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -37,6 +65,251 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(password_safe, hashed_password)
 
 
+# ─────────────────────────────────────────────
+# HASHING ASÍNCRONO (pool de procesos acotado)
+# ─────────────────────────────────────────────
+
+def _timed_hash(password: str, rounds: int) -> Tuple[str, float, float]:
+    """Se ejecuta en el proceso worker. Retorna (hash, inicio, fin) en tiempo de pared."""
+    started = time.time()
+    result = hash_password(password, rounds=rounds)
+    return result, started, time.time()
+
+
+def _hash_many(passwords: List[str], rounds: int) -> List[str]:
+    """Se ejecuta en el proceso worker. Hashea un bloque de contraseñas (importación masiva)."""
+    return [hash_password(p, rounds=rounds) for p in passwords]
+
+
+def _timed_verify(plain_password: str, hashed_password: str) -> Tuple[bool, float, float]:
+    """Se ejecuta en el proceso worker. Retorna (es_válida, inicio, fin) en tiempo de pared."""
+    started = time.time()
+    result = verify_password(plain_password, hashed_password)
+    return result, started, time.time()
+
+
+class PasswordHasher:
+    """
+    Ejecuta bcrypt fuera del event loop en un pool de procesos acotado.
+
+    - Si hay más de `max_pending` trabajos en espera responde 503 (protege el servidor
+      ante ráfagas de login en lugar de acumular latencia indefinidamente).
+    - Registra la latencia del hash y el tiempo de espera en cola.
+    - Con `workers=0` usa el pool de hilos por defecto del event loop.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self.rejected = 0
+        self.bulk_items = 0
+        self.hash_latency = LatencyStats()
+        self.queue_wait = LatencyStats()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            # "spawn" evita hacer fork de un proceso con hilos activos (motor, uvicorn)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Encola `fn(*args)` en el pool y espera su resultado"""
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servidor ocupado, intenta nuevamente en unos segundos",
+                headers={"Retry-After": "1"},
+            )
+
+        self._pending += 1
+        submitted = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started, finished = await loop.run_in_executor(self._get_executor(), fn, *args)
+        except BrokenProcessPool:
+            # Un worker murió: descartar el pool para recrearlo en la próxima llamada
+            self._executor = None
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servidor ocupado, intenta nuevamente en unos segundos",
+                headers={"Retry-After": "1"},
+            )
+        finally:
+            self._pending -= 1
+
+        self.queue_wait.observe(max(0.0, started - submitted) * 1000)
+        self.hash_latency.observe((finished - started) * 1000)
+        return result
+
+    async def run_bulk(self, fn: Callable, items: List[Any], *args, chunk_size: int = 10) -> List[Any]:
+        """
+        Procesa `items` en bloques con `fn(bloque, *args)` repartidos entre los workers.
+
+        Pensado para operaciones administrativas masivas: no aplica el límite de cola,
+        pero deja un worker libre (si hay más de uno) y usa bloques chicos para que
+        los logins interactivos puedan intercalarse entre bloques.
+        """
+        if not items:
+            return []
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max(1, self.workers - 1))
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+        async def process(chunk: List[Any]) -> List[Any]:
+            async with semaphore:
+                self._pending += 1
+                try:
+                    return await loop.run_in_executor(self._get_executor(), fn, chunk, *args)
+                finally:
+                    self._pending -= 1
+
+        results = await asyncio.gather(*(process(chunk) for chunk in chunks))
+        self.bulk_items += len(items)
+        return [value for chunk_result in results for value in chunk_result]
+
+    def shutdown(self) -> None:
+        """Cierra el pool de procesos (llamar en el shutdown de la app)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "bcrypt_rounds": _bcrypt_rounds,
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+            "bulk_items": self.bulk_items,
+            "hash_latency": self.hash_latency.snapshot(),
+            "queue_wait": self.queue_wait.snapshot(),
+        }
+
+
+# Instancia singleton del hasher
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """Versión no bloqueante de hash_password (usar dentro de handlers async)"""
+    # El costo se pasa explícito: los procesos worker no ven la calibración del proceso padre
+    return await password_hasher.run(_timed_hash, password, _bcrypt_rounds)
+
+
+async def hash_passwords_bulk(passwords: List[str]) -> List[str]:
+    """Hashea muchas contraseñas en paralelo en el pool (mantiene el orden de entrada)"""
+    return await password_hasher.run_bulk(_hash_many, passwords, _bcrypt_rounds)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Versión no bloqueante de verify_password (usar dentro de handlers async)"""
+    return await password_hasher.run(_timed_verify, plain_password, hashed_password)
+
+
+# ─────────────────────────────────────────────
+# CALIBRACIÓN DEL COSTO DE BCRYPT
+# ─────────────────────────────────────────────
+
+def get_bcrypt_rounds() -> int:
+    """Costo de bcrypt vigente para nuevos hashes"""
+    return _bcrypt_rounds
+
+
+def measure_bcrypt_rounds(target_ms: float, min_rounds: int, max_rounds: int) -> int:
+    """
+    Elige el mayor costo cuyo tiempo estimado de hash cabe en `target_ms`.
+
+    Mide el costo mínimo y extrapola: cada ronda adicional duplica el tiempo de bcrypt.
+    Nunca retorna menos de `min_rounds` aunque la CPU sea lenta.
+    """
+    samples = []
+    for _ in range(3):
+        started = time.perf_counter()
+        bcrypt.hashpw(b"calibracion", bcrypt.gensalt(min_rounds))
+        samples.append((time.perf_counter() - started) * 1000)
+    base_ms = min(samples)
+
+    rounds = min_rounds
+    while rounds < max_rounds and base_ms * 2 ** (rounds + 1 - min_rounds) <= target_ms:
+        rounds += 1
+    return rounds
+
+
+# Documento de app_settings donde queda el costo calibrado (compartido por todos los workers)
+BCRYPT_ROUNDS_SETTING_ID = "bcrypt_rounds"
+
+
+async def calibrate_password_hashing() -> int:
+    """
+    Fija el costo de bcrypt al arranque.
+
+    - BCRYPT_TARGET_MS=0 (por defecto): se usa BCRYPT_ROUNDS tal cual.
+    - BCRYPT_TARGET_MS>0: se calibra UNA vez y el resultado se guarda en MongoDB
+      (app_settings); el primer worker que arranca lo mide y los demás, y los
+      siguientes despliegues, leen ese mismo valor. Así todos los workers generan
+      hashes con el mismo costo y needs_rehash no oscila entre ellos.
+      Para recalibrar, borrar el documento `bcrypt_rounds` de app_settings.
+    """
+    global _bcrypt_rounds
+
+    if settings.BCRYPT_TARGET_MS <= 0:
+        return _bcrypt_rounds
+
+    from app import database  # Import local: database importa la configuración de la app
+
+    collection = database.mongodb_client[settings.MONGODB_DB_NAME]["app_settings"] \
+        if database.mongodb_client is not None else None
+    stored = await collection.find_one({"_id": BCRYPT_ROUNDS_SETTING_ID}) if collection is not None else None
+
+    if stored is None:
+        measured = await asyncio.to_thread(
+            measure_bcrypt_rounds,
+            settings.BCRYPT_TARGET_MS,
+            settings.BCRYPT_MIN_ROUNDS,
+            settings.BCRYPT_MAX_ROUNDS,
+        )
+        if collection is None:
+            logger.warning("⚠️ Sin conexión a MongoDB: el costo de bcrypt calibrado no se comparte entre workers")
+            stored = {"rounds": measured}
+        else:
+            # Si otro worker lo guardó mientras medíamos, gana el suyo
+            stored = await collection.find_one_and_update(
+                {"_id": BCRYPT_ROUNDS_SETTING_ID},
+                {"$setOnInsert": {"rounds": measured, "target_ms": settings.BCRYPT_TARGET_MS,
+                                  "calibrated_at": datetime.utcnow()}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+
+    _bcrypt_rounds = max(int(stored["rounds"]), settings.BCRYPT_MIN_ROUNDS)
+    logger.info(f"🔐 bcrypt: {_bcrypt_rounds} rondas (calibrado para {settings.BCRYPT_TARGET_MS} ms)")
+    return _bcrypt_rounds
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Indica si un hash bcrypt fue generado con un costo MENOR al vigente.
+    Solo se sube el costo: un hash más fuerte que el vigente nunca se rebaja.
+    Formato bcrypt: $2b$<rondas>$<salt+hash>
+    """
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return False
+    return int(parts[2]) < _bcrypt_rounds
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Crear token JWT de acceso
@@ -66,26 +339,68 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     return encoded_jwt
 
 
+# token -> payload; cada entrada vive hasta el claim "exp" del propio token
+_token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAX_SIZE, ttl=0)
+
+# token -> True; tokens rechazados recientemente (bots reenviando basura)
+_rejected_token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.TOKEN_REJECT_CACHE_TTL_SECONDS
+)
+
+# Un JWT nuestro mide unos cientos de bytes; algo mucho mayor no se decodifica ni se cachea
+_MAX_TOKEN_LENGTH = 4096
+
+
 def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
     """
     Decodificar y verificar token JWT
     
+    El resultado se memoiza por token: un cliente reutiliza el mismo token durante horas,
+    así que la verificación HMAC y el parseo se hacen una sola vez por worker.
+    Los tokens inválidos también se recuerdan un tiempo corto.
+    
     Args:
         token: Token JWT a decodificar
         
     Returns:
         Payload del token si es válido, None si no es válido
     """
+    payload = _token_cache.get(token)
+    if payload is not None:
+        return payload
+
+    if len(token) > _MAX_TOKEN_LENGTH:
+        return None
+
+    if _rejected_token_cache.get(token) is not None:
+        return None
+
     try:
         payload = jwt.decode(
             token,
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM]
         )
-        return payload
     except JWTError:
+        _rejected_token_cache.set(token, True)
         return None
 
+    # Cachear hasta que el token expire (jose ya rechazó los expirados)
+    exp = payload.get("exp")
+    if exp is not None:
+        _token_cache.set(token, payload, ttl=exp - time.time())
+
+    return payload
+
+
+def get_token_cache_stats() -> Dict[str, Any]:
+    """Métricas de las cachés de tokens (válidos y rechazados)"""
+    return {
+        "valid": _token_cache.stats(),
+        "rejected": _rejected_token_cache.stats(),
+    }
+
 
 def validate_password_strength(password: str) -> tuple[bool, str]:
     """
@@ -4,12 +4,14 @@ Utilidades para generación y validación de slugs
 
 import re
 import unicodedata
+from typing import Any, Dict, List, Set
 from app.models.course import Course
 
-def generate_slug(text: str) -> str:
+def normalize_text(text: str) -> str:
     """
-    Genera un slug URL-friendly a partir de un texto.
-    Ej: "Macarons Perfectos & Fáciles" -> "macarons-perfectos-faciles"
+    Normaliza un texto para comparar y buscar: sin tildes, en minúsculas y
+    con palabras separadas por un espacio.
+    Ej: "Macarons Perfectos & Fáciles" -> "macarons perfectos faciles"
     """
     # Normalizar caracteres unicode (tildes, ñ, etc)
     text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('utf-8')
@@ -17,25 +19,73 @@ def generate_slug(text: str) -> str:
     # Convertir a minúsculas
     text = text.lower()
     
-    # Reemplazar caracteres no alfanuméricos con guiones
-    text = re.sub(r'[^a-z0-9]+', '-', text)
-    
-    # Eliminar guiones al inicio y final
-    text = text.strip('-')
+    # Reemplazar caracteres no alfanuméricos con espacios
+    text = re.sub(r'[^a-z0-9]+', ' ', text)
     
-    return text
+    return text.strip()
+
+
+def generate_slug(text: str) -> str:
+    """
+    Genera un slug URL-friendly a partir de un texto.
+    Ej: "Macarons Perfectos & Fáciles" -> "macarons-perfectos-faciles"
+    """
+    return normalize_text(text).replace(' ', '-')
+
+def _slug_pattern(base: str) -> str:
+    """
+    Regex anclado que captura la base y sus variantes con sufijo numérico.
+    Empieza con el literal de la base (sin grupo): MongoDB lo reconoce como regex de
+    prefijo y acota el recorrido del índice de slug a ese prefijo.
+    """
+    return "^" + re.escape(base) + r"(?:-\d+)?$"
+
+
+def _slug_filter(bases: List[str]) -> Dict[str, Any]:
+    """Filtro de slugs ocupados: un regex de prefijo por base (en $or si son varias)"""
+    clauses = [{"slug": {"$regex": _slug_pattern(base)}} for base in bases]
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+def _pick_slug(base: str, taken: Set[str]) -> str:
+    """Primer slug libre: la base o el menor sufijo -N disponible"""
+    if base not in taken:
+        return base
+    counter = 1
+    while f"{base}-{counter}" in taken:
+        counter += 1
+    return f"{base}-{counter}"
+
 
 async def ensure_unique_slug_course(slug: str) -> str:
     """
     Asegura que el slug sea único para un curso.
     Si ya existe, le agrega un sufijo numérico incremental.
     Ej: "macarons" -> "macarons-1" -> "macarons-2"
+
+    Trae en UNA consulta (regex anclado sobre el índice único de slug) todos los slugs
+    "<base>" y "<base>-N" y calcula el sufijo en memoria. Incluye cursos eliminados:
+    el índice único también los cubre.
     """
-    original_slug = slug
-    counter = 1
-    
-    while await Course.find({"slug": slug, "is_deleted": False}).count() > 0:
-        slug = f"{original_slug}-{counter}"
-        counter += 1
-        
-    return slug
+    taken = set(await Course.distinct("slug", _slug_filter([slug])))
+    return _pick_slug(slug, taken)
+
+
+async def allocate_unique_slugs_course(slugs: List[str]) -> List[str]:
+    """
+    Versión por lote de ensure_unique_slug_course (importar o clonar muchos cursos).
+    Una sola consulta para todo el lote; los slugs asignados se reservan para que
+    dos cursos del lote con el mismo título no reciban el mismo slug.
+    """
+    bases = sorted(set(slugs))
+    if not bases:
+        return []
+
+    taken = set(await Course.distinct("slug", _slug_filter(bases)))
+
+    allocated = []
+    for base in slugs:
+        slug = _pick_slug(base, taken)
+        taken.add(slug)
+        allocated.append(slug)
+    return allocated
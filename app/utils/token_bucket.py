@@ -0,0 +1,204 @@
+"""
+Rate limiting por token bucket con costo por ruta
+
+Complementa a SlowAPI (límites por endpoint con decorador) con un presupuesto global
+por cliente que se aplica como middleware ASGI a todos los requests:
+
+- Clave: user_id del JWT si el request trae token válido, IP en caso contrario.
+  Así los estudiantes detrás de un mismo NAT (colegios) no comparten presupuesto.
+  Login y registro se limitan siempre por IP (ver IP_KEYED_ROUTES).
+- Costo: cada ruta descuenta una cantidad de fichas según lo que le cuesta a MongoDB
+  (una búsqueda por regex cuesta más que un health check). Ver ROUTE_COSTS.
+
+Los buckets viven en memoria del worker (sin E/S por request): el chequeo completo
+cuesta unos pocos microsegundos. Con N workers cada uno aplica su propio presupuesto.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+import json
+import math
+import time
+
+from app.config import settings
+from app.utils.security import decode_access_token
+
+# Costo por (método, ruta exacta): listados y operaciones pesadas
+ROUTE_COSTS = {
+    ("GET", "/api/courses"): 3,
+    ("GET", "/api/courses/suggest"): 0.5,  # En memoria, se llama en cada tecla
+    ("GET", "/api/users"): 3,
+    ("GET", "/api/enrollments"): 3,
+    ("GET", "/api/enrollments/me"): 2,
+    ("POST", "/api/auth/login"): 5,        # bcrypt
+    ("POST", "/api/auth/register"): 5,
+    ("POST", "/api/users/import"): 20,
+}
+
+# Costo por prefijo (se evalúa solo si no hubo coincidencia exacta)
+PREFIX_COSTS = [
+    ("/health", 0.2),
+]
+
+# Parámetros de query que disparan búsquedas por regex en MongoDB
+SEARCH_PARAMS = (b"search=", b"q=")
+SEARCH_EXTRA_COST = 4
+
+# Rutas que responden la búsqueda desde memoria: su `q` no llega a MongoDB
+IN_MEMORY_SEARCH_ROUTES = {
+    ("GET", "/api/courses/suggest"),
+}
+DEFAULT_COST = 1
+
+
+def request_cost(method: str, path: str, query_string: bytes = b"") -> float:
+    """Fichas que consume un request según su ruta y si trae parámetros de búsqueda"""
+    route = (method, path.rstrip("/") or "/")
+    cost = ROUTE_COSTS.get(route)
+    if cost is None:
+        cost = next((c for prefix, c in PREFIX_COSTS if path.startswith(prefix)), DEFAULT_COST)
+
+    if query_string and route not in IN_MEMORY_SEARCH_ROUTES and any(
+        query_string.startswith(param) or b"&" + param in query_string for param in SEARCH_PARAMS
+    ):
+        # Solo cuenta si el parámetro trae un valor
+        params = parse_qs(query_string.decode("latin-1"))
+        if any(params.get(name) for name in ("search", "q")):
+            cost += SEARCH_EXTRA_COST
+    return cost
+
+
+# Rutas sin autenticación que se limitan siempre por IP: si usaran el token del header,
+# rotando tokens de cuentas propias se multiplicaría el presupuesto de fuerza bruta
+IP_KEYED_ROUTES = {
+    ("POST", "/api/auth/login"),
+    ("POST", "/api/auth/register"),
+}
+
+
+def _client_ip(scope: Dict[str, Any]) -> str:
+    client = scope.get("client")
+    return client[0] if client else "127.0.0.1"
+
+
+def _bearer_token(scope: Dict[str, Any]) -> Optional[str]:
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            return token if scheme.lower() == "bearer" and token else None
+    return None
+
+
+def rate_limit_key(scope: Dict[str, Any]) -> str:
+    """
+    Identidad del cliente para el rate limit: user_id del JWT o IP (siempre IP en IP_KEYED_ROUTES).
+    El JWT se decodifica con la memoización de security.py (sin costo en tokens ya vistos).
+    """
+    route = (scope.get("method"), scope.get("path", "").rstrip("/") or "/")
+    token = _bearer_token(scope) if route not in IP_KEYED_ROUTES else None
+    if token:
+        payload = decode_access_token(token)
+        if payload and payload.get("user_id"):
+            return f"user:{payload['user_id']}"
+    return f"ip:{_client_ip(scope)}"
+
+
+def get_rate_limit_key(request) -> str:
+    """key_func para SlowAPI: misma identidad que el middleware"""
+    return rate_limit_key(request.scope)
+
+
+class TokenBucketLimiter:
+    """
+    Token buckets en memoria, uno por clave, con recarga perezosa.
+
+    - `capacity`: ráfaga máxima (fichas).
+    - `refill_rate`: fichas recuperadas por segundo.
+    - `maxsize`: buckets guardados; al superarse se descarta el menos reciente
+      (un bucket descartado equivale a uno lleno, el caso más permisivo).
+    """
+
+    def __init__(self, capacity: float, refill_rate: float, maxsize: int):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self.allowed = 0
+        self.rejected = 0
+
+    def consume(self, key: str, cost: float) -> Tuple[bool, float]:
+        """
+        Descuenta `cost` fichas del bucket de `key`.
+        Retorna (permitido, segundos hasta poder pagar este costo).
+        """
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [self.capacity, now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_rate)
+            bucket[1] = now
+
+        if bucket[0] >= cost:
+            bucket[0] -= cost
+            self.allowed += 1
+            return True, 0.0
+
+        self.rejected += 1
+        return False, (cost - bucket[0]) / self.refill_rate
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "buckets": len(self._buckets),
+            "maxsize": self.maxsize,
+            "capacity": self.capacity,
+            "refill_per_second": self.refill_rate,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+
+token_bucket_limiter = TokenBucketLimiter(
+    capacity=settings.RATE_LIMIT_BUCKET_CAPACITY,
+    refill_rate=settings.RATE_LIMIT_BUCKET_REFILL_PER_SECOND,
+    maxsize=settings.RATE_LIMIT_BUCKET_MAX_KEYS,
+)
+
+
+class TokenBucketMiddleware:
+    """
+    Middleware ASGI puro (sin BaseHTTPMiddleware, para no envolver el body ni crear tareas).
+    Responde 429 con Retry-After cuando el cliente agotó su presupuesto.
+    """
+
+    def __init__(self, app, limiter: TokenBucketLimiter = token_bucket_limiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        cost = request_cost(scope["method"], scope["path"], scope.get("query_string", b""))
+        allowed, retry_after = self.limiter.consume(rate_limit_key(scope), cost)
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Demasiadas solicitudes, intenta nuevamente en unos segundos"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(math.ceil(retry_after)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
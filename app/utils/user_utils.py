@@ -2,7 +2,7 @@ import re
 import unicodedata
 import secrets
 import string
-from typing import Optional, Set
+from typing import Any, Dict, Optional, Set, List
 from datetime import datetime
 
 def normalize_name(name: str) -> str:
@@ -32,44 +32,86 @@ def generate_user_password(birth_date: Optional[datetime]) -> str:
     else:
         return "Dv12345678"
 
-async def generate_chef_username(full_name: str) -> str:
+async def generate_chef_username(full_name: str, exclude: Optional[Set[str]] = None) -> str:
     """
     Genera un username único con el prefijo 'Chef'.
-    Revisa la base de datos para asegurar unicidad.
+
+    Hace UNA sola consulta: trae todos los usernames que empiezan por 'Chef<PrimerNombre>'
+    con un regex anclado (recorre el índice único de username) y elige en memoria el primer
+    candidato libre. `exclude` agrega usernames que deben tratarse como ocupados
+    (p. ej. el que perdió una carrera contra otro registro simultáneo).
     """
     from app.models.user import User
-    
+
+    normalized_parts = _split_normalized_name(full_name)
+    prefix = f"Chef{normalized_parts[0]}"
+
+    taken = set(await User.distinct("username", {"username": {"$regex": f"^{re.escape(prefix)}"}}))
+    if exclude:
+        taken |= exclude
+
+    return _pick_chef_username(normalized_parts, taken)
+
+
+def _split_normalized_name(full_name: str) -> List[str]:
+    """Divide y normaliza el nombre completo; si no queda nada usa 'Usuario'"""
     parts = full_name.strip().split()
     normalized_parts = [normalize_name(p) for p in parts if normalize_name(p)]
+    return normalized_parts or ["Usuario"]
 
-    if not normalized_parts:
-        normalized_parts = ["Usuario"]
 
+def _pick_chef_username(normalized_parts: List[str], taken: Set[str]) -> str:
+    """
+    Elige el primer username libre siguiendo la misma estrategia de candidatos que
+    generate_chef_username, pero contra un conjunto en memoria de usernames ocupados.
+    """
     first_name = normalized_parts[0]
 
-    # Estrategia de candidatos
-    candidates = []
-    
-    # 1. ChefPrimerNombre
-    candidates.append(f"Chef{first_name}")
-    
-    # 2. ChefPrimerNombreSegundoNombre
+    candidates = [f"Chef{first_name}"]
     if len(normalized_parts) >= 3:
         candidates.append(f"Chef{first_name}{normalized_parts[1]}")
-        
-    # 3. ChefPrimerNombreApellido
     if len(normalized_parts) >= 2:
         candidates.append(f"Chef{first_name}{normalized_parts[-1]}")
 
     for candidate in candidates:
-        db_exists = await User.find_one(User.username == candidate)
-        if not db_exists:
+        if candidate not in taken:
             return candidate
 
-    # 4. Fallback numérico
     counter = 2
-    while True:
-        candidate = f"Chef{first_name}{counter}"
-        db_exists = await User.find_one(User.username == candidate)
-        if not db_exists:
-            retu
\ No newline at end of file
+    while f"Chef{first_name}{counter}" in taken:
+        counter += 1
+    return f"Chef{first_name}{counter}"
+
+
+def _chef_username_filter(first_names: List[str]) -> Dict[str, Any]:
+    """
+    Filtro de usernames ocupados: un regex de prefijo "^Chef<nombre>" por nombre (en $or
+    si son varios). Cada uno acota el recorrido del índice de username a su prefijo.
+    """
+    clauses = [{"username": {"$regex": "^Chef" + re.escape(name)}} for name in first_names]
+    return clauses[0] if len(clauses) == 1 else {"$or": clauses}
+
+
+async def generate_chef_usernames(full_names: List[str]) -> List[str]:
+    """
+    Genera usernames únicos 'Chef...' para un lote de nombres (importación masiva).
+
+    Hace UNA sola consulta con regex de prefijo (usan el índice único de username)
+    para traer todos los usernames ocupados de los prefijos del lote, y luego asigna
+    en memoria. Los usernames asignados se reservan para que no se repitan dentro del lote.
+    """
+    from app.models.user import User
+
+    names_parts = [_split_normalized_name(name) for name in full_names]
+    first_names = sorted({parts[0] for parts in names_parts})
+    if not first_names:
+        return []
+
+    taken = set(await User.distinct("username", _chef_username_filter(first_names)))
+
+    usernames = []
+    for parts in names_parts:
+        username = _pick_chef_username(parts, taken)
+        taken.add(username)
+        usernames.append(username)
+    return usernames
@@ -0,0 +1,108 @@
+"""
+Benchmark del costo por request de cada backend del rate limiter
+
+Uso:
+    python bench_rate_limit.py [--requests 5000] [--workers 4] [--backends memory,sqlite]
+
+Para cada backend mide:
+- latencia media y p99 de `hit` (lo que SlowAPI ejecuta en cada request limitado)
+- exactitud con varios procesos: N workers golpean la misma clave con un límite de 100
+  y se cuenta cuántos requests se aceptaron en total (lo correcto es 100).
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+from dotenv import load_dotenv
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+load_dotenv(dotenv_path=os.path.join(script_dir, '.env'))
+
+try:
+    from app.config import settings
+    from app.utils import rate_limit_storage  # Registra el esquema sqlite:// en limits
+except ImportError as e:
+    print(f"Error al importar la configuración de la app: {e}")
+    print("Asegúrate de ejecutar este script desde la raíz de DulceVizzioService.")
+    sys.exit(1)
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+
+def _storage_args(backend: str):
+    settings.RATE_LIMIT_STORAGE = backend
+    if backend == "sqlite" and not settings.RATE_LIMIT_SQLITE_PATH:
+        settings.RATE_LIMIT_SQLITE_PATH = os.path.join(tempfile.gettempdir(), "bench_rate_limit.db")
+    return rate_limit_storage.get_rate_limit_storage()
+
+
+def _new_limiter(backend: str) -> FixedWindowRateLimiter:
+    uri, options = _storage_args(backend)
+    return FixedWindowRateLimiter(storage_from_string(uri, **options))
+
+
+def _latency(backend: str, requests: int) -> dict:
+    limiter = _new_limiter(backend)
+    item = parse("1000000/minute")
+    key = f"bench-{uuid.uuid4().hex}"
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        limiter.hit(item, key)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    samples.sort()
+    return {
+        "avg_us": round(statistics.mean(samples), 1),
+        "p99_us": round(samples[int(len(samples) * 0.99) - 1], 1),
+    }
+
+
+def _worker(backend: str, key: str, attempts: int, results) -> None:
+    limiter = _new_limiter(backend)
+    item = parse("100/minute")
+    results.put(sum(1 for _ in range(attempts) if limiter.hit(item, key)))
+
+
+def _accepted_across_workers(backend: str, workers: int) -> int:
+    key = f"bench-{uuid.uuid4().hex}"
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_worker, args=(backend, key, 100, results))
+        for _ in range(workers)
+    ]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+    return sum(results.get() for _ in processes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de backends del rate limiter")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--backends", default="memory,sqlite")
+    args = parser.parse_args()
+
+    print(f"{'backend':<10} {'avg (µs)':>10} {'p99 (µs)':>10} {'aceptados/100':>15}")
+    for backend in args.backends.split(","):
+        try:
+            latency = _latency(backend, args.requests)
+            accepted = _accepted_across_workers(backend, args.workers)
+        except Exception as e:
+            print(f"{backend:<10} [ERR] {e.__class__.__name__}: {str(e)[:80]}")
+            continue
+        print(f"{backend:<10} {latency['avg_us']:>10} {latency['p99_us']:>10} {accepted:>15}")
+
+
+if __name__ == "__main__":
+    main()
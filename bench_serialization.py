@@ -0,0 +1,215 @@
+"""
+Benchmark de la serialización de respuestas (con documentos en memoria)
+
+Uso:
+    python bench_serialization.py [--lessons 50] [--enrollments 100] [--iterations 200]
+
+Compara, para el detalle de un curso con N lecciones y una página de N inscripciones:
+- antes: el servicio arma un dict con model_dump(mode='json') y luego FastAPI lo valida
+  contra el response_model, lo vuelve a volcar y lo pasa por json.dumps.
+- ahora: el servicio construye el schema desde los documentos (una validación) y
+  FastJSONResponse lo escribe directo a bytes.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+load_dotenv(dotenv_path=os.path.join(script_dir, '.env'))
+
+try:
+    from app.config import settings
+    from app.models.course import Course
+    from app.models.enrollment import Enrollment
+    from app.models.enums import CourseStatus, Role
+    from app.models.lesson import Lesson, LessonMaterial
+    from app.models.user import User
+    from app.schemas.course_schema import CourseDetailResponseSchema
+    from app.schemas.enrollment_schema import EnrollmentListResponse, EnrollmentResponseSchema
+    from app.utils.responses import FastJSONResponse, orjson
+except ImportError as e:
+    print(f"Error al importar la app: {e}")
+    print("Asegúrate de ejecutar este script desde la raíz de DulceVizzioService.")
+    sys.exit(1)
+
+from beanie import PydanticObjectId, init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import TypeAdapter
+
+
+async def _init_models() -> None:
+    """
+    Beanie necesita inicializarse para instanciar documentos: solo consulta la versión
+    del servidor (MONGODB_URL), sin crear índices ni leer o escribir datos.
+    """
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    await init_beanie(
+        database=client[settings.MONGODB_DB_NAME],
+        document_models=[Course, Lesson, User, Enrollment],
+        skip_indexes=True
+    )
+
+
+def _course(i: int = 0) -> Course:
+    return Course(
+        id=PydanticObjectId(),
+        title=f"Curso de Repostería Comercial {i}",
+        slug=f"curso-de-reposteria-comercial-{i}",
+        description="Un curso completo para aprender repostería comercial desde cero. " * 5,
+        category=1,
+        subcategory="Tortas",
+        tags=["tortas", "comercial", "fondant"],
+        price=45,
+        cover_image_url="https://res.cloudinary.com/demo/image/upload/v1/covers/abc.png",
+        whatsapp_group_url="https://chat.whatsapp.com/abc123",
+        status=CourseStatus.PUBLISHED,
+        published_at=datetime.utcnow(),
+        rating_average=4.5,
+        enrollment_count=120,
+        lessons_count=50,
+        total_duration_hours=12.5,
+    )
+
+
+def _lessons(course: Course, count: int) -> list:
+    return [
+        Lesson(
+            id=PydanticObjectId(),
+            course_id=course.id,
+            title=f"Lección {n}: técnica de merengue",
+            summary="Fundamentos del merengue francés paso a paso",
+            duration_seconds=900,
+            order=n,
+            is_preview=n == 1,
+            video_url=f"https://video.bunnycdn.com/play/123/{n}",
+            video_id=f"vid-{n}",
+            materials=[
+                LessonMaterial(title="Receta", resource_url="https://res.cloudinary.com/demo/raw/upload/receta.pdf")
+            ],
+        )
+        for n in range(1, count + 1)
+    ]
+
+
+def _user(i: int) -> User:
+    return User(
+        id=PydanticObjectId(),
+        email=f"alumna{i}@example.com",
+        username=f"alumna{i}",
+        full_name=f"Alumna {i}",
+        password_hash="x",
+        role=Role.USER,
+        phone_number="+59170000000",
+        birth_date=datetime(1995, 1, 1),
+    )
+
+
+def _legacy_render(response_model, content) -> bytes:
+    """Lo que hacía FastAPI con un dict y response_model: validar, volcar y json.dumps"""
+    adapter = TypeAdapter(response_model)
+    value = adapter.validate_python(content)
+    return json.dumps(
+        adapter.dump_python(value, mode="json"), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _course_detail_legacy(course, lessons) -> bytes:
+    course_dict = course.model_dump(mode='json')
+    course_dict["is_enrolled"] = True
+    course_dict["lessons"] = [lesson.model_dump(mode='json') for lesson in lessons]
+    return _legacy_render(CourseDetailResponseSchema, course_dict)
+
+
+def _course_detail_fast(course, lessons) -> bytes:
+    detail = CourseDetailResponseSchema.from_documents(course, lessons, is_enrolled=True)
+    return FastJSONResponse(detail).body
+
+
+def _enrollment_page_legacy(rows) -> bytes:
+    data = []
+    for enrollment, user, course in rows:
+        enrollment_dict = enrollment.model_dump(mode='json')
+        enrollment_dict["user"] = {
+            "id": str(user.id),
+            "username": user.username,
+            "full_name": user.full_name,
+            "role": user.role,
+            "is_active": user.is_active,
+            "avatar_url": None,
+        }
+        course_dict = course.model_dump(mode='json')
+        course_dict["is_enrolled"] = True
+        enrollment_dict["course"] = course_dict
+        data.append(enrollment_dict)
+    page = {"total": len(rows), "page": 1, "per_page": len(rows), "total_pages": 1, "next_cursor": None, "data": data}
+    return _legacy_render(EnrollmentListResponse, page)
+
+
+def _enrollment_page_fast(rows) -> bytes:
+    data = [EnrollmentResponseSchema.from_documents(e, u, c) for e, u, c in rows]
+    page = EnrollmentListResponse.model_construct(
+        total=len(rows), page=1, per_page=len(rows), total_pages=1, next_cursor=None, data=data
+    )
+    return FastJSONResponse(page).body
+
+
+def _timeit(fn, iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de respuestas")
+    parser.add_argument("--lessons", type=int, default=50)
+    parser.add_argument("--enrollments", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(_init_models())
+
+    course = _course()
+    lessons = _lessons(course, args.lessons)
+    rows = []
+    for i in range(args.enrollments):
+        user, row_course = _user(i), _course(i)
+        enrollment = Enrollment(
+            id=PydanticObjectId(),
+            user_id=user.id,
+            course_id=row_course.id,
+            expires_at=datetime.utcnow() + timedelta(days=365),
+        )
+        rows.append((enrollment, user, row_course))
+
+    # Ambos caminos deben producir el mismo JSON
+    assert json.loads(_course_detail_legacy(course, lessons)) == json.loads(_course_detail_fast(course, lessons))
+    assert json.loads(_enrollment_page_legacy(rows)) == json.loads(_enrollment_page_fast(rows))
+
+    print(f"orjson: {'sí' if orjson else 'no (dict/list usan json estándar)'}")
+    print(f"{'respuesta':<28} {'antes (ms)':>11} {'ahora (ms)':>11} {'mejora':>8}")
+    cases = [
+        (f"curso con {args.lessons} lecciones", lambda: _course_detail_legacy(course, lessons),
+         lambda: _course_detail_fast(course, lessons)),
+        (f"página de {args.enrollments} inscripciones", lambda: _enrollment_page_legacy(rows),
+         lambda: _enrollment_page_fast(rows)),
+    ]
+    for name, legacy, fast in cases:
+        before = _timeit(legacy, args.iterations)
+        after = _timeit(fast, args.iterations)
+        print(f"{name:<28} {before:>11.3f} {after:>11.3f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
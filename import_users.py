@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Importación masiva de estudiantes desde Excel (CLI)
+
+Uso:
+    python import_users.py estudiantes.xlsx
+
+Usa la misma lógica que POST /api/users/import. Debe ejecutarse desde la raíz
+de DulceVizzioService (lee la configuración del archivo .env).
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+from dotenv import load_dotenv
+
+# Añadir el directorio actual al path para importar correctamente el config e inicializar .env
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+load_dotenv(dotenv_path=os.path.join(script_dir, '.env'))
+
+
+async def run_import(path: str, created_by: str) -> int:
+    from app.database import connect_to_mongo, close_mongo_connection
+    from app.services.user_import_service import user_import_service
+    from app.utils.security import password_hasher, calibrate_password_hashing
+
+    await connect_to_mongo()
+    await calibrate_password_hashing()
+    try:
+        report = await user_import_service.import_from_excel(path, created_by=created_by)
+    finally:
+        password_hasher.shutdown()
+        await close_mongo_connection()
+
+    print(f"[INFO] Filas leídas: {report['total_rows']}")
+    print(f"[OK]   Usuarios creados: {report['created']}")
+    print(f"[ERR]  Filas con error: {report['failed']}")
+    for error in report["errors"]:
+        print(f"   - Fila {error['row']} ({error['email'] or 'sin email'}): {error['detail']}")
+
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importar estudiantes desde un archivo .xlsx")
+    parser.add_argument("path", help="Ruta al archivo Excel (.xlsx)")
+    parser.add_argument("--created-by", default="cli_import", help="Valor para el campo de auditoría created_by")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.path):
+        print(f"[ERR] No existe el archivo: {args.path}")
+        sys.exit(1)
+
+    if sys.platform == 'win32':
+        try:
+            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+        except AttributeError:
+            pass
+    sys.exit(asyncio.run(run_import(args.path, args.created_by)))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Reconciliación de los contadores de Course (CLI)
+
+Uso:
+    python reconcile_counts.py
+
+Recalcula con una agregación y corrige con un solo bulk_write:
+- enrollment_count (EnrollmentCountService.reconcile)
+- lessons_count y total_duration_seconds/hours (CourseService.recompute_lesson_stats)
+- rating_sum, rating_count, rating_histogram y rating_average (ReviewService.recompute_ratings)
+
+Correrlo una vez tras el despliegue (los cursos existentes tienen los contadores en 0)
+y luego periódicamente, por ejemplo con cron. Debe ejecutarse desde la raíz de
+DulceVizzioService (lee la configuración del archivo .env).
+"""
+
+import asyncio
+import os
+import sys
+
+from dotenv import load_dotenv
+
+# Añadir el directorio actual al path para importar correctamente el config e inicializar .env
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(script_dir)
+load_dotenv(dotenv_path=os.path.join(script_dir, '.env'))
+
+
+async def run_reconcile() -> int:
+    from app.database import connect_to_mongo, close_mongo_connection
+    from app.services.course_service import CourseService
+    from app.services.enrollment_count_service import EnrollmentCountService
+    from app.services.review_service import ReviewService
+
+    await connect_to_mongo()
+    try:
+        enrollments = await EnrollmentCountService.reconcile()
+        lessons = await CourseService.recompute_lesson_stats()
+        ratings = await ReviewService.recompute_ratings()
+    finally:
+        await close_mongo_connection()
+
+    print(f"[INFO] Cursos revisados: {enrollments['courses_checked']}")
+    print(f"[OK]   enrollment_count corregido: {enrollments['courses_corrected']}")
+    print(f"[OK]   Estadísticas de lecciones corregidas: {lessons['courses_corrected']}")
+    print(f"[OK]   Calificaciones corregidas: {ratings['courses_corrected']}")
+    return 0
+
+
+if __name__ == "__main__":
+    if sys.platform == 'win32':
+        try:
+            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+        except AttributeError:
+            pass
+    sys.exit(asyncio.run(run_reconcile()))
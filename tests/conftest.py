@@ -0,0 +1,17 @@
+"""
+Configuración común de las pruebas
+
+Las pruebas unitarias no usan MongoDB ni Cloudinary, pero importar la app crea los
+Settings: se dan valores de relleno a las variables obligatorias si no vienen del entorno.
+"""
+
+import os
+
+for name, value in {
+    "MONGODB_URL": "mongodb://localhost:27017",
+    "SECRET_KEY": "test-secret-key",
+    "CLOUDINARY_CLOUD_NAME": "test",
+    "CLOUDINARY_API_KEY": "test",
+    "CLOUDINARY_API_SECRET": "test",
+}.items():
+    os.environ.setdefault(name, value)
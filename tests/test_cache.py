@@ -0,0 +1,178 @@
+"""
+Pruebas de las cachés en memoria (app/utils/cache.py)
+"""
+
+import asyncio
+
+import pytest
+
+from app.utils import cache
+from app.utils.cache import SWRCache, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache.time, "monotonic", fake)
+    return fake
+
+
+class Loader:
+    """Loader que cuenta llamadas y, con `gate`, espera a que la prueba lo libere"""
+
+    def __init__(self, value="v", gate: bool = False, error: Exception = None):
+        self.value = value
+        self.error = error
+        self.calls = 0
+        self.gate = asyncio.Event() if gate else None
+
+    async def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return f"{self.value}{self.calls}"
+
+
+# ---------- TTLCache ----------
+
+def test_ttl_cache_expires_entries(clock):
+    ttl_cache = TTLCache(maxsize=10, ttl=5)
+    ttl_cache.set("a", 1)
+    assert ttl_cache.get("a") == 1
+    clock.now += 5
+    assert ttl_cache.get("a") is None
+    assert ttl_cache.stats()["hits"] == 1
+    assert ttl_cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_evicts_least_recent(clock):
+    ttl_cache = TTLCache(maxsize=2, ttl=60)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    ttl_cache.get("a")
+    ttl_cache.set("c", 3)
+    assert ttl_cache.get("b") is None
+    assert ttl_cache.get("a") == 1
+
+
+def test_ttl_cache_invalidate_and_zero_ttl(clock):
+    ttl_cache = TTLCache(maxsize=10, ttl=60)
+    ttl_cache.set("a", 1)
+    ttl_cache.invalidate("a")
+    ttl_cache.invalidate("missing")
+    ttl_cache.set("b", 2, ttl=0)
+    assert len(ttl_cache) == 0
+
+
+# ---------- SWRCache ----------
+
+def test_swr_fresh_hit_then_stale_revalidates(clock):
+    async def scenario():
+        swr = SWRCache("test", maxsize=10, ttl=10, stale_ttl=30)
+        loader = Loader()
+        assert await swr.get_or_load("k", loader) == "v1"
+        assert await swr.get_or_load("k", loader) == "v1"
+
+        clock.now += 15  # vencida pero utilizable: se sirve y se recarga
+        assert await swr.get_or_load("k", loader) == "v1"
+        await asyncio.sleep(0)
+        assert loader.calls == 2
+        assert await swr.get_or_load("k", loader) == "v2"
+
+        clock.now += 100  # fuera de stale_ttl: carga en primer plano
+        assert await swr.get_or_load("k", loader) == "v3"
+        assert swr.stats()["stale_hits"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_swr_single_flight(clock):
+    async def scenario():
+        swr = SWRCache("test", maxsize=10, ttl=10, stale_ttl=0)
+        loader = Loader(gate=True)
+        waiters = [asyncio.ensure_future(swr.get_or_load("k", loader)) for _ in range(5)]
+        await asyncio.sleep(0)
+        loader.gate.set()
+        assert await asyncio.gather(*waiters) == ["v1"] * 5
+        assert loader.calls == 1
+
+    asyncio.run(scenario())
+
+
+def test_swr_cancelled_requester_does_not_cancel_waiters(clock):
+    async def scenario():
+        swr = SWRCache("test", maxsize=10, ttl=10, stale_ttl=0)
+        loader = Loader(gate=True)
+        first = asyncio.ensure_future(swr.get_or_load("k", loader))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(swr.get_or_load("k", loader))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        loader.gate.set()
+        assert await second == "v1"
+        assert first.cancelled()
+        assert loader.calls == 1
+        assert await swr.get_or_load("k", loader) == "v1"  # quedó guardada
+
+    asyncio.run(scenario())
+
+
+def test_swr_errors_reach_waiters_and_are_not_cached(clock):
+    async def scenario():
+        swr = SWRCache("test", maxsize=10, ttl=10, stale_ttl=0)
+        loader = Loader(gate=True, error=ValueError("mongo caído"))
+        waiters = [asyncio.ensure_future(swr.get_or_load("k", loader)) for _ in range(2)]
+        await asyncio.sleep(0)
+        loader.gate.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert swr.stats()["load_errors"] == 1
+
+        loader.error = None
+        assert await swr.get_or_load("k", loader) == "v2"
+
+    asyncio.run(scenario())
+
+
+def test_swr_invalidate_discards_inflight_result(clock):
+    async def scenario():
+        swr = SWRCache("test", maxsize=10, ttl=10, stale_ttl=0)
+        loader = Loader(gate=True)
+        waiter = asyncio.ensure_future(swr.get_or_load("k", loader))
+        await asyncio.sleep(0)
+        swr.invalidate("k")
+        loader.gate.set()
+        assert await waiter == "v1"  # quien esperaba recibe su valor...
+        assert len(swr) == 0          # ...pero no se guarda
+
+        assert await swr.get_or_load("k", loader) == "v2"
+        swr.invalidate_all()
+        assert len(swr) == 0
+
+    asyncio.run(scenario())
+
+
+def test_swr_refresh_skips_when_loading(clock):
+    async def scenario():
+        swr = SWRCache("test", maxsize=10, ttl=10, stale_ttl=0)
+        loader = Loader(gate=True)
+        swr.refresh("k", loader)
+        swr.refresh("k", loader)
+        await asyncio.sleep(0)
+        loader.gate.set()
+        assert await swr.get_or_load("k", loader) == "v1"
+        assert loader.calls == 1
+
+    asyncio.run(scenario())
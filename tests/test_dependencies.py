@@ -0,0 +1,63 @@
+"""
+Pruebas del camino sin estado de get_current_principal (app/utils/dependencies.py)
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.config import settings
+from app.utils import dependencies
+from app.utils.security import create_access_token
+
+USER_ID = "695cc40748b8077a89cb103e"
+
+
+def _credentials(token_version: int = 0, is_active: bool = True) -> HTTPAuthorizationCredentials:
+    token = create_access_token({
+        "user_id": USER_ID,
+        "email": "ana@example.com",
+        "role": "USER",
+        "is_active": is_active,
+        "token_version": token_version,
+    })
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+@pytest.fixture
+def token_state(monkeypatch):
+    """Estado (token_version, existe, activo) que 'devuelve MongoDB'"""
+    state = {"value": (0, True, True)}
+
+    async def fake_get_token_state(user_id):
+        return state["value"]
+
+    monkeypatch.setattr(settings, "AUTH_STATELESS_TOKENS", True)
+    monkeypatch.setattr(dependencies, "get_token_state", fake_get_token_state)
+    return state
+
+
+def _status_code(credentials) -> int:
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(dependencies.get_current_principal(credentials))
+    return exc_info.value.status_code
+
+
+def test_valid_token_builds_principal(token_state):
+    principal = asyncio.run(dependencies.get_current_principal(_credentials()))
+    assert str(principal.id) == USER_ID
+
+
+def test_user_deactivated_after_login_is_403(token_state):
+    # El token dice activo, pero el usuario fue desactivado después: igual que get_current_user
+    token_state["value"] = (0, True, False)
+    assert _status_code(_credentials(is_active=True)) == 403
+
+
+def test_revoked_and_missing_users_are_401(token_state):
+    token_state["value"] = (1, True, True)
+    assert _status_code(_credentials(token_version=0)) == 401
+    token_state["value"] = (-1, False, False)
+    assert _status_code(_credentials()) == 401
@@ -0,0 +1,54 @@
+"""
+Pruebas de la paginación por cursor (app/utils/pagination.py)
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    next_cursor_for,
+    seek_filter,
+    sort_spec,
+)
+
+CREATED_AT = datetime(2026, 3, 16, 15, 39, 46, 158000)
+DOC_ID = ObjectId("507f1f77bcf86cd799439011")
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(CREATED_AT, DOC_ID)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (CREATED_AT, DOC_ID)
+
+
+@pytest.mark.parametrize("cursor", [
+    "no-es-un-cursor",
+    encode_cursor(CREATED_AT, "id-alterado"),
+    "eyJ2IjoiMjAyNiJ9",  # {"v":"2026"} sin id
+])
+def test_invalid_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+
+def test_seek_filter_continues_after_cursor():
+    cursor = encode_cursor(CREATED_AT, DOC_ID)
+    assert seek_filter(cursor, "created_at") == {"$or": [
+        {"created_at": {"$lt": CREATED_AT}},
+        {"created_at": CREATED_AT, "_id": {"$lt": DOC_ID}},
+    ]}
+    assert sort_spec("created_at") == [("created_at", -1), ("_id", -1)]
+
+
+def test_next_cursor_points_to_last_item_of_page():
+    items = [SimpleNamespace(id=ObjectId(), created_at=CREATED_AT) for _ in range(3)]
+    assert next_cursor_for(items, "created_at", 2, has_more=True) == encode_cursor(CREATED_AT, items[1].id)
+    assert next_cursor_for(items, "created_at", 3, has_more=False) is None
+    assert next_cursor_for([], "created_at", 3, has_more=True) is None
@@ -0,0 +1,105 @@
+"""
+Pruebas del índice de prefijos del autocompletado (app/utils/prefix_index.py)
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from app.models.enums import CourseStatus
+from app.services import course_suggest_service
+from app.services.course_suggest_service import CourseSuggestService, _title_keys
+from app.utils.prefix_index import PrefixIndex
+
+
+def test_search_by_prefix_in_key_order():
+    index = PrefixIndex()
+    index.set("1", ["pastel de chocolate"], "pastel")
+    index.set("2", ["pasta choux"], "choux")
+    index.set("3", ["macarons"], "macarons")
+    assert index.search("pas", 10) == ["choux", "pastel"]
+    assert index.search("pastel", 10) == ["pastel"]
+    assert index.search("x", 10) == []
+    assert index.search("", 10) == []
+
+
+def test_item_with_several_matching_keys_is_returned_once():
+    index = PrefixIndex()
+    index.set("1", ["tarta de queso", "tarta", "queso"], "tarta")
+    index.set("2", ["tartaleta"], "tartaleta")
+    assert index.search("tarta", 10) == ["tarta", "tartaleta"]
+    assert index.search("tarta", 1) == ["tarta"]
+
+
+def test_set_replaces_and_remove_forgets():
+    index = PrefixIndex()
+    index.set("1", ["brownies"], "viejo")
+    index.set("1", ["cookies"], "nuevo")
+    assert index.search("brow", 10) == []
+    assert index.search("cook", 10) == ["nuevo"]
+    assert index.get("1") == "nuevo"
+
+    index.remove("1")
+    index.remove("no-existe")
+    assert len(index) == 0
+    assert index.search("cook", 10) == []
+
+
+def test_title_keys_skip_short_words():
+    assert _title_keys("torta de chocolate") == ["torta de chocolate", "chocolate"]
+
+
+def test_suggest_courses_and_tags():
+    service = CourseSuggestService()
+    service._built_at = float("inf")  # sin reconstrucción en segundo plano
+    course = SimpleNamespace(
+        id="c1", title="Torta de Chocolate", slug="torta-de-chocolate",
+        tags=["Chocolate", "Tortas"], status=CourseStatus.PUBLISHED, is_deleted=False
+    )
+    service.update_course(course)
+
+    result = service.suggest("choco")
+    assert result["courses"] == [{"id": "c1", "title": "Torta de Chocolate", "slug": "torta-de-chocolate"}]
+    assert result["tags"] == [{"tag": "Chocolate", "courses_count": 1}]
+
+    course.is_deleted = True
+    service.update_course(course)
+    assert service.suggest("choco") == {"courses": [], "tags": []}
+
+
+def _course(course_id, title, published=True):
+    return SimpleNamespace(
+        id=course_id, title=title, slug=course_id, tags=[],
+        status=CourseStatus.PUBLISHED if published else CourseStatus.DRAFT, is_deleted=False
+    )
+
+
+def test_changes_during_rebuild_survive_the_swap(monkeypatch):
+    gate = asyncio.Event()
+    # Lo que MongoDB devuelve: leído antes de los cambios de abajo
+    docs = [{"_id": "c1", "title": "Brownies", "slug": "c1"}, {"_id": "c2", "title": "Cookies", "slug": "c2"}]
+
+    class FakeCursor:
+        async def to_list(self, length=None):
+            await gate.wait()
+            return docs
+
+    fake_collection = SimpleNamespace(find=lambda *args: FakeCursor())
+    monkeypatch.setattr(
+        course_suggest_service, "Course", SimpleNamespace(get_motor_collection=lambda: fake_collection)
+    )
+
+    async def scenario():
+        service = CourseSuggestService()
+        rebuild = asyncio.ensure_future(service.build())
+        await asyncio.sleep(0)
+        service.update_course(_course("c1", "Brownies", published=False))  # despublicado
+        service.update_course(_course("c3", "Macarons"))                     # publicado
+        gate.set()
+        await rebuild
+
+        assert service.suggest("brow")["courses"] == []
+        assert [c["id"] for c in service.suggest("maca")["courses"]] == ["c3"]
+        assert [c["id"] for c in service.suggest("cook")["courses"]] == ["c2"]
+        assert service._recorders == []
+
+    asyncio.run(scenario())
@@ -0,0 +1,40 @@
+"""
+Pruebas de la asignación de slugs únicos (app/utils/slug.py)
+"""
+
+import re
+
+from app.utils.slug import _pick_slug, _slug_filter, _slug_pattern, generate_slug
+
+
+def test_generate_slug_strips_accents_and_symbols():
+    assert generate_slug("Macarons Perfectos & Fáciles") == "macarons-perfectos-faciles"
+
+
+def test_pick_slug_free_base():
+    assert _pick_slug("macarons", set()) == "macarons"
+    assert _pick_slug("macarons", {"macarons-basicos"}) == "macarons"
+
+
+def test_pick_slug_smallest_free_suffix():
+    assert _pick_slug("macarons", {"macarons"}) == "macarons-1"
+    assert _pick_slug("macarons", {"macarons", "macarons-1", "macarons-3"}) == "macarons-2"
+
+
+def test_pattern_is_prefix_regex():
+    pattern = _slug_pattern("tarta-de-queso")
+    # Literal de la base al inicio, sin alternancia: MongoDB lo acota por prefijo
+    assert pattern.startswith("^tarta")
+    assert not pattern.startswith("^(")
+    assert re.match(pattern, "tarta-de-queso")
+    assert re.match(pattern, "tarta-de-queso-12")
+    assert not re.match(pattern, "tarta-de-queso-vegana")
+    assert not re.match(pattern, "mini-tarta-de-queso")
+
+
+def test_filter_single_base_and_batch():
+    assert _slug_filter(["macarons"]) == {"slug": {"$regex": _slug_pattern("macarons")}}
+    assert _slug_filter(["brownies", "macarons"]) == {"$or": [
+        {"slug": {"$regex": _slug_pattern("brownies")}},
+        {"slug": {"$regex": _slug_pattern("macarons")}},
+    ]}
@@ -0,0 +1,113 @@
+"""
+Pruebas del rate limit por token bucket (app/utils/token_bucket.py)
+"""
+
+import pytest
+
+from app.utils import token_bucket
+from app.utils.token_bucket import (
+    DEFAULT_COST,
+    SEARCH_EXTRA_COST,
+    TokenBucketLimiter,
+    rate_limit_key,
+    request_cost,
+)
+from app.utils.security import create_access_token
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(token_bucket.time, "monotonic", fake)
+    return fake
+
+
+def test_burst_up_to_capacity_then_reject(clock):
+    limiter = TokenBucketLimiter(capacity=3, refill_rate=1, maxsize=10)
+    assert [limiter.consume("a", 1)[0] for _ in range(3)] == [True, True, True]
+    allowed, retry_after = limiter.consume("a", 1)
+    assert not allowed
+    assert retry_after == pytest.approx(1.0)
+    assert limiter.stats()["allowed"] == 3
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_refill_is_lazy_and_capped(clock):
+    limiter = TokenBucketLimiter(capacity=4, refill_rate=2, maxsize=10)
+    assert limiter.consume("a", 4) == (True, 0.0)
+    clock.now += 1  # +2 fichas
+    assert limiter.consume("a", 2)[0]
+    assert not limiter.consume("a", 1)[0]
+    clock.now += 60  # nunca supera la capacidad
+    assert limiter.consume("a", 4)[0]
+    assert not limiter.consume("a", 0.5)[0]
+
+
+def test_keys_have_independent_buckets(clock):
+    limiter = TokenBucketLimiter(capacity=1, refill_rate=1, maxsize=10)
+    assert limiter.consume("user:1", 1)[0]
+    assert not limiter.consume("user:1", 1)[0]
+    assert limiter.consume("user:2", 1)[0]
+
+
+def test_least_recent_bucket_is_evicted(clock):
+    limiter = TokenBucketLimiter(capacity=1, refill_rate=0.001, maxsize=2)
+    limiter.consume("a", 1)
+    limiter.consume("b", 1)
+    limiter.consume("a", 0)  # "a" pasa a ser el más reciente
+    limiter.consume("c", 1)  # descarta "b"
+    assert limiter.stats()["buckets"] == 2
+    assert not limiter.consume("a", 1)[0]  # "a" sigue guardado, sin fichas
+    assert limiter.consume("b", 1)[0]  # "b" vuelve con el bucket lleno
+
+
+def test_request_cost_by_route():
+    assert request_cost("GET", "/api/courses") == 3
+    assert request_cost("GET", "/api/courses/") == 3
+    assert request_cost("POST", "/api/auth/login") == 5
+    assert request_cost("GET", "/health/db") == 0.2
+    assert request_cost("GET", "/api/courses/abc123") == DEFAULT_COST
+
+
+def test_search_surcharge_only_with_value():
+    assert request_cost("GET", "/api/courses", b"search=macarons") == 3 + SEARCH_EXTRA_COST
+    assert request_cost("GET", "/api/courses", b"page=2&search=macarons") == 3 + SEARCH_EXTRA_COST
+    assert request_cost("GET", "/api/courses", b"search=") == 3
+    assert request_cost("GET", "/api/courses", b"research=x") == 3
+    assert request_cost("GET", "/api/users", b"q=ana") == 3 + SEARCH_EXTRA_COST
+
+
+def test_suggest_keystroke_has_no_search_surcharge():
+    # Cada tecla del buscador: se responde desde el índice en memoria
+    assert request_cost("GET", "/api/courses/suggest", b"q=pas") == 0.5
+    assert request_cost("GET", "/api/courses/suggest/", b"q=pas&limit=8") == 0.5
+
+
+def test_rate_limit_key_falls_back_to_ip():
+    scope = {"client": ("10.0.0.7", 5000), "headers": [(b"authorization", b"Bearer not-a-jwt")]}
+    assert rate_limit_key(scope) == "ip:10.0.0.7"
+    assert rate_limit_key({"headers": []}) == "ip:127.0.0.1"
+
+
+def test_rate_limit_key_uses_user_from_token():
+    token = create_access_token({"user_id": "695cc40748b8077a89cb103e"}).encode()
+    scope = {"method": "GET", "path": "/api/courses", "client": ("10.0.0.7", 5000),
+             "headers": [(b"authorization", b"Bearer " + token)]}
+    assert rate_limit_key(scope) == "user:695cc40748b8077a89cb103e"
+
+
+@pytest.mark.parametrize("path", ["/api/auth/login", "/api/auth/register", "/api/auth/login/"])
+def test_login_and_register_are_keyed_by_ip_even_with_token(path):
+    # Rotar tokens de cuentas propias no debe dar presupuesto extra de intentos
+    token = create_access_token({"user_id": "695cc40748b8077a89cb103e"}).encode()
+    scope = {"method": "POST", "path": path, "client": ("10.0.0.7", 5000),
+             "headers": [(b"authorization", b"Bearer " + token)]}
+    assert rate_limit_key(scope) == "ip:10.0.0.7"
@@ -0,0 +1,47 @@
+"""
+Pruebas de la elección de usernames 'Chef...' (app/utils/user_utils.py)
+"""
+
+from app.utils.user_utils import _chef_username_filter, _pick_chef_username, _split_normalized_name
+
+
+def test_split_normalizes_accents_and_falls_back():
+    assert _split_normalized_name("  José  María Pérez ") == ["Jose", "Maria", "Perez"]
+    assert _split_normalized_name("123 !!") == ["Usuario"]
+
+
+def test_first_candidate_is_first_name():
+    assert _pick_chef_username(["Ana"], set()) == "ChefAna"
+
+
+def test_candidates_follow_generate_chef_username_order():
+    parts = ["Ana", "Maria", "Lopez"]
+    assert _pick_chef_username(parts, {"ChefAna"}) == "ChefAnaMaria"
+    assert _pick_chef_username(parts, {"ChefAna", "ChefAnaMaria"}) == "ChefAnaLopez"
+
+
+def test_two_names_use_last_name():
+    assert _pick_chef_username(["Ana", "Lopez"], {"ChefAna"}) == "ChefAnaLopez"
+
+
+def test_numeric_suffix_skips_taken_numbers():
+    taken = {"ChefAna", "ChefAnaLopez", "ChefAna2", "ChefAna3"}
+    assert _pick_chef_username(["Ana", "Lopez"], taken) == "ChefAna4"
+
+
+def test_batch_reservations_do_not_repeat():
+    taken = set()
+    picked = []
+    for _ in range(3):
+        username = _pick_chef_username(["Ana"], taken)
+        taken.add(username)
+        picked.append(username)
+    assert picked == ["ChefAna", "ChefAna2", "ChefAna3"]
+
+
+def test_username_filter_uses_one_prefix_regex_per_first_name():
+    assert _chef_username_filter(["Ana"]) == {"username": {"$regex": "^ChefAna"}}
+    assert _chef_username_filter(["Ana", "Luis"]) == {"$or": [
+        {"username": {"$regex": "^ChefAna"}},
+        {"username": {"$regex": "^ChefLuis"}},
+    ]}